@@ -0,0 +1,57 @@
+"""
+Parser micro-benchmark: re-parsing an archive of stored snapshot texts.
+
+Builds a synthetic archive of the raw texts the usage pages show (Dutch
+and French mixed, with the repetition real archives have) and times, per
+field, one parse_* call per text against one parse_batch() call.
+
+Usage:
+    python benchmarks/parsers.py [--texts 100000] [--runs 5]
+"""
+import argparse
+import random
+import statistics
+import time
+
+from heytelecom import parsers
+
+# (field, module-level function, text generator)
+FIELDS = (
+    ("data_amount", parsers.parse_data_amount,
+     lambda r: r.choice([f"{r.random() * 20:.2f} GB", f"{r.random() * 20:.2f} Go".replace(".", ",")])),
+    ("minutes", parsers.parse_minutes, lambda r: f"{r.randint(0, 300)} minuten"),
+    ("sms_count", parsers.parse_sms_count, lambda r: f"{r.randint(0, 50)} sms/mms"),
+    ("period", parsers.parse_period,
+     lambda r: r.choice(["Van {d:02d}/10/2025 tot {d:02d}/11/2025", "Du {d:02d}/10/2025 au {d:02d}/11/2025"])
+     .format(d=r.randint(1, 28))),
+    ("last_update", parsers.parse_last_update,
+     lambda r: f"Laatste update : {r.randint(1, 28):02d}/11 {r.randint(0, 23):02d}:{r.randint(0, 59):02d}"),
+    ("unlimited", parsers.is_unlimited, lambda r: r.choice(["Onbeperkt", "Illimité", "van 10 GB", "de 10 Go"])),
+)
+
+
+def timed(func, *args) -> float:
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--texts", type=int, default=100000, help="Texts per field")
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement (median is reported)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    print(f"{'field':<12} {'distinct':>9} {'per call':>12} {'parse_batch':>12} {'speedup':>8}")
+    for field, func, make in FIELDS:
+        texts = [make(rng) for _ in range(args.texts)]
+        assert parsers.parse_batch(field, texts) == [func(t) for t in texts]
+        per_call = statistics.median(timed(lambda: [func(t) for t in texts]) for _ in range(args.runs))
+        batch = statistics.median(timed(parsers.parse_batch, field, texts) for _ in range(args.runs))
+        print(f"{field:<12} {len(set(texts)):>9} {per_call * 1000:>9.1f} ms {batch * 1000:>9.1f} ms "
+              f"{per_call / batch:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
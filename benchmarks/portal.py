@@ -0,0 +1,256 @@
+"""
+Local stand-in for ecare.heytelecom.be and auth.heytelecom.be.
+
+Serves the pages the client scrapes with the real selectors: the email
+login form, the product list (li.iris-products__item), the detailed usage
+pages (div#consumption-*) and the latest invoice (lib-obe-latest-invoice).
+Like the Angular app, every page first shows a p-progress-spinner and
+renders its content after a configurable delay, and every response can be
+delayed to simulate network latency.
+
+Usage:
+    with FixturePortal(products=10, spinner_ms=300) as portal:
+        client = HeyTelecomClient(email=portal.EMAIL, password=portal.PASSWORD,
+                                  base_url=portal.base_url, auth_url=portal.auth_url)
+
+Or standalone: python benchmarks/portal.py --products 10
+"""
+import argparse
+import html
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import Optional
+from urllib.parse import urlsplit, parse_qs
+
+SESSION_COOKIE = "hey_fixture_session"
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>{title}</title></head>
+<body>
+<svg class="p-progress-spinner" width="40" height="40"></svg>
+<div id="app"></div>
+<template id="content">{menu}{content}</template>
+<script>
+setTimeout(() => {{
+    document.getElementById('app').appendChild(document.getElementById('content').content.cloneNode(true));
+    document.querySelector('svg.p-progress-spinner').remove();
+}}, {spinner_ms});
+</script>
+</body></html>"""
+
+MENU = ('<nav><span class="p-menuitem-text ng-star-inserted button-label">Mijn account</span></nav>')
+
+AUTH_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Inloggen</title></head>
+<body>
+<a id="Login_loginByEmail" href="{email_href}">Inloggen via E-mail</a>
+</body></html>"""
+
+EMAIL_FORM = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>Inloggen via E-mail</title></head>
+<body>
+{error}
+<form method="post" action="/login{query}">
+  <input id="Login_byEmail_emailAddress" name="email" type="email">
+  <input id="Login_byEmail_password" name="password" type="password">
+  <button id="Login_byEmail_login" type="submit">Inloggen</button>
+</form>
+</body></html>"""
+
+LOGIN_ERROR = '<div class="error_msgs">Verkeerde gebruikersnaam en/of wachtwoord</div>'
+
+
+def phone_number(index: int) -> str:
+    return f"0470 {index // 10000 % 100:02d} {index // 100 % 100:02d} {index % 100:02d}"
+
+
+def product_item(index: int) -> str:
+    """One entry of the product list."""
+    return f"""
+<li class="iris-products__item">
+  <span class="iris-products__details-tariff-name">Hey {5 + index % 4 * 5}GB</span>
+  <span class="iris-products__details-tariff-number">{phone_number(index)}</span>
+  <div>
+    <span class="iris-products__details-info-title">Begindatum contract</span>
+    <span>{1 + index % 28:02d}.04.2025</span>
+  </div>
+  <div>
+    <span class="iris-products__details-info-title">Prijs</span>
+    <span>{10 + index % 3 * 5} €/maand</span>
+  </div>
+  <a class="iris-products__link" data-event_category="MyProducts"
+     href="/nl/gedetailleerd-gebruik/{index}">Bekijk verbruik</a>
+</li>"""
+
+
+def usage_block(block_id: str, limit: str, used: str, update: str) -> str:
+    return f"""
+<div id="{block_id}">
+  <span class="iris-consumption__main-data-usage"><strong>{used}</strong></span>
+  <span class="iris-consumption__main-data-limit">{limit}</span>
+  <span class="iris-consumption__main-data-update">Laatste update : {update}</span>
+</div>"""
+
+
+def usage_page(index: int) -> str:
+    """Content of the detailed usage page of a product."""
+    return (
+        '<p class="iris-consumption__main-date-range">Van 11/10/2025 tot 11/11/2025</p>'
+        + usage_block("consumption-data", f"van {5 + index % 4 * 5} GB", f"{index % 50 / 10:.2f} GB", "03/11 17:54")
+        + usage_block("consumption-calls", "Onbeperkt", f"{index % 120} minuten", "03/11 17:54")
+        + usage_block("consumption-sms", "Onbeperkt", f"{index % 30} sms/mms", "03/11 17:54")
+    )
+
+
+INVOICE = """
+<lib-obe-latest-invoice><section class="iris-invoice">
+  <p class="iris-invoice__main-data-title">Bedrag</p><p>25.50 €</p>
+  <p class="iris-invoice__main-data-title">Status</p><p>Betaald</p>
+  <p class="iris-invoice__main-data-title">Datum</p><p>01/11/2025</p>
+  <p class="iris-invoice__main-data-title">Vervaldatum</p><p>15/11/2025</p>
+</section></lib-obe-latest-invoice>"""
+
+
+class FixturePortal:
+    """
+    The ecare and auth fixture servers, each on its own local port.
+
+    Args:
+        products: Number of mobile products on the account
+        spinner_ms: How long every page shows its spinner before rendering
+        latency_ms: Delay added to every response
+        host: Interface to listen on
+    """
+
+    EMAIL = "fixture@example.com"
+    PASSWORD = "fixture-password"
+
+    def __init__(self, products: int = 1, spinner_ms: int = 200, latency_ms: int = 0,
+                 host: str = "127.0.0.1"):
+        self.products = products
+        self.spinner_ms = spinner_ms
+        self.latency_ms = latency_ms
+        self.host = host
+        self.requests = 0
+        self._ecare: Optional[ThreadingHTTPServer] = None
+        self._auth: Optional[ThreadingHTTPServer] = None
+        self._threads = []
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self._ecare.server_address[1]}"
+
+    @property
+    def auth_url(self) -> str:
+        return f"http://{self.host}:{self._auth.server_address[1]}"
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def start(self):
+        """Start both servers on free ports in background threads."""
+        self._ecare = ThreadingHTTPServer((self.host, 0), self._handler(self._ecare_page))
+        self._auth = ThreadingHTTPServer((self.host, 0), self._handler(self._auth_page))
+        for server in (self._ecare, self._auth):
+            server.daemon_threads = True
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        """Stop both servers."""
+        for server in (self._ecare, self._auth):
+            if server:
+                server.shutdown()
+                server.server_close()
+        self._threads = []
+
+    def _handler(self, route):
+        portal = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _respond(self, method: str):
+                portal.requests += 1
+                if portal.latency_ms:
+                    time.sleep(portal.latency_ms / 1000)
+                body = b""
+                if method == "POST":
+                    body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                status, headers, content = route(self, method, body)
+                data = content.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers:
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_GET(self):
+                self._respond("GET")
+
+            def do_POST(self):
+                self._respond("POST")
+
+        return Handler
+
+    def _page(self, title: str, content: str) -> str:
+        return PAGE.format(title=html.escape(title), menu=MENU, content=content, spinner_ms=self.spinner_ms)
+
+    def _ecare_page(self, request, method, body):
+        path = urlsplit(request.path).path
+        if SESSION_COOKIE not in (request.headers.get("Cookie") or ""):
+            return 302, [("Location", f"{self.auth_url}/authorize?return={path}")], ""
+        if path == "/nl/mijn-producten":
+            items = "".join(product_item(i) for i in range(self.products))
+            return 200, [], self._page("Mijn producten", f'<ul>{items}</ul>')
+        if path.startswith("/nl/gedetailleerd-gebruik/"):
+            index = int(path.rsplit("/", 1)[1])
+            return 200, [], self._page("Gedetailleerd gebruik", usage_page(index))
+        if path == "/nl/mijn-facturen":
+            return 200, [], self._page("Mijn facturen", INVOICE)
+        return 404, [], "Not found"
+
+    def _auth_page(self, request, method, body):
+        url = urlsplit(request.path)
+        query = f"?{url.query}" if url.query else ""
+        if url.path == "/authorize":
+            return 200, [], AUTH_PAGE.format(email_href=f"/email{query}")
+        if url.path == "/email":
+            return 200, [], EMAIL_FORM.format(error="", query=query)
+        if url.path == "/login" and method == "POST":
+            form = parse_qs(body.decode("utf-8"))
+            if form.get("email") != [self.EMAIL] or form.get("password") != [self.PASSWORD]:
+                return 200, [], EMAIL_FORM.format(error=LOGIN_ERROR, query=query)
+            target = parse_qs(url.query).get("return", ["/nl/mijn-producten"])[0]
+            # Cookies are scoped by host, not port, so the ecare server sees this one
+            return 302, [("Set-Cookie", f"{SESSION_COOKIE}=1; Path=/"),
+                         ("Location", f"{self.base_url}{target}")], ""
+        return 404, [], "Not found"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the fixture portal until interrupted")
+    parser.add_argument("--products", type=int, default=10)
+    parser.add_argument("--spinner-ms", type=int, default=200)
+    parser.add_argument("--latency-ms", type=int, default=0)
+    args = parser.parse_args()
+    with FixturePortal(args.products, args.spinner_ms, args.latency_ms) as portal:
+        print(f"ecare: {portal.base_url}\nauth:  {portal.auth_url}")
+        print(f"login: {portal.EMAIL} / {portal.PASSWORD}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
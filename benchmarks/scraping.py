@@ -0,0 +1,124 @@
+"""
+Scaling benchmark for the browser scraping hot path, against the local fixture portal.
+
+For every account size it reports end-to-end and per-phase timings
+(connect, login, get_products, get_latest_invoice), the time spent
+waiting for pages to become ready and the number of DOM round trips.
+
+Usage:
+    python benchmarks/scraping.py [--sizes 1 10 100] [--usage-tabs 4] [--runs 3] [--json]
+
+Needs Playwright's Chromium (playwright install chromium).
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from portal import FixturePortal  # noqa: E402
+from heytelecom import HeyTelecomClient  # noqa: E402
+
+PHASES = ("connect", "login", "get_products", "get_latest_invoice")
+
+
+def run_once(portal: FixturePortal, **client_kwargs) -> dict:
+    """Scrape the fixture account once with a fresh profile and time each phase."""
+    timings = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        client = HeyTelecomClient(
+            email=portal.EMAIL,
+            password=portal.PASSWORD,
+            user_data_dir=os.path.join(tmp, "profile"),
+            base_url=portal.base_url,
+            auth_url=portal.auth_url,
+            cache_tokens=False,
+            **client_kwargs
+        )
+        start = time.perf_counter()
+        try:
+            phase = time.perf_counter()
+            client.connect()
+            timings["connect"] = time.perf_counter() - phase
+
+            phase = time.perf_counter()
+            client.login()
+            timings["login"] = time.perf_counter() - phase
+
+            phase = time.perf_counter()
+            products = client.get_products()
+            timings["get_products"] = time.perf_counter() - phase
+
+            phase = time.perf_counter()
+            client.get_latest_invoice()
+            timings["get_latest_invoice"] = time.perf_counter() - phase
+        finally:
+            client.close()
+        timings["total"] = time.perf_counter() - start
+
+    return {
+        "timings": timings,
+        "products": len(products),
+        "with_usage": sum(1 for p in products if p.usage),
+        "wait_stats": dict(client.wait_stats),
+        "roundtrips": dict(client.roundtrips),
+    }
+
+
+def benchmark(size: int, runs: int, spinner_ms: int, latency_ms: int, **client_kwargs) -> dict:
+    """Run the scrape `runs` times against a portal with `size` products."""
+    with FixturePortal(products=size, spinner_ms=spinner_ms, latency_ms=latency_ms) as portal:
+        results = [run_once(portal, **client_kwargs) for _ in range(runs)]
+    if any(r["with_usage"] != size for r in results):
+        raise RuntimeError(f"Expected usage for {size} products, got {[r['with_usage'] for r in results]}")
+    return {
+        "products": size,
+        "runs": runs,
+        "median": {key: statistics.median(r["timings"][key] for r in results)
+                   for key in (*PHASES, "total")},
+        "wait_stats": results[-1]["wait_stats"],
+        "roundtrips": results[-1]["roundtrips"],
+    }
+
+
+def print_table(reports: list):
+    header = f"{'products':>8}  " + "  ".join(f"{name:>18}" for name in (*PHASES, "total"))
+    print(header)
+    print("-" * len(header))
+    for report in reports:
+        cells = "  ".join(f"{report['median'][name] * 1000:>15.0f} ms" for name in (*PHASES, "total"))
+        print(f"{report['products']:>8}  {cells}")
+    print()
+    for report in reports:
+        waits = ", ".join(f"{k} {v:.2f}s" for k, v in report["wait_stats"].items())
+        print(f"{report['products']:>8} products: waits [{waits}], round trips {report['roundtrips']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100], help="Product counts")
+    parser.add_argument("--runs", type=int, default=3, help="Runs per size (median is reported)")
+    parser.add_argument("--spinner-ms", type=int, default=200, help="Spinner time of every page")
+    parser.add_argument("--latency-ms", type=int, default=0, help="Latency added to every response")
+    parser.add_argument("--usage-tabs", type=int, default=1, help="HeyTelecomClient usage_tabs")
+    parser.add_argument("--block-resources", default=None, help="Routing profile to use")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args()
+
+    reports = [
+        benchmark(size, args.runs, args.spinner_ms, args.latency_ms,
+                  usage_tabs=args.usage_tabs, block_resources=args.block_resources)
+        for size in args.sizes
+    ]
+    if args.json:
+        print(json.dumps(reports, indent=2))
+    else:
+        print_table(reports)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Startup benchmark: what a short-lived cron or CLI run pays before scraping.
+
+Measures, each in a fresh interpreter:
+  * import heytelecom (and whether Playwright got loaded)
+  * the browser install check
+  * optionally, connect() up to an open page (--connect, needs Chromium)
+
+Usage:
+    python benchmarks/startup.py [--runs 5] [--connect]
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+IMPORT_SCRIPT = """
+import json, sys, time
+t = time.perf_counter()
+import heytelecom
+from heytelecom import models, parsers
+print(json.dumps({"seconds": time.perf_counter() - t,
+                  "playwright_loaded": any(m.startswith("playwright") for m in sys.modules)}))
+"""
+
+INSTALL_CHECK_SCRIPT = """
+import json, time
+from heytelecom.installer import ensure_playwright_installed, find_chromium
+t = time.perf_counter()
+ensure_playwright_installed()
+print(json.dumps({"seconds": time.perf_counter() - t, "fast_path": find_chromium() is not None}))
+"""
+
+CONNECT_SCRIPT = """
+import json, tempfile, time
+t = time.perf_counter()
+from heytelecom import HeyTelecomClient
+client = HeyTelecomClient(user_data_dir=tempfile.mkdtemp())
+client.connect()
+elapsed = time.perf_counter() - t
+client.close()
+print(json.dumps({"seconds": elapsed}))
+"""
+
+
+def run(script: str) -> dict:
+    """Run a script in a fresh interpreter and return its JSON result."""
+    output = subprocess.run([sys.executable, "-c", script], check=True,
+                            capture_output=True, text=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def report(name: str, results: list):
+    times = [r["seconds"] * 1000 for r in results]
+    extra = {k: v for k, v in results[-1].items() if k != "seconds"}
+    print(f"{name:<16} median {statistics.median(times):8.1f} ms   "
+          f"min {min(times):8.1f} ms   max {max(times):8.1f} ms   {extra or ''}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Runs per measurement")
+    parser.add_argument("--connect", action="store_true", help="Also measure connect() (launches Chromium)")
+    args = parser.parse_args()
+
+    report("import", [run(IMPORT_SCRIPT) for _ in range(args.runs)])
+    report("install check", [run(INSTALL_CHECK_SCRIPT) for _ in range(args.runs)])
+    if args.connect:
+        report("connect", [run(CONNECT_SCRIPT) for _ in range(args.runs)])
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,11 @@
 import os
 import json
-from flask import Flask, jsonify
-from heytelecom import HeyTelecomClient
+import time
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, jsonify, request
+from heytelecom import HeyTelecomClient, SingleFlight, RefreshScheduler, HistoryStore
 
 app = Flask(__name__)
 
@@ -11,28 +15,229 @@ try:
         options = json.load(f)
     EMAIL = options.get('email')
     PASSWORD = options.get('password')
+    CACHE_TTL = float(options.get('cache_ttl', 300))
+    ADAPTIVE_REFRESH = bool(options.get('adaptive_refresh', True))
 except FileNotFoundError:
     # Fallback to environment variables for testing outside HA
     EMAIL = os.environ.get('HEYTELECOM_EMAIL')
     PASSWORD = os.environ.get('HEYTELECOM_PASSWORD')
+    CACHE_TTL = float(os.environ.get('HEYTELECOM_CACHE_TTL', 300))
+    ADAPTIVE_REFRESH = os.environ.get('HEYTELECOM_ADAPTIVE_REFRESH', '1').lower() not in ('0', 'false', 'no')
+
+USER_DATA_DIR = '/data/hey_browser_data'
+CACHE_FILE = '/data/account_cache.json'
+ASSET_CACHE_DIR = '/data/asset_cache'
+HISTORY_FILE = '/data/history.sqlite3'
+
+
+class BrowserWorker:
+    """
+    Keeps one warm HeyTelecomClient for the life of the process.
+
+    Playwright's sync API objects may only be used from the thread that
+    created them, so the client lives on a single dedicated worker thread
+    and every request is handed to it. When a scrape fails the browser is
+    recycled and the scrape retried once with a fresh one.
+    """
+
+    def __init__(self):
+        # A single worker thread, reused for every job
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='heytelecom')
+        self._client = None
+        self._installed = False
+        self.launches = 0
+
+    def _ensure_client(self):
+        """Start the browser and log in, unless a warm client is available."""
+        if self._client:
+            return self._client
+        client = HeyTelecomClient(
+            email=EMAIL,
+            password=PASSWORD,
+            user_data_dir=USER_DATA_DIR,
+            # Only cookies and localStorage hit the SD card, not a whole Chromium profile
+            session_mode='storage_state',
+            # Skip images, fonts, the cookie banner and trackers
+            block_resources='standard',
+            # Hashed JS/CSS bundles survive container restarts
+            asset_cache=ASSET_CACHE_DIR,
+            # The installer probe only needs to run once per process
+            auto_install=not self._installed
+        )
+        client.connect()
+        self._installed = True
+        self.launches += 1
+        try:
+            if EMAIL and PASSWORD:
+                client.login()
+        except Exception:
+            client.close()
+            raise
+        self._client = client
+        return client
+
+    def _recycle(self):
+        """Close the current browser; the next job starts a fresh one."""
+        if self._client:
+            try:
+                self._client.close()
+            except Exception:
+                pass
+            self._client = None
+
+    def _fetch_account(self):
+        for attempt in range(2):
+            try:
+                client = self._ensure_client()
+                return client.get_account_data().to_dict()
+            except Exception:
+                self._recycle()
+                if attempt:
+                    raise
+
+    def fetch_account(self):
+        """Scrape the account on the worker thread and return AccountData.to_dict()."""
+        return self._executor.submit(self._fetch_account).result()
+
+    def close(self):
+        """Close the browser and stop the worker thread."""
+        self._executor.submit(self._recycle).result()
+        self._executor.shutdown()
+
+
+class AccountCache:
+    """
+    TTL cache with stale-while-revalidate around the account scrape.
+
+    A fresh entry is served as is. A stale entry is still served right
+    away while a single background refresh runs. Only a cold cache makes
+    the caller wait for the scrape. The last good result is persisted to
+    disk, so a restarted container can answer immediately. Concurrent
+    refreshes are coalesced, so a burst of requests causes one scrape.
+    """
+
+    def __init__(self, fetch, ttl, path, history=None):
+        self._fetch = fetch
+        self.history = history
+        self.ttl = ttl
+        self.path = path
+        self._flight = SingleFlight()
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.data = None
+        self.fetched_at = 0.0
+        self.last_error = None
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                stored = json.load(f)
+            self.data = stored['data']
+            self.fetched_at = float(stored['fetched_at'])
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump({'fetched_at': self.fetched_at, 'data': self.data}, f)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+    def age(self):
+        """Seconds since the cached data was scraped."""
+        return time.time() - self.fetched_at
+
+    def refresh(self):
+        """Scrape now (or join the scrape already running) and store the result."""
+        return self._flight.do(self.path, self._refresh)
+
+    def _refresh(self):
+        data = self._fetch()
+        with self._lock:
+            self.data = data
+            self.fetched_at = time.time()
+            self.last_error = None
+            self._save()
+        if self.history:
+            try:
+                self.history.append(data, at=self.fetched_at)
+            except Exception as e:
+                self.last_error = f"history: {e}"
+        return data
+
+    def _refresh_in_background(self):
+        try:
+            self.refresh()
+        except Exception as e:
+            # Keep serving the stale data; the next request tries again
+            self.last_error = str(e)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def get(self):
+        """Return the account data, refreshing it when it is missing or stale."""
+        with self._lock:
+            data = self.data
+            start_refresh = data is not None and self.age() >= self.ttl and not self._refreshing
+            if start_refresh:
+                self._refreshing = True
+        if data is None:
+            return self.refresh()
+        if start_refresh:
+            threading.Thread(target=self._refresh_in_background, daemon=True).start()
+        return data
+
+
+def refresh_loop(cache, scheduler):
+    """Keep the cache warm, polling just after the portal is expected to update."""
+    if cache.data is not None:
+        scheduler.observe(cache.data)
+        time.sleep(max(scheduler.next_delay() - cache.age(), 0))
+    while True:
+        try:
+            scheduler.observe(cache.refresh())
+        except Exception as e:
+            cache.last_error = str(e)
+            scheduler.observe(None)
+        time.sleep(scheduler.next_delay())
+
+
+worker = BrowserWorker()
+atexit.register(worker.close)
+history = HistoryStore(HISTORY_FILE)
+atexit.register(history.close)
+cache = AccountCache(worker.fetch_account, CACHE_TTL, CACHE_FILE, history)
+scheduler = RefreshScheduler()
+
+if ADAPTIVE_REFRESH:
+    threading.Thread(target=refresh_loop, args=(cache, scheduler), daemon=True).start()
 
 
 @app.route('/')
 def get_account():
     """Single endpoint - returns complete account data"""
     try:
-        with HeyTelecomClient(
-            email=EMAIL,
-            password=PASSWORD,
-            user_data_dir='/data/hey_browser_data'
-        ) as client:
-            if EMAIL and PASSWORD:
-                try:
-                    client.login()
-                except Exception as e:
-                    return
-            account_data = client.get_account_data()
-            return jsonify(account_data.to_dict())
+        response = jsonify(cache.get())
+        response.headers['Age'] = str(max(int(cache.age()), 0))
+        return response
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/history/<product_id>')
+def get_history(product_id):
+    """Usage samples and burn rates of one product over the last `days` days (default 31)"""
+    try:
+        start = time.time() - float(request.args.get('days', 31)) * 86400
+        return jsonify({
+            'series': history.series(product_id, start=start).to_dict(),
+            'burn_rates': [rate.to_dict() for rate in history.burn_rates(product_id, start=start)],
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
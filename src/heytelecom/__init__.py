@@ -4,19 +4,93 @@ Hey Telecom Python Library
 A Python library for interacting with Hey Telecom accounts using Playwright.
 """
 
-__version__ = "0.1.1"
+__version__ = "0.2.0"
 
-from .client import HeyTelecomClient
-from .models import Product, Contract, UsageData, Invoice, AccountData
+import importlib
+
+from .api import HeyTelecomApi, ApiError, AuthenticationError
+from .tokens import ApiCredentials, TokenCache
+from .oidc import OidcLogin, OidcFlowError, LoginError
+from .singleflight import (
+    SingleFlight, AsyncSingleFlight, account_key, fetch_account_data, fetch_account_data_async
+)
+from .scheduler import RefreshScheduler
+from .routing import RequestRouter, RoutingProfile
+from .asset_cache import AssetCache
+from .product_state import ProductState, ProductStateStore
+from .instrumentation import Instrumentation, Span
+from .session import SessionCheck, check_session
+from .history import HistoryStore, Series, BurnRate
+from .parsers import LocaleParser, parse_batch
+from .models import (
+    Product, Contract, UsageData, DataUsage, CallUsage, SmsUsage, Period, Invoice, AccountData
+)
 from .installer import install_playwright, ensure_playwright_installed
 
 __all__ = [
     "HeyTelecomClient",
+    "AsyncHeyTelecomClient",
+    "Account",
+    "AccountPool",
+    "HeyTelecomApi",
+    "ApiError",
+    "AuthenticationError",
+    "ApiCredentials",
+    "TokenCache",
+    "OidcLogin",
+    "OidcFlowError",
+    "LoginError",
+    "SingleFlight",
+    "AsyncSingleFlight",
+    "account_key",
+    "fetch_account_data",
+    "fetch_account_data_async",
+    "RefreshScheduler",
+    "RequestRouter",
+    "RoutingProfile",
+    "AssetCache",
+    "ProductState",
+    "ProductStateStore",
+    "Instrumentation",
+    "Span",
+    "SessionCheck",
+    "check_session",
+    "HistoryStore",
+    "Series",
+    "BurnRate",
+    "LocaleParser",
+    "parse_batch",
     "Product",
     "Contract",
     "UsageData",
+    "DataUsage",
+    "CallUsage",
+    "SmsUsage",
+    "Period",
     "Invoice",
     "AccountData",
     "install_playwright",
     "ensure_playwright_installed",
 ]
+
+# The browser clients are imported on first use, so that users of the
+# models, parsers or the API backend never load Playwright
+_LAZY_ATTRIBUTES = {
+    "HeyTelecomClient": ".client",
+    "AsyncHeyTelecomClient": ".async_client",
+    "Account": ".pool",
+    "AccountPool": ".pool",
+}
+
+
+def __getattr__(name):
+    module = _LAZY_ATTRIBUTES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
@@ -0,0 +1,447 @@
+"""Browserless HTTP backend for the api.heytelecom.be BFF endpoints."""
+import gzip
+import http.client
+import json
+import threading
+import zlib
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlsplit, urlencode
+
+from .models import Product, Invoice
+from .parsers import build_product, convert_to_gb, parse_date, is_unlimited, is_paid
+
+
+class ApiError(RuntimeError):
+    """Raised when the Hey Telecom API returns an unexpected response."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
+
+
+class AuthenticationError(ApiError):
+    """Raised when the API rejects the Bearer token or x-api-key."""
+
+
+class HttpResponse:
+    """Minimal response object returned by HttpTransport."""
+
+    def __init__(self, status: int, headers: Dict[str, str], body: bytes,
+                 set_cookies: Optional[List[str]] = None):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.set_cookies = set_cookies or []
+
+    def json(self) -> Any:
+        """Decode the body as JSON."""
+        return json.loads(self.body.decode("utf-8")) if self.body else None
+
+
+class HttpTransport:
+    """
+    Keep-alive HTTP(S) transport with a small connection pool per host.
+
+    Built on http.client so the API backend does not need any dependency
+    beyond the standard library. Connections are reused between requests,
+    which avoids a TLS handshake on every call.
+    """
+
+    def __init__(self, timeout: float = 15.0, max_idle_per_host: int = 4):
+        """
+        Initialize the transport.
+
+        Args:
+            timeout: Socket timeout in seconds
+            max_idle_per_host: Maximum number of idle connections kept per host
+        """
+        self.timeout = timeout
+        self.max_idle_per_host = max_idle_per_host
+        self._idle: Dict[Tuple[str, str, int], List[http.client.HTTPConnection]] = {}
+        self._lock = threading.Lock()
+
+    def _new_connection(self, key: Tuple[str, str, int]) -> http.client.HTTPConnection:
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=self.timeout)
+        return http.client.HTTPConnection(host, port, timeout=self.timeout)
+
+    def _acquire(self, key: Tuple[str, str, int]) -> Tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        return self._new_connection(key), False
+
+    def _release(self, key: Tuple[str, str, int], conn: http.client.HTTPConnection):
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_host:
+                idle.append(conn)
+                return
+        conn.close()
+
+    def request(self, method: str, url: str, headers: Optional[Dict[str, str]] = None,
+                body: Optional[bytes] = None) -> HttpResponse:
+        """
+        Send a request and return the fully read response.
+
+        Args:
+            method: HTTP method
+            url: Absolute URL
+            headers: Request headers
+            body: Optional request body
+
+        Returns:
+            HttpResponse with decompressed body
+
+        Raises:
+            ApiError: If the connection fails
+        """
+        parts = urlsplit(url)
+        scheme = parts.scheme or "https"
+        port = parts.port or (443 if scheme == "https" else 80)
+        key = (scheme, parts.hostname or "", port)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+
+        request_headers = {"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"}
+        request_headers.update(headers or {})
+
+        # A pooled connection may have been closed by the server while idle,
+        # so retry once on a fresh connection before giving up
+        for attempt in range(2):
+            conn, reused = self._acquire(key)
+            try:
+                conn.request(method, path, body=body, headers=request_headers)
+                raw = conn.getresponse()
+                data = raw.read()
+            except (http.client.HTTPException, OSError) as e:
+                conn.close()
+                if reused and attempt == 0:
+                    continue
+                raise ApiError(f"Request to {url} failed: {e}")
+
+            response_headers = {k.lower(): v for k, v in raw.getheaders()}
+            set_cookies = [v for k, v in raw.getheaders() if k.lower() == "set-cookie"]
+            if raw.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+
+            encoding = response_headers.get("content-encoding", "")
+            if encoding == "gzip":
+                data = gzip.decompress(data)
+            elif encoding == "deflate":
+                data = zlib.decompress(data)
+            return HttpResponse(raw.status, response_headers, data, set_cookies)
+
+        raise ApiError(f"Request to {url} failed")
+
+    def close(self):
+        """Close all pooled connections."""
+        with self._lock:
+            for connections in self._idle.values():
+                for conn in connections:
+                    conn.close()
+            self._idle.clear()
+
+
+class HeyTelecomApi:
+    """Client for the JSON BFF used by the ecare Angular app."""
+
+    API_URL = "https://api.heytelecom.be"
+    ORIGIN = "https://ecare.heytelecom.be"
+    PRODUCT_INVENTORY_PATH = "/api/bff/product-inventory/v1/productInventory"
+
+    def __init__(self, access_token: str, api_key: str, api_url: Optional[str] = None,
+                 language: str = "nl", transport: Optional[HttpTransport] = None):
+        """
+        Initialize the API client.
+
+        Args:
+            access_token: OAuth Bearer token (without the "Bearer " prefix)
+            api_key: Value of the x-api-key header used by the ecare app
+            api_url: Override the API base URL (e.g. for a local mock server)
+            language: Value for the Accept-Language header
+            transport: Shared HttpTransport (a new one is created if omitted)
+        """
+        self.access_token = access_token
+        self.api_key = api_key
+        self.api_url = (api_url or self.API_URL).rstrip("/")
+        self.language = language
+        self._transport = transport or HttpTransport()
+        self._owns_transport = transport is None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        """Close the underlying transport if this client created it."""
+        if self._owns_transport:
+            self._transport.close()
+
+    def _headers(self) -> Dict[str, str]:
+        return {
+            "Accept": "application/json",
+            "Accept-Language": self.language,
+            "Authorization": f"Bearer {self.access_token}",
+            "Origin": self.ORIGIN,
+            "Referer": f"{self.ORIGIN}/",
+            "x-api-key": self.api_key,
+        }
+
+    def get_json(self, path: str, params: Optional[Dict[str, Any]] = None) -> Any:
+        """
+        Perform an authenticated GET request and decode the JSON body.
+
+        Raises:
+            AuthenticationError: If the token or API key is rejected
+            ApiError: For any other non-2xx response
+        """
+        url = f"{self.api_url}{path}"
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        response = self._transport.request("GET", url, headers=self._headers())
+        if response.status in (401, 403):
+            raise AuthenticationError(f"API rejected credentials ({response.status})", response.status)
+        if response.status >= 400:
+            raise ApiError(f"API request failed ({response.status}): {path}", response.status)
+        try:
+            return response.json()
+        except ValueError:
+            raise ApiError(f"API returned invalid JSON: {path}", response.status)
+
+    def get_product_inventory(self) -> Any:
+        """Fetch the raw product inventory payload."""
+        return self.get_json(self.PRODUCT_INVENTORY_PATH)
+
+    def get_products(self) -> List[Product]:
+        """
+        Get all products from the product inventory endpoint.
+
+        Returns:
+            List of Product objects
+        """
+        return products_from_inventory(self.get_product_inventory())
+
+
+def _get(data: Any, path: str) -> Any:
+    """Look up a dotted path in nested dictionaries."""
+    for key in path.split("."):
+        if not isinstance(data, dict):
+            return None
+        data = data.get(key)
+    return data
+
+
+def _first(data: Any, *paths: str) -> Any:
+    """Return the first non-empty value among several dotted paths."""
+    for path in paths:
+        value = _get(data, path)
+        if value not in (None, "", [], {}):
+            return value
+    return None
+
+
+def _as_list(payload: Any, *keys: str) -> List[Any]:
+    """Unwrap a list that may be nested under one of several keys."""
+    if isinstance(payload, list):
+        return payload
+    if isinstance(payload, dict):
+        for key in keys:
+            value = payload.get(key)
+            if isinstance(value, list):
+                return value
+    return []
+
+
+def _as_float(value: Any) -> Optional[float]:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _amount_gb(value: Any) -> Optional[float]:
+    """Convert an amount that is either a number in GB or a {value, unit} object."""
+    if isinstance(value, dict):
+        return convert_to_gb(_as_float(value.get("value", value.get("amount"))),
+                             value.get("unit", value.get("units", "GB")))
+    return _as_float(value)
+
+
+def _iso_date(value: Any) -> Optional[str]:
+    """Normalize an API date (ISO timestamp or dd/mm/yyyy) to YYYY-MM-DD."""
+    if not value or not isinstance(value, str):
+        return None
+    if len(value) >= 10 and value[4] == "-" and value[7] == "-":
+        return value[:10]
+    return parse_date(value)
+
+
+def _iso_datetime(value: Any) -> Optional[str]:
+    """Normalize an API timestamp to YYYY-MM-DDTHH:MM:SS."""
+    if not value or not isinstance(value, str):
+        return None
+    return value[:19] if len(value) >= 19 else value
+
+
+def usage_from_json(consumption: Any) -> Optional[Dict[str, Any]]:
+    """
+    Map a consumption JSON object to the scraped usage dictionary format.
+
+    Accepts both the consumption section of an inventory item and the body
+    of the consumption endpoint the ecare app calls on the usage page.
+    """
+    if isinstance(consumption, dict):
+        nested = _first(consumption, "usage", "consumption", "usageConsumption")
+        if isinstance(nested, dict):
+            consumption = nested
+    if not isinstance(consumption, dict):
+        return None
+
+    usage: Dict[str, Any] = {}
+
+    period = _first(consumption, "period", "validFor", "billingPeriod")
+    if isinstance(period, dict):
+        start = _iso_date(_first(period, "start", "startDate", "startDateTime", "from"))
+        end = _iso_date(_first(period, "end", "endDate", "endDateTime", "to"))
+        if start or end:
+            usage["period"] = {"start": start, "end": end}
+
+    data = _first(consumption, "data", "mobileData", "internet")
+    if isinstance(data, dict):
+        limit = _first(data, "limit", "allowance", "total")
+        usage["data"] = {
+            "used": _amount_gb(_first(data, "used", "consumed", "usage")),
+            "limit": _amount_gb(limit),
+            "unlimited": bool(data.get("unlimited")) or is_unlimited(str(limit or "")),
+            "last_update": _iso_datetime(_first(data, "lastUpdate", "lastUpdated", "updatedAt")),
+        }
+
+    calls = _first(consumption, "calls", "voice")
+    if isinstance(calls, dict):
+        limit = _first(calls, "limit", "allowance", "total")
+        usage["calls"] = {
+            "used": _as_float(_first(calls, "used", "consumed", "usage")),
+            "unlimited": bool(calls.get("unlimited")) or is_unlimited(str(limit or "")),
+            "last_update": _iso_datetime(_first(calls, "lastUpdate", "lastUpdated", "updatedAt")),
+        }
+
+    sms = _first(consumption, "sms_mms", "smsMms", "sms")
+    if isinstance(sms, dict):
+        limit = _first(sms, "limit", "allowance", "total")
+        used = _as_float(_first(sms, "used", "consumed", "usage"))
+        usage["sms_mms"] = {
+            "used": int(used) if used is not None else None,
+            "unlimited": bool(sms.get("unlimited")) or is_unlimited(str(limit or "")),
+            "last_update": _iso_datetime(_first(sms, "lastUpdate", "lastUpdated", "updatedAt")),
+        }
+
+    return usage or None
+
+
+def product_data_from_json(item: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Map one product inventory item to the scraped product dictionary format.
+
+    The keys match the ones produced by the browser extraction so that both
+    backends feed the same build_product() function.
+    """
+    product_data: Dict[str, Any] = {}
+
+    phone_number = _first(item, "msisdn", "phoneNumber", "mobileNumber", "characteristics.msisdn")
+    if phone_number:
+        product_data["phone_number"] = str(phone_number)
+
+    easy_switch = _first(item, "easySwitchNumber", "easySwitchId", "characteristics.easySwitchNumber")
+    if easy_switch:
+        product_data["easy_switch_number"] = str(easy_switch)
+
+    tariff = _first(item, "tariffName", "tariff.name", "productOffering.name", "name")
+    if tariff:
+        product_data["tariff"] = str(tariff)
+
+    start_date = _iso_date(_first(item, "contractStartDate", "startDate", "contract.startDate"))
+    if start_date:
+        product_data["contract_start_date"] = start_date
+
+    price = _first(item, "pricePerMonth", "price.value", "price.amount", "productPrice.value", "price")
+    if price is not None and not isinstance(price, dict):
+        product_data["price_per_month_eur"] = _as_float(price)
+
+    usage = usage_from_json(_first(item, "usage", "consumption", "usageConsumption"))
+    if usage:
+        product_data["usage"] = usage
+
+    return product_data
+
+
+def products_from_inventory(payload: Any) -> List[Product]:
+    """
+    Build Product objects from a product inventory JSON payload.
+
+    Args:
+        payload: Decoded JSON from the productInventory endpoint
+
+    Returns:
+        List of Product objects
+    """
+    items = _as_list(payload, "products", "productInventory", "items", "data")
+    return [build_product(product_data_from_json(item)) for item in items if isinstance(item, dict)]
+
+
+def invoice_from_json(payload: Any) -> Optional[Invoice]:
+    """
+    Build the latest Invoice from an invoices JSON payload.
+
+    Args:
+        payload: Decoded JSON from the invoices endpoint (a list of invoices,
+            a wrapper object around one, or a single invoice object)
+
+    Returns:
+        The most recent invoice, or None if the payload holds no invoices
+    """
+    items = [item for item in _as_list(payload, "invoices", "bills", "items", "data")
+             if isinstance(item, dict)]
+    if not items and isinstance(payload, dict) and _first(payload, "invoiceDate", "date", "issueDate"):
+        items = [payload]
+    if not items:
+        return None
+
+    def invoice_date(item: Dict[str, Any]) -> str:
+        return _iso_date(_first(item, "invoiceDate", "date", "issueDate", "billDate")) or ""
+
+    item = max(items, key=invoice_date)
+    invoice_data: Dict[str, Any] = {}
+
+    amount = _first(item, "amount.value", "amount.amount", "totalAmount.value", "amount", "totalAmount")
+    if amount is not None and not isinstance(amount, dict):
+        invoice_data["amount_eur"] = _as_float(amount)
+
+    status = _first(item, "status", "paymentStatus", "state")
+    if status:
+        invoice_data["status"] = str(status)
+        invoice_data["paid"] = is_paid(status)
+
+    date = invoice_date(item)
+    if date:
+        invoice_data["date"] = date
+    due_date = _iso_date(_first(item, "dueDate", "paymentDueDate", "dueDateTime"))
+    if due_date:
+        invoice_data["due_date"] = due_date
+
+    invoice_id = _first(item, "invoiceNumber", "id", "invoiceId", "number")
+    if invoice_id:
+        invoice_data["invoice_id"] = str(invoice_id)
+    elif date:
+        invoice_data["invoice_id"] = f"INV-{date.replace('-', '')}"
+
+    return Invoice(**invoice_data)
@@ -0,0 +1,238 @@
+"""On-disk, content-addressed cache for the portal's fingerprinted static assets."""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Tuple
+from urllib.parse import urlsplit
+
+
+# Build tools put a content hash in the file name of immutable bundles,
+# e.g. main.3f2a9c1b8e7d6a54.js, chunk-AB12CD34.js or styles-5QQO4JRA.css
+FINGERPRINTED_ASSET = re.compile(
+    r"[.-](?:[0-9a-f]{8,}|[A-Z0-9]{8,})\.(?:js|mjs|css|woff2?|ttf|svg|png|jpe?g|gif|webp|ico)$"
+)
+
+# Response headers worth replaying when serving from the cache
+_KEPT_HEADERS = ("content-type", "cache-control", "etag", "last-modified", "access-control-allow-origin")
+
+# Headers describing the encoded transfer; the fetched body is already decoded
+_TRANSFER_HEADERS = ("content-encoding", "content-length", "transfer-encoding")
+
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+def is_fingerprinted(url: str) -> bool:
+    """Check whether a URL points to an immutable, content-hashed asset."""
+    return bool(FINGERPRINTED_ASSET.search(urlsplit(url).path))
+
+
+@dataclass
+class _Entry:
+    digest: str
+    size: int
+    headers: Dict[str, str]
+    last_access: float
+
+
+@dataclass
+class AssetCacheStats:
+    """Hits and misses of an AssetCache."""
+    hits: int = 0
+    misses: int = 0
+    bytes_served: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        """Share of fingerprinted asset requests served from disk."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "bytes_served": self.bytes_served,
+            "evictions": self.evictions,
+        }
+
+
+class AssetCache:
+    """
+    Size-bounded LRU cache of static assets, stored by content hash.
+
+    Bodies live under objects/<sha256>, so identical files referenced by
+    different URLs are stored once. An index maps every URL to its digest,
+    the headers to replay and the last access time used for eviction.
+    Only fingerprinted URLs (see is_fingerprinted) are cached; they never
+    change, so entries need no revalidation. Everything else is fetched live.
+    The index is written once per page (when the next document is requested)
+    and by flush(), which the clients call on close.
+
+    Usage:
+        cache = AssetCache("hey_assets")
+        context.route("**/*", cache.handle)
+    """
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            directory: Cache directory (created if needed)
+            max_bytes: Total body size kept on disk before the least recently used entries go
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.stats = AssetCacheStats()
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._dirty = False
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self._load_index()
+
+    @property
+    def _index_path(self) -> str:
+        return os.path.join(self.directory, "index.json")
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path, "r") as f:
+                raw = json.load(f)
+            self._entries = {url: _Entry(**entry) for url, entry in raw.items()}
+        except (OSError, ValueError, TypeError):
+            self._entries = {}
+
+    def flush(self):
+        """Write the index (with the access times) to disk."""
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp_path = f"{self._index_path}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump({url: vars(entry) for url, entry in self._entries.items()}, f)
+            os.replace(tmp_path, self._index_path)
+            self._dirty = False
+
+    @property
+    def size(self) -> int:
+        """Total size of the stored bodies in bytes (shared bodies counted once)."""
+        return sum({e.digest: e.size for e in self._entries.values()}.values())
+
+    def get(self, url: str) -> Optional[Tuple[Dict[str, str], bytes]]:
+        """Return the cached headers and body for a URL, or None."""
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None:
+                return None
+            try:
+                with open(self._object_path(entry.digest), "rb") as f:
+                    body = f.read()
+            except OSError:
+                del self._entries[url]
+                self._dirty = True
+                return None
+            entry.last_access = time.time()
+            self._dirty = True
+            return entry.headers, body
+
+    def put(self, url: str, headers: Dict[str, str], body: bytes):
+        """
+        Store a response body under its content hash and evict old entries if needed.
+
+        The index is only marked dirty; call flush() to persist it.
+        """
+        if len(body) > self.max_bytes:
+            return
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        with self._lock:
+            if not os.path.exists(path):
+                tmp_path = f"{path}.tmp"
+                with open(tmp_path, "wb") as f:
+                    f.write(body)
+                os.replace(tmp_path, path)
+            kept = {k: v for k, v in headers.items() if k.lower() in _KEPT_HEADERS}
+            self._entries[url] = _Entry(digest, len(body), kept, time.time())
+            self._dirty = True
+            self._evict()
+
+    def _evict(self):
+        """Drop least recently used URLs until the stored bodies fit in max_bytes."""
+        sizes: Dict[str, int] = {}
+        for entry in self._entries.values():
+            sizes[entry.digest] = entry.size
+        total = sum(sizes.values())
+        for url, entry in sorted(self._entries.items(), key=lambda item: item[1].last_access):
+            if total <= self.max_bytes:
+                break
+            del self._entries[url]
+            self.stats.evictions += 1
+            if not any(e.digest == entry.digest for e in self._entries.values()):
+                total -= entry.size
+                try:
+                    os.remove(self._object_path(entry.digest))
+                except OSError:
+                    pass
+
+    def _cacheable(self, request) -> bool:
+        return request.method == "GET" and is_fingerprinted(request.url)
+
+    @staticmethod
+    def _fulfill_headers(response) -> Dict[str, str]:
+        return {k: v for k, v in response.headers.items() if k.lower() not in _TRANSFER_HEADERS}
+
+    def handle(self, route):
+        """Route handler for the sync API."""
+        request = route.request
+        if not self._cacheable(request):
+            if request.resource_type == "document":
+                self.flush()
+            route.fallback()
+            return
+        cached = self.get(request.url)
+        if cached:
+            headers, body = cached
+            self.stats.hits += 1
+            self.stats.bytes_served += len(body)
+            route.fulfill(status=200, headers=headers, body=body)
+            return
+        self.stats.misses += 1
+        response = route.fetch()
+        body = response.body()
+        if response.status == 200:
+            self.put(request.url, response.headers, body)
+        route.fulfill(response=response, headers=self._fulfill_headers(response), body=body)
+
+    async def handle_async(self, route):
+        """Route handler for the async API; the file IO runs in the default executor."""
+        loop = asyncio.get_running_loop()
+        request = route.request
+        if not self._cacheable(request):
+            if request.resource_type == "document":
+                await loop.run_in_executor(None, self.flush)
+            await route.fallback()
+            return
+        cached = await loop.run_in_executor(None, self.get, request.url)
+        if cached:
+            headers, body = cached
+            self.stats.hits += 1
+            self.stats.bytes_served += len(body)
+            await route.fulfill(status=200, headers=headers, body=body)
+            return
+        self.stats.misses += 1
+        response = await route.fetch()
+        body = await response.body()
+        if response.status == 200:
+            await loop.run_in_executor(None, self.put, request.url, response.headers, body)
+        await route.fulfill(response=response, headers=self._fulfill_headers(response), body=body)
@@ -0,0 +1,568 @@
+"""Asyncio Hey Telecom client built on playwright.async_api."""
+import asyncio
+import logging
+from functools import partial
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, AsyncIterator
+from urllib.parse import urljoin
+
+from . import extraction as ex
+from .api import ApiError, AuthenticationError
+from .base import BaseHeyTelecomClient
+from .instrumentation import instrumented
+from .interception import products_from_payloads, usage_from_payloads, invoice_from_payloads
+from .models import Product, Invoice, AccountData
+from .readiness import (
+    ArmedReadiness, Readiness, login_state_ready, LOGIN_FORM_READY, LOGIN_RESULT_READY,
+    PRODUCTS_READY, USAGE_READY, INVOICE_READY
+)
+from .scheduler import RefreshScheduler
+from .session import check_session, load_storage_state, save_storage_state
+
+if TYPE_CHECKING:
+    from playwright.async_api import Page
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncHeyTelecomClient(BaseHeyTelecomClient):
+    """
+    Async client for interacting with Hey Telecom account.
+
+    Offers the same API as HeyTelecomClient, but every method is a coroutine
+    and waits on page events instead of sleeping, so it can run directly on
+    an asyncio event loop (e.g. inside Home Assistant).
+    """
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.connect()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    async def _run_blocking(self, func, *args):
+        """Run blocking HTTP, installer or cache file work in the default executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(func, *args))
+
+    async def connect(self):
+        """Start browser and create page (deferred for the "api" and "auto" backends)."""
+        self._connected = True
+        if self.backend == "browser":
+            await self._start_browser()
+
+    @instrumented("browser_start")
+    async def _start_browser(self):
+        """Launch Chromium with the persistent profile (or saved storage_state) and open a page."""
+        # Ensure Playwright chromium is installed before connecting; the
+        # check uses the sync API, which cannot run on the event loop thread
+        if self.auto_install:
+            from .installer import ensure_playwright_installed
+            await self._run_blocking(ensure_playwright_installed)
+
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        if self.storage_state_path:
+            # A fresh context seeded with the saved cookies and localStorage
+            self._chromium = await self._playwright.chromium.launch(headless=self.headless)
+            self._browser = await self._chromium.new_context(
+                storage_state=load_storage_state(self.storage_state_path)
+            )
+        else:
+            self._browser = await self._playwright.chromium.launch_persistent_context(
+                user_data_dir=self.user_data_dir,
+                headless=self.headless
+            )
+        self._owns_browser = True
+        await self._open_page()
+
+    async def attach(self, context):
+        """
+        Run on a browser context owned by the caller instead of launching Chromium.
+
+        Used by AccountPool to give every account an isolated context in a
+        shared browser. close() then only closes the page, not the context.
+
+        Args:
+            context: Playwright BrowserContext to open the page in
+        """
+        self._browser = context
+        self._owns_browser = False
+        self._connected = True
+        await self._open_page()
+
+    async def _open_page(self):
+        """Register the context listeners and open the main page."""
+        if self.token_cache:
+            self._browser.on("request", self._capture_credentials)
+        if self._collector:
+            self._browser.on("response", self._collector)
+        self._browser.on("response", self._count_response)
+        # Handlers registered last run first: blocked requests never reach the asset cache
+        if self.asset_cache:
+            await self._browser.route("**/*", self.asset_cache.handle_async)
+        if self.router:
+            await self._browser.route("**/*", self.router.handle_async)
+            self._browser.on("response", self.router.on_response)
+        self._page = await self._browser.new_page()
+
+    async def close(self):
+        """Close browser and cleanup."""
+        if self.asset_cache:
+            await self._run_blocking(self.asset_cache.flush)
+        if self._api:
+            self._api.close()
+            self._api = None
+        if self._browser:
+            if self._owns_browser:
+                await self._save_session()
+                await self._browser.close()
+            elif self._page:
+                await self._page.close()
+            self._browser = None
+        if self._chromium:
+            await self._chromium.close()
+            self._chromium = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+        self._page = None
+        self._connected = False
+
+    async def _require_page(self) -> "Page":
+        """Return the active page, starting the browser on demand for the "auto" backend."""
+        if not self._page:
+            if self.backend == "auto" and self._connected:
+                await self._start_browser()
+            else:
+                raise RuntimeError("Browser not connected. Call connect() first.")
+        return self._page
+
+    @instrumented("cookie_popup")
+    async def _handle_cookie_popup(self):
+        """Check for and handle cookie popup if present."""
+        if not self._page:
+            return False
+
+        try:
+            reject_button = self._locator(ex.COOKIE_REJECT_BUTTON)
+            if await reject_button.count() > 0:
+                await reject_button.click()
+                await reject_button.wait_for(state="hidden", timeout=5000)
+                return True
+        except Exception:
+            pass
+        return False
+
+    async def _wait_until_ready(self, armed: ArmedReadiness) -> bool:
+        """Wait for an armed readiness profile and record how long it took."""
+        with self.instrumentation.span("wait", profile=armed.readiness.name):
+            result = await armed.wait_async()
+        self.wait_stats[result.name] = self.wait_stats.get(result.name, 0.0) + result.waited
+        return result.ready
+
+    async def _check_logged_in(self) -> bool:
+        """Check if user is logged in."""
+        if not self._page:
+            return False
+
+        return await self._locator(ex.LOGGED_IN_MENU).count() > 0
+
+    async def _has_api_credentials_async(self) -> bool:
+        """Run the (possibly network bound) credential check off the event loop."""
+        if self.backend == "browser":
+            return False
+        return await self._run_blocking(self._has_api_credentials)
+
+    @instrumented("login")
+    async def login(self):
+        """
+        Login to Hey Telecom account.
+
+        With the "api" and "auto" backends this first tries to obtain API
+        credentials over HTTP and only drives the browser login form when
+        that is not possible.
+
+        In the browser, a session found in the context's cookies or stored
+        tokens (see check_session) is trusted without loading a page. Should
+        the portal disagree, the next data request is redirected to the auth
+        host and logs in again.
+
+        Raises:
+            ValueError: If email or password not provided
+            RuntimeError: If login fails
+        """
+        if await self._has_api_credentials_async():
+            return
+        if self.backend == "api":
+            raise ValueError("access_token and api_key required for the api backend")
+        page = await self._require_page()
+
+        # Cookies and stored tokens tell whether the session is alive without a page load
+        if await self._session_valid():
+            return
+
+        # Navigate to products page
+        armed = login_state_ready(self.AUTH_URL).arm(page)
+        await self._goto(page, f"{self.BASE_URL}{ex.PRODUCTS_PATH}")
+        await self._wait_until_ready(armed)
+
+        # Check if already logged in (before handling cookies)
+        if await self._check_logged_in():
+            return
+
+        await self._submit_login_form()
+
+    async def _session_valid(self) -> bool:
+        """Check the context's cookies and stored tokens for a usable session."""
+        with self.instrumentation.span("session_check"):
+            self.session = check_session(await self._browser.storage_state(), self.BASE_URL, self.AUTH_URL)
+        return self.session.valid
+
+    def _on_auth_page(self) -> bool:
+        """Check whether the main page was redirected to the login portal."""
+        return self._page.url.startswith(self.AUTH_URL)
+
+    async def _submit_login_form(self):
+        """
+        Log in through the email form, starting from a page that redirects to the auth host.
+
+        Raises:
+            ValueError: If email or password not provided
+            RuntimeError: If login fails
+        """
+        if not self.email or not self.password:
+            raise ValueError("Email and password required for login")
+        page = self._page
+
+        # Wait for redirect to auth page
+        await page.wait_for_url(f"**{self.AUTH_URL}/**", timeout=10000)
+
+        # Click on "Inloggen via E-mail" button
+        email_login_btn = self._locator(ex.LOGIN_BY_EMAIL_LINK)
+        await email_login_btn.wait_for(state="visible", timeout=10000)
+        armed = LOGIN_FORM_READY.arm(page)
+        await email_login_btn.click()
+        await self._wait_until_ready(armed)
+
+        # Fill in email and password
+        await self._locator(ex.LOGIN_EMAIL_INPUT).fill(self.email)
+
+        password_input = self._locator(ex.LOGIN_PASSWORD_INPUT)
+        await password_input.wait_for(state="visible", timeout=10000)
+        await password_input.fill(self.password)
+
+        # Click login button and wait for either the account menu or the error message
+        armed = LOGIN_RESULT_READY.arm(page)
+        await self._locator(ex.LOGIN_SUBMIT_BUTTON).click()
+        await self._wait_until_ready(armed)
+
+        # Check for error message
+        if await self._locator(ex.LOGIN_ERROR).count() > 0:
+            raise RuntimeError("Login failed: Wrong username and/or password")
+
+        # Verify login
+        if not await self._check_logged_in():
+            raise RuntimeError("Login verification failed")
+        await self._save_session()
+
+    async def _save_session(self):
+        """Write the context's cookies and localStorage to the storage_state file."""
+        if not self.storage_state_path or not self._browser or not self._owns_browser:
+            return
+        try:
+            save_storage_state(await self._browser.storage_state(), self.storage_state_path)
+        except Exception:
+            # Losing the session only costs a login next time
+            pass
+
+    @instrumented("get_products")
+    async def get_products(self) -> List[Product]:
+        """
+        Get all products from the account.
+
+        Returns:
+            List of Product objects
+
+        Raises:
+            AuthenticationError: If the "api" backend is used and the token is rejected
+            ApiError: If the "api" backend is used and the request fails
+        """
+        if await self._has_api_credentials_async():
+            try:
+                return await self._run_blocking(self._get_api().get_products)
+            except AuthenticationError:
+                self._invalidate_credentials()
+                if self.backend == "api":
+                    raise
+            except ApiError as e:
+                if self.backend == "api":
+                    raise
+                logger.warning("API request failed, falling back to the browser: %s", e)
+        elif self.backend == "api":
+            raise ValueError("access_token and api_key required for the api backend")
+        page = await self._require_page()
+
+        # Navigate to products page
+        if self._collector:
+            self._collector.clear()
+        await self._open(f"{self.BASE_URL}{ex.PRODUCTS_PATH}", self._readiness(PRODUCTS_READY, "inventory"))
+        if self._collector:
+            products = products_from_payloads(await self._intercepted("inventory", page))
+            if products is not None:
+                return products
+            await self._wait_until_ready(PRODUCTS_READY.arm(page))
+        await self._handle_cookie_popup()
+
+        await self._wait_for_selector(ex.PRODUCT_ITEM, timeout=10000)
+
+        products_data = ex.products_from_snapshot(
+            await self._snapshot(page, "products", ex.PRODUCTS_SNAPSHOT_SCRIPT, ex.PRODUCTS_SNAPSHOT_ARG))
+
+        if not products_data:
+            return []
+        self._apply_product_state(products_data)
+
+        # Extract usage data for each product
+        if self.usage_tabs > 1 and await self._extract_usage_parallel(products_data):
+            self._record_product_state(products_data)
+            return self._build_products(products_data)
+
+        snapshot = None
+        for product_info in products_data:
+            if not product_info["has_usage_link"] or product_info.get("cached"):
+                continue
+
+            if snapshot is None:
+                snapshot = await self._snapshot(page, "products", ex.PRODUCTS_SNAPSHOT_SCRIPT,
+                                                ex.PRODUCTS_SNAPSHOT_ARG)
+            index = ex.find_product_index(snapshot, product_info["identifier"])
+            if index is None:
+                continue
+
+            product = self._locator(ex.PRODUCT_ITEM).nth(index)
+            armed = self._readiness(USAGE_READY, "usage").arm(page)
+            await product.locator(ex.PRODUCT_CONSUMPTION_LINK).first.click()
+            usage_data = await self._extract_usage_data(armed)
+            if usage_data:
+                product_info["data"]["usage"] = usage_data
+
+            armed = PRODUCTS_READY.arm(page)
+            await self._go_back(page)
+            await self._wait_until_ready(armed)
+            await self._wait_for_selector(ex.PRODUCT_ITEM, timeout=10000)
+            snapshot = None
+
+        self._record_product_state(products_data)
+        return self._build_products(products_data)
+
+    @instrumented("get_latest_invoice")
+    async def get_latest_invoice(self) -> Optional[Invoice]:
+        """
+        Get the latest invoice.
+
+        Returns:
+            Invoice object or None if no invoice found
+
+        Note:
+            Invoices are not exposed by the documented API, so the "api"
+            backend always returns None.
+        """
+        if self.backend == "api":
+            return None
+        page = await self._require_page()
+
+        if self._collector:
+            self._collector.clear()
+        await self._open(f"{self.BASE_URL}{ex.INVOICES_PATH}", self._readiness(INVOICE_READY, "invoice"))
+        if self._collector:
+            invoice = invoice_from_payloads(await self._intercepted("invoice", page))
+            if invoice:
+                return invoice
+            await self._wait_until_ready(INVOICE_READY.arm(page))
+        await self._handle_cookie_popup()
+
+        try:
+            await self._wait_for_selector(ex.INVOICE_SECTION, timeout=10000)
+        except Exception:
+            return None
+
+        texts = await self._snapshot(page, "invoice", ex.INVOICE_SNAPSHOT_SCRIPT, ex.INVOICE_SNAPSHOT_ARG)
+        if texts is None:
+            return None
+
+        return ex.invoice_from_texts(texts)
+
+    async def get_account_data(self, include_invoice: Optional[bool] = None) -> AccountData:
+        """
+        Get all account data including products and latest invoice.
+
+        The spans and counters of this call are attached as AccountData.sync.
+
+        Args:
+            include_invoice: Fetch the latest invoice. By default it is fetched unless
+                the "auto" backend served the products from the API, as the invoice
+                would need a browser launch of its own; pass True to fetch it anyway.
+
+        Returns:
+            AccountData object with all information
+        """
+        counters = dict(self.instrumentation.counters)
+        with self.instrumentation.span("get_account_data") as span:
+            products = await self.get_products()
+            invoice = await self.get_latest_invoice() if self._wants_invoice(include_invoice) else None
+
+        return AccountData(
+            products=products,
+            latest_invoice=invoice,
+            sync=self.instrumentation.summary(span, counters_since=counters)
+        )
+
+    async def _intercepted(self, kind: str, page: "Page") -> List[Any]:
+        """Read the JSON bodies of the captured responses of one kind for a page."""
+        payloads = []
+        responses = self._collector.take(kind, page)
+        if not responses:
+            self.instrumentation.count("payload_misses")
+            logger.info("No %s payload matched PAYLOAD_PATTERNS, reading the page instead", kind)
+        for response in responses:
+            try:
+                payloads.append(await response.json())
+            except Exception:
+                continue
+        return payloads
+
+    async def watch(self, scheduler: Optional[RefreshScheduler] = None,
+                    max_polls: Optional[int] = None) -> AsyncIterator[AccountData]:
+        """
+        Poll the account on an adaptive schedule and yield every result.
+
+        The delay between polls comes from the scheduler, which learns how
+        often the portal updates its usage counters from their "Laatste
+        update" timestamps. Call login() first when using the browser.
+
+        Args:
+            scheduler: RefreshScheduler to use (a default one is created if omitted)
+            max_polls: Stop after this many polls (None polls forever)
+
+        Yields:
+            AccountData objects
+        """
+        scheduler = scheduler or RefreshScheduler()
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            account = await self.get_account_data()
+            scheduler.observe(account)
+            polls += 1
+            yield account
+            if max_polls is None or polls < max_polls:
+                await asyncio.sleep(scheduler.next_delay())
+
+    async def _snapshot(self, page: "Page", name: str, script: str, arg: Dict[str, Any]) -> Any:
+        """Run a DOM snapshot script in one round trip and count it under `name`."""
+        self.roundtrips[name] = self.roundtrips.get(name, 0) + 1
+        self.instrumentation.count("evaluations")
+        with self.instrumentation.span("extract", snapshot=name):
+            return await page.evaluate(script, arg)
+
+    async def _open(self, url: str, readiness: Readiness) -> bool:
+        """
+        Navigate the main page to a portal page and wait until it is ready.
+
+        Login happens lazily here: when the portal redirects to the auth
+        host, the login form is submitted and the page is loaded again.
+
+        Returns:
+            Whether the page became ready
+        """
+        # A stale session is redirected to the auth host by the app itself, after
+        # goto returned: abort_url ends the wait then instead of at the timeout
+        armed = readiness.arm(self._page, abort_url=self.AUTH_URL)
+        await self._goto(self._page, url)
+        ready = await self._wait_until_ready(armed)
+        if ready or not self._on_auth_page():
+            return ready
+        self.instrumentation.count("reauthentications")
+        await self._submit_login_form()
+        if self._collector:
+            self._collector.clear()
+        armed = readiness.arm(self._page)
+        await self._goto(self._page, url)
+        return await self._wait_until_ready(armed)
+
+    async def _goto(self, page: "Page", url: str, **kwargs):
+        """Navigate a page, timed as a "navigate" span."""
+        self.instrumentation.count("navigations")
+        with self.instrumentation.span("navigate", url=url):
+            return await page.goto(url, **kwargs)
+
+    async def _go_back(self, page: "Page"):
+        """Go back in a page's history, timed as a "navigate" span."""
+        self.instrumentation.count("navigations")
+        with self.instrumentation.span("navigate", url="back"):
+            return await page.go_back()
+
+    def _locator(self, selector: str):
+        """Create a locator on the main page and count it."""
+        self.instrumentation.count("locators")
+        return self._page.locator(selector)
+
+    async def _wait_for_selector(self, selector: str, timeout: float = 10000):
+        """Wait for a selector on the main page, timed as a "wait_for_selector" span."""
+        self.instrumentation.count("locators")
+        with self.instrumentation.span("wait_for_selector", selector=selector):
+            return await self._page.wait_for_selector(selector, timeout=timeout)
+
+    async def _extract_usage_parallel(self, products_data: List[Dict[str, Any]]) -> bool:
+        """
+        Load the detailed usage pages concurrently in a bounded pool of tabs.
+
+        Returns:
+            False if a consumption link has no href (caller falls back to clicking)
+        """
+        jobs = []
+        for product_info in products_data:
+            if not product_info["has_usage_link"] or product_info.get("cached"):
+                continue
+            if not product_info["usage_href"]:
+                return False
+            jobs.append((product_info["data"], urljoin(self._page.url, product_info["usage_href"])))
+
+        tabs: "asyncio.Queue[Page]" = asyncio.Queue()
+        opened = []
+        for _ in range(min(self.usage_tabs, len(jobs))):
+            tab = await self._browser.new_page()
+            opened.append(tab)
+            tabs.put_nowait(tab)
+
+        async def load(product_data: Dict[str, Any], url: str):
+            tab = await tabs.get()
+            try:
+                armed = self._readiness(USAGE_READY, "usage").arm(tab)
+                await self._goto(tab, url, wait_until="commit")
+                usage_data = await self._extract_usage_data(armed)
+                if usage_data:
+                    product_data["usage"] = usage_data
+            finally:
+                tabs.put_nowait(tab)
+
+        try:
+            await asyncio.gather(*(load(product_data, url) for product_data, url in jobs))
+        finally:
+            for tab in opened:
+                await tab.close()
+        return True
+
+    async def _extract_usage_data(self, armed: ArmedReadiness) -> Optional[Dict[str, Any]]:
+        """Extract usage data from a detailed usage page once it is ready."""
+        await self._wait_until_ready(armed)
+        if self._collector:
+            usage = usage_from_payloads(await self._intercepted("usage", armed.page))
+            if usage:
+                return usage
+            await self._wait_until_ready(USAGE_READY.arm(armed.page))
+        return ex.usage_from_snapshot(
+            await self._snapshot(armed.page, "usage", ex.USAGE_SNAPSHOT_SCRIPT, ex.USAGE_SNAPSHOT_ARG))
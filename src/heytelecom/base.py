@@ -0,0 +1,306 @@
+"""Configuration and API credential handling shared by the sync and async clients."""
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Union
+from urllib.parse import urlsplit
+
+from .api import HeyTelecomApi
+from .asset_cache import AssetCache
+from .instrumentation import Instrumentation, Hook
+from .interception import ResponseCollector
+from .models import Product
+from .oidc import OidcLogin, OidcFlowError
+from .parsers import build_product
+from .product_state import ProductState, ProductStateStore, product_fingerprint, product_state_path
+from .readiness import Readiness, payload_ready
+from .routing import RequestRouter, RoutingProfile, first_party_hosts
+from .session import SessionCheck, storage_state_path
+from .tokens import (
+    ApiCredentials, TokenCache, credentials_from_headers, token_cache_path, token_expiry
+)
+
+
+class BaseHeyTelecomClient:
+    """Base class holding the settings and API credentials of a Hey Telecom client."""
+
+    BASE_URL = "https://ecare.heytelecom.be"
+    AUTH_URL = "https://auth.heytelecom.be"
+    BACKENDS = ("browser", "api", "auto")
+    EXTRACTIONS = ("dom", "xhr")
+    SESSION_MODES = ("profile", "storage_state")
+
+    def __init__(self, email: Optional[str] = None, password: Optional[str] = None,
+                 user_data_dir: str = "hey_browser_data", auto_install: bool = True,
+                 backend: str = "browser", access_token: Optional[str] = None,
+                 api_key: Optional[str] = None, api_url: Optional[str] = None,
+                 cache_tokens: bool = True, native_login: bool = True,
+                 oidc_url: Optional[str] = None, usage_tabs: int = 1, extraction: str = "dom",
+                 incremental: bool = False,
+                 block_resources: Union[str, RoutingProfile, None] = None,
+                 asset_cache: Union[str, AssetCache, None] = None,
+                 base_url: Optional[str] = None, auth_url: Optional[str] = None,
+                 hooks: Optional[List[Hook]] = None, session_mode: str = "profile"):
+        """
+        Initialize Hey Telecom client.
+
+        Args:
+            email: Email address for login (optional if already logged in)
+            password: Password for login (optional if already logged in)
+            user_data_dir: Directory to store browser session data
+            auto_install: Automatically install Playwright chromium if not found (default: True)
+            backend: "browser" scrapes the ecare pages with Playwright, "api" only uses
+                the JSON API, "auto" uses the API and falls back to the browser
+            access_token: Bearer token for the JSON API
+            api_key: x-api-key header value for the JSON API
+            api_url: Override the JSON API base URL
+            cache_tokens: Capture the API credentials used by the ecare app while the
+                browser runs and cache them next to user_data_dir for later API calls
+            native_login: Renew expired API tokens over HTTP (refresh token or PKCE
+                login with email/password) before falling back to the browser
+            oidc_url: Override the OpenID issuer URL used by the native login
+            usage_tabs: Number of tabs used to load the detailed usage pages
+                concurrently (1 keeps the click-through-and-go-back flow)
+            extraction: "dom" reads the rendered pages, "xhr" builds the models from
+                the JSON responses the ecare app receives and only falls back to the
+                rendered page when no usable payload was captured
+            incremental: Keep per-product state next to user_data_dir and only open the
+                detailed usage page of products whose list entry changed or whose
+                counters are expected to have been updated; the others get their
+                stored usage, marked with cached_at
+            block_resources: Routing profile ("standard", "strict" or a RoutingProfile)
+                aborting images, fonts, the cookie banner and trackers; None loads everything
+            asset_cache: Directory (or AssetCache) serving the portal's fingerprinted
+                JS/CSS bundles from disk across browser restarts
+            base_url: Override the ecare portal URL (e.g. for a local fixture server)
+            auth_url: Override the login portal URL
+            hooks: Instrumentation callbacks, called as hook(event, payload) for every
+                span start/end and counter update (see Instrumentation)
+            session_mode: "profile" keeps a full persistent Chromium profile in
+                user_data_dir; "storage_state" only saves the cookies and localStorage
+                to <user_data_dir>.state.json and starts a fresh, non-persistent
+                context from it
+        
+        Note:
+            Browser always runs in headless mode (no GUI). With the "auto" backend
+            the browser is only started when the API cannot be used, i.e. when no
+            unexpired token was passed in or found in the token cache.
+        """
+        if backend not in self.BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {self.BACKENDS}")
+        if usage_tabs < 1:
+            raise ValueError("usage_tabs must be at least 1")
+        if extraction not in self.EXTRACTIONS:
+            raise ValueError(f"Unknown extraction '{extraction}', expected one of {self.EXTRACTIONS}")
+        if session_mode not in self.SESSION_MODES:
+            raise ValueError(f"Unknown session_mode '{session_mode}', expected one of {self.SESSION_MODES}")
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        if auth_url:
+            self.AUTH_URL = auth_url.rstrip("/")
+        self.email = email
+        self.password = password
+        self.user_data_dir = user_data_dir
+        self.auto_install = auto_install
+        self.headless = True  # Always run headless
+        self.backend = backend
+        self.access_token = access_token
+        self.api_key = api_key
+        self.api_url = api_url
+        self.token_cache = TokenCache(token_cache_path(user_data_dir)) if cache_tokens else None
+        self._token_expires_at = token_expiry(access_token) if access_token else None
+        self._refresh_token: Optional[str] = None
+        self.native_login = native_login
+        self.oidc_url = oidc_url
+        self.usage_tabs = usage_tabs
+        self.extraction = extraction
+        self._collector = ResponseCollector(self._api_host()) if extraction == "xhr" else None
+        self.product_state = ProductStateStore(product_state_path(user_data_dir)) if incremental else None
+        self.router = RequestRouter(block_resources, first_party=first_party_hosts(
+            (self.BASE_URL, self.AUTH_URL, self._api_host(), self.oidc_url or OidcLogin.ISSUER_URL)
+        )) if block_resources else None
+        self.asset_cache = AssetCache(asset_cache) if isinstance(asset_cache, str) else asset_cache
+        self.session_mode = session_mode
+        self.storage_state_path = storage_state_path(user_data_dir) if session_mode == "storage_state" else None
+        # Number of DOM snapshot round trips per page type ("products", "usage", "invoice")
+        self.roundtrips: Dict[str, int] = {}
+        # Seconds spent waiting for pages to become ready, per readiness profile
+        self.wait_stats: Dict[str, float] = {}
+        self.instrumentation = Instrumentation(hooks)
+        # Result of the last navigation-free session check
+        self.session: Optional[SessionCheck] = None
+        self._connected = False
+        self._playwright = None
+        # Browser context (persistent or not) and, in "storage_state" mode, the Browser behind it
+        self._browser = None
+        self._chromium = None
+        self._owns_browser = True
+        self._page = None
+        self._api: Optional[HeyTelecomApi] = None
+
+    def _token_expired(self) -> bool:
+        """Check whether the current Bearer token is (nearly) expired."""
+        return self._token_expires_at is not None and time.time() + 60 >= self._token_expires_at
+
+    def _use_credentials(self, credentials: ApiCredentials):
+        """Switch the API client over to the given credentials."""
+        self.access_token = credentials.access_token
+        self.api_key = credentials.api_key
+        self._token_expires_at = credentials.expires_at
+        self._refresh_token = credentials.refresh_token or self._refresh_token
+
+    def _store_credentials(self, credentials: ApiCredentials):
+        """Use the given credentials and persist them in the token cache."""
+        self._use_credentials(credentials)
+        if not self.token_cache:
+            return
+        credentials.refresh_token = self._refresh_token
+        try:
+            self.token_cache.save(credentials)
+        except OSError:
+            pass
+
+    def _apply_product_state(self, products_data: List[Dict[str, Any]]):
+        """Fill in the stored usage of unchanged products and mark them as cached."""
+        if not self.product_state:
+            return
+        for product_info in products_data:
+            data = product_info["data"]
+            product_info["product_id"] = build_product(data).product_id
+            product_info["fingerprint"] = product_fingerprint(data)
+            if not product_info["has_usage_link"]:
+                continue
+            state = self.product_state.get(product_info["product_id"])
+            if state is None or state.needs_refresh(product_info["fingerprint"]):
+                continue
+            cached_at = datetime.fromtimestamp(state.fetched_at).strftime("%Y-%m-%dT%H:%M:%S")
+            data["usage"] = dict(state.usage, cached_at=cached_at)
+            product_info["cached"] = True
+
+    def _record_product_state(self, products_data: List[Dict[str, Any]]):
+        """Store the usage of the products whose detail page was fetched."""
+        if not self.product_state:
+            return
+        for product_info in products_data:
+            usage = product_info["data"].get("usage")
+            if product_info.get("cached") or not usage:
+                continue
+            state = self.product_state.get(product_info["product_id"])
+            if state is None:
+                state = ProductState(product_info["fingerprint"])
+            state.record(product_info["fingerprint"], usage)
+            self.product_state.put(product_info["product_id"], state)
+        try:
+            self.product_state.save()
+        except OSError:
+            pass
+
+    def _build_products(self, products_data: List[Dict[str, Any]]) -> List[Product]:
+        """Turn the collected product dictionaries into Product objects."""
+        with self.instrumentation.span("parse", products=len(products_data)):
+            return [build_product(p["data"]) for p in products_data]
+
+    def _count_response(self, response):
+        """Response listener counting responses and transferred bytes."""
+        self.instrumentation.count("responses")
+        try:
+            size = int(response.headers.get("content-length", 0))
+        except ValueError:
+            return
+        if size:
+            self.instrumentation.count("bytes_received", size)
+
+    def _api_host(self) -> str:
+        """Host name of the JSON API the ecare app talks to."""
+        return urlsplit(self.api_url or HeyTelecomApi.API_URL).hostname
+
+    def _readiness(self, dom: Readiness, kind: str) -> Readiness:
+        """Pick the readiness profile: the DOM one, or the JSON payload in "xhr" extraction."""
+        if self._collector:
+            return payload_ready(kind, self._api_host(), dom)
+        return dom
+
+    def _wants_invoice(self, include_invoice: Optional[bool]) -> bool:
+        """
+        Decide whether get_account_data() fetches the latest invoice.
+
+        Invoices only come from the portal pages, so by default the "auto"
+        backend skips them unless the browser is already running: a poll
+        served by the API must not launch Chromium for the invoice alone.
+        """
+        if include_invoice is not None:
+            return include_invoice
+        return self.backend == "browser" or self._browser is not None
+
+    def _capture_credentials(self, request):
+        """Request listener that stores the ecare app's API credentials."""
+        credentials = credentials_from_headers(request.url, request.headers, api_host=self._api_host())
+        if not credentials or credentials.access_token == self.access_token:
+            return
+        self._store_credentials(credentials)
+
+    def _invalidate_credentials(self):
+        """Forget an access token that was rejected by the server."""
+        if self.token_cache and self.access_token and self.api_key:
+            # Keep the api key and refresh token, only expire the access token
+            self._store_credentials(ApiCredentials(self.access_token, self.api_key, expires_at=0))
+        self.access_token = None
+        self._token_expires_at = None
+
+    def _native_login(self) -> bool:
+        """
+        Obtain a fresh access token over HTTP, without the browser.
+
+        Uses the refresh token when available and otherwise runs the PKCE
+        login flow with the configured email and password.
+
+        Returns:
+            True if new credentials were obtained, False if the browser is needed
+
+        Raises:
+            LoginError: If the identity provider rejects the email or password
+        """
+        if not self.api_key:
+            return False
+        oidc = OidcLogin(issuer_url=self.oidc_url)
+        try:
+            credentials = None
+            if self._refresh_token:
+                try:
+                    credentials = oidc.refresh(ApiCredentials("", self.api_key,
+                                                              refresh_token=self._refresh_token))
+                except OidcFlowError:
+                    self._refresh_token = None
+            if credentials is None:
+                if not self.email or not self.password:
+                    return False
+                try:
+                    credentials = oidc.login(self.email, self.password, self.api_key)
+                except OidcFlowError:
+                    return False
+        finally:
+            oidc.close()
+        self._store_credentials(credentials)
+        return True
+
+    def _has_api_credentials(self) -> bool:
+        """Check whether the JSON API can be used, loading or renewing credentials if needed."""
+        if self.backend == "browser":
+            return False
+        if self.access_token and self.api_key and not self._token_expired():
+            return True
+        cached = self.token_cache.load() if self.token_cache else None
+        if cached:
+            if cached.is_valid():
+                self._use_credentials(cached)
+                return True
+            self.api_key = self.api_key or cached.api_key
+            self._refresh_token = self._refresh_token or cached.refresh_token
+        return self.native_login and self._native_login()
+
+    def _get_api(self) -> HeyTelecomApi:
+        """Get the JSON API client, creating it on first use."""
+        if self._api is None or self._api.access_token != self.access_token:
+            if self._api:
+                self._api.close()
+            self._api = HeyTelecomApi(self.access_token, self.api_key, api_url=self.api_url)
+        return self._api
@@ -1,43 +1,30 @@
 """Hey Telecom client for accessing mobile usage information."""
+import logging
 import time
-from typing import Optional, Dict, Any, List
-from playwright.sync_api import sync_playwright, Browser, Page, BrowserContext
+from typing import TYPE_CHECKING, Optional, Dict, Any, List, Iterator
+from urllib.parse import urljoin
 
-from .models import Product, Contract, UsageData, Invoice, AccountData
-from .parsers import (
-    parse_data_amount, parse_price, parse_date, parse_period,
-    parse_minutes, parse_sms_count, parse_last_update, is_unlimited
+from . import extraction as ex
+from .api import ApiError, AuthenticationError
+from .base import BaseHeyTelecomClient
+from .instrumentation import instrumented
+from .interception import products_from_payloads, usage_from_payloads, invoice_from_payloads
+from .models import Product, Invoice, AccountData
+from .readiness import (
+    ArmedReadiness, Readiness, login_state_ready, LOGIN_FORM_READY, LOGIN_RESULT_READY,
+    PRODUCTS_READY, USAGE_READY, INVOICE_READY
 )
+from .scheduler import RefreshScheduler
+from .session import check_session, load_storage_state, save_storage_state
 
+if TYPE_CHECKING:
+    from playwright.sync_api import Page
 
-class HeyTelecomClient:
-    """Client for interacting with Hey Telecom account."""
-
-    BASE_URL = "https://ecare.heytelecom.be"
-    AUTH_URL = "https://auth.heytelecom.be"
+logger = logging.getLogger(__name__)
 
-    def __init__(self, email: Optional[str] = None, password: Optional[str] = None,
-                 user_data_dir: str = "hey_browser_data", auto_install: bool = True):
-        """
-        Initialize Hey Telecom client.
 
-        Args:
-            email: Email address for login (optional if already logged in)
-            password: Password for login (optional if already logged in)
-            user_data_dir: Directory to store browser session data
-            auto_install: Automatically install Playwright chromium if not found (default: True)
-        
-        Note:
-            Browser always runs in headless mode (no GUI).
-        """
-        self.email = email
-        self.password = password
-        self.user_data_dir = user_data_dir
-        self.auto_install = auto_install
-        self.headless = True  # Always run headless
-        self._playwright = None
-        self._browser: Optional[BrowserContext] = None
-        self._page: Optional[Page] = None
+class HeyTelecomClient(BaseHeyTelecomClient):
+    """Client for interacting with Hey Telecom account."""
 
     def __enter__(self):
         """Context manager entry."""
@@ -49,452 +36,503 @@ class HeyTelecomClient:
         self.close()
 
     def connect(self):
-        """Start browser and create page."""
+        """Start browser and create page (deferred for the "api" and "auto" backends)."""
+        self._connected = True
+        if self.backend == "browser":
+            self._start_browser()
+
+    @instrumented("browser_start")
+    def _start_browser(self):
+        """Launch Chromium with the persistent profile (or saved storage_state) and open a page."""
         # Ensure Playwright chromium is installed before connecting
         if self.auto_install:
             from .installer import ensure_playwright_installed
             ensure_playwright_installed()
-        
+
+        from playwright.sync_api import sync_playwright
+
         self._playwright = sync_playwright().start()
-        self._browser = self._playwright.chromium.launch_persistent_context(
-            user_data_dir=self.user_data_dir,
-            headless=self.headless
-        )
+        if self.storage_state_path:
+            # A fresh context seeded with the saved cookies and localStorage
+            self._chromium = self._playwright.chromium.launch(headless=self.headless)
+            self._browser = self._chromium.new_context(
+                storage_state=load_storage_state(self.storage_state_path)
+            )
+        else:
+            self._browser = self._playwright.chromium.launch_persistent_context(
+                user_data_dir=self.user_data_dir,
+                headless=self.headless
+            )
+        if self.token_cache:
+            self._browser.on("request", self._capture_credentials)
+        if self._collector:
+            self._browser.on("response", self._collector)
+        self._browser.on("response", self._count_response)
+        # Handlers registered last run first: blocked requests never reach the asset cache
+        if self.asset_cache:
+            self._browser.route("**/*", self.asset_cache.handle)
+        if self.router:
+            self._browser.route("**/*", self.router.handle)
+            self._browser.on("response", self.router.on_response)
         self._page = self._browser.new_page()
 
     def close(self):
         """Close browser and cleanup."""
+        if self.asset_cache:
+            self.asset_cache.flush()
+        if self._api:
+            self._api.close()
+            self._api = None
         if self._browser:
+            self._save_session()
             self._browser.close()
+            self._browser = None
+        if self._chromium:
+            self._chromium.close()
+            self._chromium = None
         if self._playwright:
             self._playwright.stop()
+            self._playwright = None
+        self._page = None
+        self._connected = False
+
+    def _require_page(self) -> "Page":
+        """Return the active page, starting the browser on demand for the "auto" backend."""
+        if not self._page:
+            if self.backend == "auto" and self._connected:
+                self._start_browser()
+            else:
+                raise RuntimeError("Browser not connected. Call connect() first.")
+        return self._page
 
+    @instrumented("cookie_popup")
     def _handle_cookie_popup(self):
         """Check for and handle cookie popup if present."""
         if not self._page:
             return False
-        
+
         try:
-            reject_button = self._page.locator('button#onetrust-reject-all-handler')
+            reject_button = self._locator(ex.COOKIE_REJECT_BUTTON)
             if reject_button.count() > 0:
                 reject_button.click()
-                time.sleep(0.5)  # Reduced from 1 second
+                reject_button.wait_for(state="hidden", timeout=5000)
                 return True
-        except:
+        except Exception:
             pass
         return False
 
-    def _wait_for_page_load(self, timeout: int = 30000):
-        """Wait for page to load completely."""
-        if not self._page:
-            raise RuntimeError("Browser not connected. Call connect() first.")
-        
-        time.sleep(1)  # Minimum 1 second (reduced from 2)
-        
-        # Wait for all spinners to disappear
-        try:
-            start_time = time.time()
-            while time.time() - start_time < timeout / 1000:
-                spinners = self._page.locator('svg.p-progress-spinner')
-                if spinners.count() == 0:
-                    return True
-                time.sleep(0.2)  # Check every 200ms (reduced from 300ms)
-            return False
-        except Exception:
-            return False
+    def _wait_until_ready(self, armed: ArmedReadiness) -> bool:
+        """Wait for an armed readiness profile and record how long it took."""
+        with self.instrumentation.span("wait", profile=armed.readiness.name):
+            result = armed.wait()
+        self.wait_stats[result.name] = self.wait_stats.get(result.name, 0.0) + result.waited
+        return result.ready
 
     def _check_logged_in(self) -> bool:
         """Check if user is logged in."""
         if not self._page:
             return False
-        
-        mijn_account = self._page.locator('span.p-menuitem-text.ng-star-inserted.button-label:has-text("Mijn account")')
+
+        mijn_account = self._locator(ex.LOGGED_IN_MENU)
         return mijn_account.count() > 0
 
+    @instrumented("login")
     def login(self):
         """
         Login to Hey Telecom account.
-        
+
+        With the "api" and "auto" backends this first tries to obtain API
+        credentials over HTTP and only drives the browser login form when
+        that is not possible.
+
+        In the browser, a session found in the context's cookies or stored
+        tokens (see check_session) is trusted without loading a page. Should
+        the portal disagree, the next data request is redirected to the auth
+        host and logs in again.
+
         Raises:
             ValueError: If email or password not provided
             RuntimeError: If login fails
         """
-        if not self._page:
-            raise RuntimeError("Browser not connected. Call connect() first.")
-        
+        if self._has_api_credentials():
+            return
+        if self.backend == "api":
+            raise ValueError("access_token and api_key required for the api backend")
+        self._require_page()
+
+        # Cookies and stored tokens tell whether the session is alive without a page load
+        if self._session_valid():
+            return
+
         # Navigate to products page
-        self._page.goto(f"{self.BASE_URL}/nl/mijn-producten")
-        self._wait_for_page_load()
-        
+        armed = login_state_ready(self.AUTH_URL).arm(self._page)
+        self._goto(self._page, f"{self.BASE_URL}{ex.PRODUCTS_PATH}")
+        self._wait_until_ready(armed)
+
         # Check if already logged in (before handling cookies)
         if self._check_logged_in():
             return
-        
+
+        self._submit_login_form()
+
+    def _session_valid(self) -> bool:
+        """Check the context's cookies and stored tokens for a usable session."""
+        with self.instrumentation.span("session_check"):
+            self.session = check_session(self._browser.storage_state(), self.BASE_URL, self.AUTH_URL)
+        return self.session.valid
+
+    def _on_auth_page(self) -> bool:
+        """Check whether the main page was redirected to the login portal."""
+        return self._page.url.startswith(self.AUTH_URL)
+
+    def _submit_login_form(self):
+        """
+        Log in through the email form, starting from a page that redirects to the auth host.
+
+        Raises:
+            ValueError: If email or password not provided
+            RuntimeError: If login fails
+        """
         if not self.email or not self.password:
             raise ValueError("Email and password required for login")
-        
+
         # Wait for redirect to auth page
         self._page.wait_for_url(f"**{self.AUTH_URL}/**", timeout=10000)
-        
+
         # Click on "Inloggen via E-mail" button
-        email_login_btn = self._page.locator('a#Login_loginByEmail')
+        email_login_btn = self._locator(ex.LOGIN_BY_EMAIL_LINK)
         email_login_btn.wait_for(state="visible", timeout=10000)
+        armed = LOGIN_FORM_READY.arm(self._page)
         email_login_btn.click()
-        self._wait_for_page_load()
-        
+        self._wait_until_ready(armed)
+
         # Fill in email
-        email_input = self._page.locator('input#Login_byEmail_emailAddress')
-        email_input.wait_for(state="visible", timeout=10000)
+        email_input = self._locator(ex.LOGIN_EMAIL_INPUT)
         email_input.fill(self.email)
-        
+
         # Fill in password
-        password_input = self._page.locator('input#Login_byEmail_password')
+        password_input = self._locator(ex.LOGIN_PASSWORD_INPUT)
         password_input.wait_for(state="visible", timeout=10000)
         password_input.fill(self.password)
-        
+
         # Click login button
-        login_btn = self._page.locator('button#Login_byEmail_login')
+        login_btn = self._locator(ex.LOGIN_SUBMIT_BUTTON)
+        armed = LOGIN_RESULT_READY.arm(self._page)
         login_btn.click()
-        self._wait_for_page_load()
-        
+
+        # Wait for either the account menu or the error message
+        self._wait_until_ready(armed)
+
         # Check for error message
-        error_msg = self._page.locator('div.error_msgs:has-text("Verkeerde gebruikersnaam en/of wachtwoord")')
+        error_msg = self._locator(ex.LOGIN_ERROR)
         if error_msg.count() > 0:
             raise RuntimeError("Login failed: Wrong username and/or password")
-        
-        # Wait for successful login
-        try:
-            self._page.wait_for_selector('span.p-menuitem-text.ng-star-inserted.button-label:has-text("Mijn account")', timeout=10000)
-        except:
-            pass
-        
-        self._wait_for_page_load()
-        
+
         # Verify login
         if not self._check_logged_in():
             raise RuntimeError("Login verification failed")
+        self._save_session()
+
+    def _save_session(self):
+        """Write the context's cookies and localStorage to the storage_state file."""
+        if not self.storage_state_path or not self._browser or not self._owns_browser:
+            return
+        try:
+            save_storage_state(self._browser.storage_state(), self.storage_state_path)
+        except Exception:
+            # Losing the session only costs a login next time
+            pass
 
+    @instrumented("get_products")
     def get_products(self) -> List[Product]:
         """
         Get all products from the account.
-        
+
         Returns:
             List of Product objects
+
+        Raises:
+            AuthenticationError: If the "api" backend is used and the token is rejected
+            ApiError: If the "api" backend is used and the request fails
         """
-        if not self._page:
-            raise RuntimeError("Browser not connected. Call connect() first.")
-        
+        if self._has_api_credentials():
+            try:
+                return self._get_api().get_products()
+            except AuthenticationError:
+                self._invalidate_credentials()
+                if self.backend == "api":
+                    raise
+            except ApiError as e:
+                if self.backend == "api":
+                    raise
+                logger.warning("API request failed, falling back to the browser: %s", e)
+        elif self.backend == "api":
+            raise ValueError("access_token and api_key required for the api backend")
+        self._require_page()
+
         # Navigate to products page
-        self._page.goto(f"{self.BASE_URL}/nl/mijn-producten")
-        self._wait_for_page_load()
-        
+        if self._collector:
+            self._collector.clear()
+        self._open(f"{self.BASE_URL}{ex.PRODUCTS_PATH}", self._readiness(PRODUCTS_READY, "inventory"))
+        if self._collector:
+            products = products_from_payloads(self._intercepted("inventory", self._page))
+            if products is not None:
+                return products
+            self._wait_until_ready(PRODUCTS_READY.arm(self._page))
+
         # Handle cookie popup
         self._handle_cookie_popup()
-        time.sleep(1)
-        
-        self._page.wait_for_selector('li.iris-products__item', timeout=10000)
-        
-        products = self._page.locator('li.iris-products__item')
-        product_count = products.count()
-        
-        if product_count == 0:
+
+        self._wait_for_selector(ex.PRODUCT_ITEM, timeout=10000)
+
+        products_data = ex.products_from_snapshot(
+            self._snapshot(self._page, "products", ex.PRODUCTS_SNAPSHOT_SCRIPT, ex.PRODUCTS_SNAPSHOT_ARG))
+
+        if not products_data:
             return []
-        
-        # Collect product data
-        products_data = []
-        for i in range(product_count):
-            product = products.nth(i)
-            product_data = self._extract_product_basic_info(product)
-            identifier = self._get_product_identifier(product)
-            products_data.append({
-                "identifier": identifier,
-                "data": product_data
-            })
-        
+        self._apply_product_state(products_data)
+
         # Extract usage data for each product
+        if self.usage_tabs > 1 and self._extract_usage_parallel(products_data):
+            self._record_product_state(products_data)
+            return self._build_products(products_data)
+
+        snapshot = None
         for product_info in products_data:
-            identifier = product_info["identifier"]
-            product_data = product_info["data"]
-            
+            if not product_info["has_usage_link"] or product_info.get("cached"):
+                continue
+
             # Find product again (in case page reloaded)
-            product = self._find_product_by_identifier(identifier)
-            if not product:
+            if snapshot is None:
+                snapshot = self._snapshot(self._page, "products", ex.PRODUCTS_SNAPSHOT_SCRIPT,
+                                          ex.PRODUCTS_SNAPSHOT_ARG)
+            index = ex.find_product_index(snapshot, product_info["identifier"])
+            if index is None:
                 continue
-            
+
             # Extract usage
-            consumption_link = product.locator('a.iris-products__link[data-event_category="MyProducts"]')
-            if consumption_link.count() > 0:
-                consumption_link.click()
-                usage_data = self._extract_usage_data()
-                if usage_data:
-                    product_data["usage"] = usage_data
-                
-                # Go back using browser back (faster than full page reload)
-                self._page.go_back()
-                self._wait_for_page_load()
-                self._page.wait_for_selector('li.iris-products__item', timeout=10000)
-        
+            product = self._locator(ex.PRODUCT_ITEM).nth(index)
+            armed = self._readiness(USAGE_READY, "usage").arm(self._page)
+            product.locator(ex.PRODUCT_CONSUMPTION_LINK).first.click()
+            usage_data = self._extract_usage_data(armed)
+            if usage_data:
+                product_info["data"]["usage"] = usage_data
+
+            # Go back using browser back (faster than full page reload)
+            armed = PRODUCTS_READY.arm(self._page)
+            self._go_back(self._page)
+            self._wait_until_ready(armed)
+            self._wait_for_selector(ex.PRODUCT_ITEM, timeout=10000)
+            snapshot = None
+
         # Convert to Product objects
-        return [self._create_product_object(p["data"]) for p in products_data]
+        self._record_product_state(products_data)
+        return self._build_products(products_data)
 
+    @instrumented("get_latest_invoice")
     def get_latest_invoice(self) -> Optional[Invoice]:
         """
         Get the latest invoice.
-        
+
         Returns:
             Invoice object or None if no invoice found
+
+        Note:
+            Invoices are not exposed by the documented API, so the "api"
+            backend always returns None.
         """
-        if not self._page:
-            raise RuntimeError("Browser not connected. Call connect() first.")
-        
-        self._page.goto(f"{self.BASE_URL}/nl/mijn-facturen")
-        self._wait_for_page_load()
-        
-        # Handle cookie popup (reduced wait time)
+        if self.backend == "api":
+            return None
+        self._require_page()
+
+        if self._collector:
+            self._collector.clear()
+        self._open(f"{self.BASE_URL}{ex.INVOICES_PATH}", self._readiness(INVOICE_READY, "invoice"))
+        if self._collector:
+            invoice = invoice_from_payloads(self._intercepted("invoice", self._page))
+            if invoice:
+                return invoice
+            self._wait_until_ready(INVOICE_READY.arm(self._page))
+
+        # Handle cookie popup
         self._handle_cookie_popup()
-        time.sleep(0.5)
-        
+
         try:
-            self._page.wait_for_selector('lib-obe-latest-invoice section.iris-invoice', timeout=10000)
-        except:
+            self._wait_for_selector(ex.INVOICE_SECTION, timeout=10000)
+        except Exception:
             return None
-        
-        invoice_section = self._page.locator('lib-obe-latest-invoice section.iris-invoice')
-        if invoice_section.count() == 0:
+
+        texts = self._snapshot(self._page, "invoice", ex.INVOICE_SNAPSHOT_SCRIPT, ex.INVOICE_SNAPSHOT_ARG)
+        if texts is None:
             return None
-        
-        invoice_data = {}
-        
-        # Extract amount
-        amount_element = invoice_section.locator('p.iris-invoice__main-data-title:has-text("Bedrag")').locator('xpath=following-sibling::p').first
-        if amount_element.count() > 0:
-            amount_text = amount_element.inner_text().strip()
-            invoice_data["amount_eur"] = parse_price(amount_text)
-        
-        # Extract status
-        status_element = invoice_section.locator('p.iris-invoice__main-data-title:has-text("Status")').locator('xpath=following-sibling::p').first
-        if status_element.count() > 0:
-            status_text = status_element.inner_text().strip()
-            invoice_data["status"] = status_text
-            invoice_data["paid"] = status_text.lower() == "betaald"
-        
-        # Extract date
-        date_element = invoice_section.locator('p.iris-invoice__main-data-title:has-text("Datum")').locator('xpath=following-sibling::p').first
-        if date_element.count() > 0:
-            date_text = date_element.inner_text().strip()
-            invoice_data["date"] = parse_date(date_text)
-        
-        # Extract due date
-        due_date_element = invoice_section.locator('p.iris-invoice__main-data-title:has-text("Vervaldatum")').locator('xpath=following-sibling::p').first
-        if due_date_element.count() > 0:
-            due_date_text = due_date_element.inner_text().strip()
-            invoice_data["due_date"] = parse_date(due_date_text)
-        
-        # Generate invoice ID
-        if invoice_data.get("date"):
-            invoice_data["invoice_id"] = f"INV-{invoice_data['date'].replace('-', '')}"
-        
-        return Invoice(**invoice_data)
-
-    def get_account_data(self) -> AccountData:
+
+        return ex.invoice_from_texts(texts)
+
+    def get_account_data(self, include_invoice: Optional[bool] = None) -> AccountData:
         """
         Get all account data including products and latest invoice.
-        
+
+        The spans and counters of this call are attached as AccountData.sync.
+
+        Args:
+            include_invoice: Fetch the latest invoice. By default it is fetched unless
+                the "auto" backend served the products from the API, as the invoice
+                would need a browser launch of its own; pass True to fetch it anyway.
+
         Returns:
             AccountData object with all information
         """
-        products = self.get_products()
-        invoice = self.get_latest_invoice()
-        
+        counters = dict(self.instrumentation.counters)
+        with self.instrumentation.span("get_account_data") as span:
+            products = self.get_products()
+            invoice = self.get_latest_invoice() if self._wants_invoice(include_invoice) else None
+
         return AccountData(
             products=products,
-            latest_invoice=invoice
+            latest_invoice=invoice,
+            sync=self.instrumentation.summary(span, counters_since=counters)
         )
 
-    def _extract_product_basic_info(self, product) -> Dict[str, Any]:
-        """Extract basic product information."""
-        product_data = {}
-        
-        # Phone number
-        phone_number = product.locator('span.iris-products__details-tariff-number')
-        if phone_number.count() > 0:
-            product_data["phone_number"] = phone_number.inner_text()
-        
-        # Tariff name
-        tariff_name = product.locator('span.iris-products__details-tariff-name')
-        if tariff_name.count() > 0:
-            product_data["tariff"] = tariff_name.inner_text()
-        
-        # Easy Switch number
-        easy_switch = product.locator('span.iris-products__details-info-title:has-text("Nummer Easy Switch")').locator('xpath=following-sibling::span')
-        if easy_switch.count() > 0:
-            product_data["easy_switch_number"] = easy_switch.inner_text()
-        
-        # Contract start date
-        start_date_label = product.locator('span.iris-products__details-info-title:has-text("Begindatum contract")')
-        if start_date_label.count() > 0:
-            start_date_value = start_date_label.locator('xpath=following-sibling::span').first
-            start_date_text = start_date_value.inner_text().strip()
-            if start_date_text:
-                product_data["contract_start_date"] = parse_date(start_date_text)
-        
-        # Price
-        price_label = product.locator('span.iris-products__details-info-title:has-text("Prijs")')
-        if price_label.count() > 0:
-            price_value = price_label.locator('xpath=following-sibling::span').first
-            price_text = price_value.inner_text()
-            product_data["price_per_month_eur"] = parse_price(price_text)
-        
-        return product_data
-
-    def _extract_usage_data(self) -> Optional[Dict[str, Any]]:
-        """Extract usage data from detailed usage page."""
+    def _intercepted(self, kind: str, page: "Page") -> List[Any]:
+        """Read the JSON bodies of the captured responses of one kind for a page."""
+        payloads = []
+        responses = self._collector.take(kind, page)
+        if not responses:
+            self.instrumentation.count("payload_misses")
+            logger.info("No %s payload matched PAYLOAD_PATTERNS, reading the page instead", kind)
+        for response in responses:
+            try:
+                payloads.append(response.json())
+            except Exception:
+                continue
+        return payloads
+
+    def watch(self, scheduler: Optional[RefreshScheduler] = None,
+              max_polls: Optional[int] = None) -> Iterator[AccountData]:
+        """
+        Poll the account on an adaptive schedule and yield every result.
+
+        The delay between polls comes from the scheduler, which learns how
+        often the portal updates its usage counters from their "Laatste
+        update" timestamps. Call login() first when using the browser.
+
+        Args:
+            scheduler: RefreshScheduler to use (a default one is created if omitted)
+            max_polls: Stop after this many polls (None polls forever)
+
+        Yields:
+            AccountData objects
+        """
+        scheduler = scheduler or RefreshScheduler()
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            account = self.get_account_data()
+            scheduler.observe(account)
+            polls += 1
+            yield account
+            if max_polls is None or polls < max_polls:
+                time.sleep(scheduler.next_delay())
+
+    def _snapshot(self, page: "Page", name: str, script: str, arg: Dict[str, Any]) -> Any:
+        """Run a DOM snapshot script in one round trip and count it under `name`."""
+        self.roundtrips[name] = self.roundtrips.get(name, 0) + 1
+        self.instrumentation.count("evaluations")
+        with self.instrumentation.span("extract", snapshot=name):
+            return page.evaluate(script, arg)
+
+    def _open(self, url: str, readiness: Readiness) -> bool:
+        """
+        Navigate the main page to a portal page and wait until it is ready.
+
+        Login happens lazily here: when the portal redirects to the auth
+        host, the login form is submitted and the page is loaded again.
+
+        Returns:
+            Whether the page became ready
+        """
+        # A stale session is redirected to the auth host by the app itself, after
+        # goto returned: abort_url ends the wait then instead of at the timeout
+        armed = readiness.arm(self._page, abort_url=self.AUTH_URL)
+        self._goto(self._page, url)
+        ready = self._wait_until_ready(armed)
+        if ready or not self._on_auth_page():
+            return ready
+        self.instrumentation.count("reauthentications")
+        self._submit_login_form()
+        if self._collector:
+            self._collector.clear()
+        armed = readiness.arm(self._page)
+        self._goto(self._page, url)
+        return self._wait_until_ready(armed)
+
+    def _goto(self, page: "Page", url: str, **kwargs):
+        """Navigate a page, timed as a "navigate" span."""
+        self.instrumentation.count("navigations")
+        with self.instrumentation.span("navigate", url=url):
+            return page.goto(url, **kwargs)
+
+    def _go_back(self, page: "Page"):
+        """Go back in a page's history, timed as a "navigate" span."""
+        self.instrumentation.count("navigations")
+        with self.instrumentation.span("navigate", url="back"):
+            return page.go_back()
+
+    def _locator(self, selector: str):
+        """Create a locator on the main page and count it."""
+        self.instrumentation.count("locators")
+        return self._page.locator(selector)
+
+    def _wait_for_selector(self, selector: str, timeout: float = 10000):
+        """Wait for a selector on the main page, timed as a "wait_for_selector" span."""
+        self.instrumentation.count("locators")
+        with self.instrumentation.span("wait_for_selector", selector=selector):
+            return self._page.wait_for_selector(selector, timeout=timeout)
+
+    def _extract_usage_data(self, armed: ArmedReadiness) -> Optional[Dict[str, Any]]:
+        """Extract usage data from a detailed usage page once it is ready."""
+        self._wait_until_ready(armed)
+        if self._collector:
+            usage = usage_from_payloads(self._intercepted("usage", armed.page))
+            if usage:
+                return usage
+            self._wait_until_ready(USAGE_READY.arm(armed.page))
+        return ex.usage_from_snapshot(
+            self._snapshot(armed.page, "usage", ex.USAGE_SNAPSHOT_SCRIPT, ex.USAGE_SNAPSHOT_ARG))
+
+    def _extract_usage_parallel(self, products_data: List[Dict[str, Any]]) -> bool:
+        """
+        Load the detailed usage pages in a bounded pool of tabs.
+
+        The consumption link targets come from the product list snapshot.
+        Each batch of up to `usage_tabs` pages is started before waiting on
+        any of them, so the browser loads them concurrently.
+
+        Returns:
+            False if a consumption link has no href (caller falls back to clicking)
+        """
+        jobs = []
+        for product_info in products_data:
+            if not product_info["has_usage_link"] or product_info.get("cached"):
+                continue
+            if not product_info["usage_href"]:
+                return False
+            jobs.append((product_info["data"], urljoin(self._page.url, product_info["usage_href"])))
+        if not jobs:
+            return True
+
+        tabs = [self._browser.new_page() for _ in range(min(self.usage_tabs, len(jobs)))]
         try:
-            self._page.wait_for_url("**/gedetailleerd-gebruik**", timeout=10000)
-        except:
-            pass
-        
-        # Only wait for page load (selector check is redundant)
-        self._wait_for_page_load()
-        
-        if "gedetailleerd-gebruik" not in self._page.url:
-            return None
-        
-        usage_data = {}
-        
-        # Extract date range
-        date_range = self._page.locator('p.iris-consumption__main-date-range')
-        if date_range.count() > 0:
-            period_text = date_range.inner_text()
-            usage_data["period"] = parse_period(period_text)
-        
-        # Extract Data usage (mobile)
-        data_block = self._page.locator('div#consumption-data')
-        if data_block.count() > 0:
-            usage_data["data"] = self._extract_data_usage(data_block)
-        
-        # Extract Data usage (internet)
-        fix_block = self._page.locator('div#consumption-fix')
-        if fix_block.count() > 0:
-            usage_data["data"] = self._extract_data_usage(fix_block)
-        
-        # Extract Calls usage
-        calls_block = self._page.locator('div#consumption-calls')
-        if calls_block.count() > 0:
-            calls_limit = calls_block.locator('span.iris-consumption__main-data-limit')
-            calls_usage = calls_block.locator('span.iris-consumption__main-data-usage strong')
-            calls_update = calls_block.locator('span.iris-consumption__main-data-update')
-            
-            if calls_limit.count() > 0 and calls_usage.count() > 0:
-                limit_text = calls_limit.inner_text()
-                used_text = calls_usage.inner_text()
-                usage_data["calls"] = {
-                    "used": parse_minutes(used_text),
-                    "unlimited": is_unlimited(limit_text),
-                    "last_update": parse_last_update(calls_update.inner_text() if calls_update.count() > 0 else None)
-                }
-        
-        # Extract SMS/MMS usage
-        sms_block = self._page.locator('div#consumption-sms')
-        if sms_block.count() > 0:
-            sms_limit = sms_block.locator('span.iris-consumption__main-data-limit')
-            sms_usage = sms_block.locator('span.iris-consumption__main-data-usage strong')
-            sms_update = sms_block.locator('span.iris-consumption__main-data-update')
-            
-            if sms_limit.count() > 0 and sms_usage.count() > 0:
-                limit_text = sms_limit.inner_text()
-                used_text = sms_usage.inner_text()
-                usage_data["sms_mms"] = {
-                    "used": parse_sms_count(used_text),
-                    "unlimited": is_unlimited(limit_text),
-                    "last_update": parse_last_update(sms_update.inner_text() if sms_update.count() > 0 else None)
-                }
-        
-        return usage_data
-
-    def _extract_data_usage(self, block) -> Dict[str, Any]:
-        """Extract data usage from a block."""
-        data_limit = block.locator('span.iris-consumption__main-data-limit')
-        data_usage = block.locator('span.iris-consumption__main-data-usage strong')
-        data_update = block.locator('span.iris-consumption__main-data-update')
-        
-        if data_limit.count() > 0 and data_usage.count() > 0:
-            limit_text = data_limit.inner_text()
-            used_text = data_usage.inner_text()
-            return {
-                "used": parse_data_amount(used_text),
-                "limit": parse_data_amount(limit_text),
-                "unlimited": is_unlimited(limit_text),
-                "last_update": parse_last_update(data_update.inner_text() if data_update.count() > 0 else None)
-            }
-        return {}
-
-    def _get_product_identifier(self, product):
-        """Get unique identifier for a product."""
-        # Try phone number
-        phone_number = product.locator('span.iris-products__details-tariff-number')
-        if phone_number.count() > 0:
-            return ("phone", phone_number.inner_text())
-        
-        # Try Easy Switch number
-        easy_switch = product.locator('span.iris-products__details-info-title:has-text("Nummer Easy Switch")').locator('xpath=following-sibling::span')
-        if easy_switch.count() > 0:
-            return ("easy_switch", easy_switch.inner_text())
-        
-        # Fallback to tariff name
-        tariff_name = product.locator('span.iris-products__details-tariff-name')
-        if tariff_name.count() > 0:
-            return ("tariff", tariff_name.inner_text())
-        
-        return None
-
-    def _find_product_by_identifier(self, identifier):
-        """Find product by identifier."""
-        if not identifier:
-            return None
-        
-        products = self._page.locator('li.iris-products__item')
-        for i in range(products.count()):
-            product = products.nth(i)
-            current_id = self._get_product_identifier(product)
-            if current_id and current_id == identifier:
-                return product
-        
-        return None
-
-    def _create_product_object(self, data: Dict[str, Any]) -> Product:
-        """Create Product object from data dictionary."""
-        # Determine product type and ID
-        if "phone_number" in data:
-            product_type = "mobile"
-            phone_clean = data["phone_number"].replace(" ", "")
-            product_id = f"mobile_{phone_clean}"
-        elif "easy_switch_number" in data:
-            product_type = "internet"
-            product_id = f"internet_{data['easy_switch_number']}"
-        else:
-            product_type = "unknown"
-            product_id = f"unknown_{data.get('tariff', 'product')}"
-        
-        # Create contract if exists
-        contract = None
-        if "contract_start_date" in data or "price_per_month_eur" in data:
-            contract = Contract(
-                start_date=data.get("contract_start_date"),
-                price_per_month_eur=data.get("price_per_month_eur")
-            )
-        
-        # Create usage if exists
-        usage = None
-        if "usage" in data:
-            usage = UsageData(**data["usage"])
-        
-        return Product(
-            product_id=product_id,
-            product_type=product_type,
-            phone_number=data.get("phone_number"),
-            easy_switch_number=data.get("easy_switch_number"),
-            tariff=data.get("tariff"),
-            contract=contract,
-            usage=usage
-        )
+            for start in range(0, len(jobs), len(tabs)):
+                batch = []
+                for tab, (product_data, url) in zip(tabs, jobs[start:start + len(tabs)]):
+                    armed = self._readiness(USAGE_READY, "usage").arm(tab)
+                    self._goto(tab, url, wait_until="commit")
+                    batch.append((armed, product_data))
+                for armed, product_data in batch:
+                    usage_data = self._extract_usage_data(armed)
+                    if usage_data:
+                        product_data["usage"] = usage_data
+        finally:
+            for tab in tabs:
+                tab.close()
+        return True
@@ -0,0 +1,318 @@
+"""Selectors, DOM snapshot scripts and text-to-data extraction shared by the clients."""
+from typing import Optional, Dict, Any, Tuple, List
+
+from .models import Invoice
+from .parsers import (
+    parse_data_amount, parse_price, parse_date, parse_period,
+    parse_minutes, parse_sms_count, parse_last_update, is_unlimited, is_paid
+)
+
+
+PRODUCTS_PATH = "/nl/mijn-producten"
+INVOICES_PATH = "/nl/mijn-facturen"
+USAGE_PATH_MARKER = "gedetailleerd-gebruik"
+USAGE_URL_PATTERN = f"**/{USAGE_PATH_MARKER}**"
+
+SPINNER = 'svg.p-progress-spinner'
+COOKIE_REJECT_BUTTON = 'button#onetrust-reject-all-handler'
+LOGGED_IN_MENU_ITEM = 'span.p-menuitem-text.ng-star-inserted.button-label'
+LOGGED_IN_LABEL = "Mijn account"
+LOGGED_IN_MENU = f'{LOGGED_IN_MENU_ITEM}:has-text("{LOGGED_IN_LABEL}")'
+
+LOGIN_BY_EMAIL_LINK = 'a#Login_loginByEmail'
+LOGIN_EMAIL_INPUT = 'input#Login_byEmail_emailAddress'
+LOGIN_PASSWORD_INPUT = 'input#Login_byEmail_password'
+LOGIN_SUBMIT_BUTTON = 'button#Login_byEmail_login'
+LOGIN_ERROR_BOX = 'div.error_msgs'
+LOGIN_ERROR_TEXT = "Verkeerde gebruikersnaam en/of wachtwoord"
+LOGIN_ERROR = f'{LOGIN_ERROR_BOX}:has-text("{LOGIN_ERROR_TEXT}")'
+
+PRODUCT_ITEM = 'li.iris-products__item'
+PRODUCT_PHONE_NUMBER = 'span.iris-products__details-tariff-number'
+PRODUCT_TARIFF_NAME = 'span.iris-products__details-tariff-name'
+PRODUCT_CONSUMPTION_LINK = 'a.iris-products__link[data-event_category="MyProducts"]'
+PRODUCT_INFO_TITLE = 'span.iris-products__details-info-title'
+
+
+# Product info values keyed by the labels of their title span (Dutch, French, English)
+PRODUCT_INFO_FIELDS = {
+    "easy_switch_number": ["Nummer Easy Switch", "Numéro Easy Switch", "Easy Switch number"],
+    "contract_start": ["Begindatum contract", "Date de début du contrat", "Contract start date"],
+    "price": ["Prijs", "Prix", "Price"],
+}
+
+USAGE_DATE_RANGE = 'p.iris-consumption__main-date-range'
+USAGE_DATA_BLOCK = 'div#consumption-data'
+USAGE_FIX_BLOCK = 'div#consumption-fix'
+USAGE_CALLS_BLOCK = 'div#consumption-calls'
+USAGE_SMS_BLOCK = 'div#consumption-sms'
+# Order matters: an internet ("fix") block replaces a mobile data block
+USAGE_BLOCKS = {
+    "data": USAGE_DATA_BLOCK,
+    "fix": USAGE_FIX_BLOCK,
+    "calls": USAGE_CALLS_BLOCK,
+    "sms": USAGE_SMS_BLOCK,
+}
+USAGE_LIMIT = 'span.iris-consumption__main-data-limit'
+USAGE_USED = 'span.iris-consumption__main-data-usage strong'
+USAGE_UPDATE = 'span.iris-consumption__main-data-update'
+
+INVOICE_SECTION = 'lib-obe-latest-invoice section.iris-invoice'
+INVOICE_FIELD_TITLE = 'p.iris-invoice__main-data-title'
+
+# Invoice values keyed by the labels of their title paragraph. The page lists
+# the invoice date before the due date, so "Date" finds the former first.
+INVOICE_FIELDS = {
+    "amount": ["Bedrag", "Montant", "Amount"],
+    "status": ["Status", "Statut"],
+    "date": ["Datum", "Date"],
+    "due_date": ["Vervaldatum", "Date d'échéance", "Due date"],
+}
+
+
+# The snapshot scripts below run as a single page.evaluate() call and return
+# plain JSON with the raw inner texts of every field, replacing dozens of
+# locator count()/inner_text() round trips per page. Labels are matched like
+# Playwright's :has-text() (case-insensitive substring of any of the labels,
+# first match wins) and values are the first following sibling with the given tag.
+_SNAPSHOT_HELPERS = """
+    const text = (el) => (el ? el.innerText : null);
+    const byLabel = (root, titleSelector, labels, valueTag) => {
+        const wanted = [].concat(labels).map((label) => label.toLowerCase());
+        for (const title of root.querySelectorAll(titleSelector)) {
+            const content = title.textContent.toLowerCase();
+            if (!wanted.some((label) => content.includes(label))) continue;
+            for (let el = title.nextElementSibling; el; el = el.nextElementSibling) {
+                if (el.tagName.toLowerCase() === valueTag) return el;
+            }
+        }
+        return null;
+    };
+"""
+
+PRODUCTS_SNAPSHOT_SCRIPT = """(s) => {""" + _SNAPSHOT_HELPERS + """
+    return Array.from(document.querySelectorAll(s.item)).map((item) => {
+        const link = item.querySelector(s.link);
+        const texts = {
+            phone_number: text(item.querySelector(s.phone)),
+            tariff: text(item.querySelector(s.tariff)),
+            has_usage_link: link !== null,
+            usage_href: link ? link.getAttribute('href') : null,
+        };
+        for (const [key, label] of Object.entries(s.fields)) {
+            texts[key] = text(byLabel(item, s.title, label, 'span'));
+        }
+        return texts;
+    });
+}"""
+
+PRODUCTS_SNAPSHOT_ARG = {
+    "item": PRODUCT_ITEM,
+    "phone": PRODUCT_PHONE_NUMBER,
+    "tariff": PRODUCT_TARIFF_NAME,
+    "link": PRODUCT_CONSUMPTION_LINK,
+    "title": PRODUCT_INFO_TITLE,
+    "fields": PRODUCT_INFO_FIELDS,
+}
+
+USAGE_SNAPSHOT_SCRIPT = """(s) => {""" + _SNAPSHOT_HELPERS + """
+    const blocks = {};
+    for (const [name, selector] of Object.entries(s.blocks)) {
+        const block = document.querySelector(selector);
+        blocks[name] = block ? {
+            limit: text(block.querySelector(s.limit)),
+            used: text(block.querySelector(s.used)),
+            update: text(block.querySelector(s.update)),
+        } : null;
+    }
+    return {url: location.href, period: text(document.querySelector(s.period)), blocks};
+}"""
+
+USAGE_SNAPSHOT_ARG = {
+    "blocks": USAGE_BLOCKS,
+    "limit": USAGE_LIMIT,
+    "used": USAGE_USED,
+    "update": USAGE_UPDATE,
+    "period": USAGE_DATE_RANGE,
+}
+
+INVOICE_SNAPSHOT_SCRIPT = """(s) => {""" + _SNAPSHOT_HELPERS + """
+    const section = document.querySelector(s.section);
+    if (!section) return null;
+    const texts = {};
+    for (const [key, label] of Object.entries(s.fields)) {
+        texts[key] = text(byLabel(section, s.title, label, 'p'));
+    }
+    return texts;
+}"""
+
+INVOICE_SNAPSHOT_ARG = {
+    "section": INVOICE_SECTION,
+    "title": INVOICE_FIELD_TITLE,
+    "fields": INVOICE_FIELDS,
+}
+
+
+def product_info_from_texts(texts: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    """
+    Build the product dictionary from the raw texts of a product list item.
+
+    Args:
+        texts: Raw inner texts keyed by phone_number, tariff, easy_switch_number,
+            contract_start and price (missing elements are None)
+    """
+    product_data: Dict[str, Any] = {}
+    if texts.get("phone_number") is not None:
+        product_data["phone_number"] = texts["phone_number"]
+    if texts.get("tariff") is not None:
+        product_data["tariff"] = texts["tariff"]
+    if texts.get("easy_switch_number") is not None:
+        product_data["easy_switch_number"] = texts["easy_switch_number"]
+    start_date_text = (texts.get("contract_start") or "").strip()
+    if start_date_text:
+        product_data["contract_start_date"] = parse_date(start_date_text)
+    if texts.get("price") is not None:
+        product_data["price_per_month_eur"] = parse_price(texts["price"])
+    return product_data
+
+
+def product_identifier(texts: Dict[str, Optional[str]]) -> Optional[Tuple[str, str]]:
+    """Get a unique identifier for a product from its raw texts."""
+    if texts.get("phone_number") is not None:
+        return ("phone", texts["phone_number"])
+    if texts.get("easy_switch_number") is not None:
+        return ("easy_switch", texts["easy_switch_number"])
+    if texts.get("tariff") is not None:
+        return ("tariff", texts["tariff"])
+    return None
+
+
+def data_usage_from_texts(limit: Optional[str], used: Optional[str],
+                          update: Optional[str]) -> Dict[str, Any]:
+    """Build the data usage dictionary from a consumption block's texts."""
+    if limit is None or used is None:
+        return {}
+    return {
+        "used": parse_data_amount(used),
+        "limit": parse_data_amount(limit),
+        "unlimited": is_unlimited(limit),
+        "last_update": parse_last_update(update)
+    }
+
+
+def calls_usage_from_texts(limit: Optional[str], used: Optional[str],
+                           update: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Build the calls usage dictionary from a consumption block's texts."""
+    if limit is None or used is None:
+        return None
+    return {
+        "used": parse_minutes(used),
+        "unlimited": is_unlimited(limit),
+        "last_update": parse_last_update(update)
+    }
+
+
+def sms_usage_from_texts(limit: Optional[str], used: Optional[str],
+                         update: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Build the SMS/MMS usage dictionary from a consumption block's texts."""
+    if limit is None or used is None:
+        return None
+    return {
+        "used": parse_sms_count(used),
+        "unlimited": is_unlimited(limit),
+        "last_update": parse_last_update(update)
+    }
+
+
+def usage_from_texts(period: Optional[str], blocks: Dict[str, Optional[Dict[str, Optional[str]]]]
+                     ) -> Dict[str, Any]:
+    """
+    Build the usage dictionary from the raw texts of the detailed usage page.
+
+    Args:
+        period: Text of the date range paragraph, or None
+        blocks: Raw limit/used/update texts keyed by block name (data, fix,
+            calls, sms); blocks missing from the page are None
+    """
+    usage_data: Dict[str, Any] = {}
+    if period is not None:
+        usage_data["period"] = parse_period(period)
+    for name in ("data", "fix"):
+        block = blocks.get(name)
+        if block is not None:
+            usage_data["data"] = data_usage_from_texts(block.get("limit"), block.get("used"),
+                                                       block.get("update"))
+    block = blocks.get("calls")
+    if block is not None:
+        calls = calls_usage_from_texts(block.get("limit"), block.get("used"), block.get("update"))
+        if calls:
+            usage_data["calls"] = calls
+    block = blocks.get("sms")
+    if block is not None:
+        sms = sms_usage_from_texts(block.get("limit"), block.get("used"), block.get("update"))
+        if sms:
+            usage_data["sms_mms"] = sms
+    return usage_data
+
+
+def usage_from_snapshot(snapshot: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Build the usage dictionary from a USAGE_SNAPSHOT_SCRIPT result."""
+    if not snapshot or USAGE_PATH_MARKER not in (snapshot.get("url") or ""):
+        return None
+    return usage_from_texts(snapshot.get("period"), snapshot.get("blocks") or {})
+
+
+def products_from_snapshot(snapshot: Optional[List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """
+    Turn a PRODUCTS_SNAPSHOT_SCRIPT result into per-product work items.
+
+    Returns:
+        One dictionary per product with its identifier, product data and
+        consumption link (has_usage_link/usage_href)
+    """
+    return [
+        {
+            "identifier": product_identifier(texts),
+            "data": product_info_from_texts(texts),
+            "has_usage_link": bool(texts.get("has_usage_link")),
+            "usage_href": texts.get("usage_href"),
+        }
+        for texts in snapshot or []
+    ]
+
+
+def find_product_index(snapshot: Optional[List[Dict[str, Any]]],
+                       identifier: Optional[Tuple[str, str]]) -> Optional[int]:
+    """Find the position of a product in a products snapshot by its identifier."""
+    if not identifier:
+        return None
+    for index, texts in enumerate(snapshot or []):
+        if product_identifier(texts) == identifier:
+            return index
+    return None
+
+
+def invoice_from_texts(texts: Dict[str, Optional[str]]) -> Invoice:
+    """
+    Build an Invoice from the raw field texts of the latest invoice section.
+
+    Args:
+        texts: Raw texts keyed like INVOICE_FIELDS (missing fields are None)
+    """
+    invoice_data: Dict[str, Any] = {}
+    if texts.get("amount") is not None:
+        invoice_data["amount_eur"] = parse_price(texts["amount"].strip())
+    if texts.get("status") is not None:
+        status_text = texts["status"].strip()
+        invoice_data["status"] = status_text
+        invoice_data["paid"] = is_paid(status_text)
+    if texts.get("date") is not None:
+        invoice_data["date"] = parse_date(texts["date"].strip())
+    if texts.get("due_date") is not None:
+        invoice_data["due_date"] = parse_date(texts["due_date"].strip())
+
+    # Generate invoice ID
+    if invoice_data.get("date"):
+        invoice_data["invoice_id"] = f"INV-{invoice_data['date'].replace('-', '')}"
+
+    return Invoice(**invoice_data)
@@ -0,0 +1,363 @@
+"""Compact on-disk history of usage snapshots and invoices, with range queries."""
+import math
+import sqlite3
+import threading
+import time
+from array import array
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import groupby
+from typing import Optional, Dict, Any, List, Union, Iterable, Tuple
+
+from .models import AccountData, Invoice
+
+# Numeric columns of a usage sample, in storage order
+USAGE_FIELDS = ("data_used", "data_limit", "calls_used", "sms_used")
+
+# (age in seconds, bucket in seconds): samples older than the age are thinned
+# out to the last one per bucket. Counters only grow within a billing period,
+# so the last sample of a bucket loses nothing a chart or burn rate needs.
+DEFAULT_TIERS = (
+    (7 * 86400, 3600),
+    (90 * 86400, 86400),
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS usage (
+    product_id TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    resolution INTEGER NOT NULL DEFAULT 0,
+    data_used REAL,
+    data_limit REAL,
+    calls_used REAL,
+    sms_used REAL,
+    period_start TEXT,
+    period_end TEXT,
+    PRIMARY KEY (product_id, ts)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS invoices (
+    invoice_id TEXT PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    amount_eur REAL,
+    status TEXT,
+    paid INTEGER,
+    date TEXT,
+    due_date TEXT
+);
+"""
+
+
+def _timestamp(value: Union[None, float, datetime]) -> int:
+    if value is None:
+        return int(time.time())
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+def _date_timestamp(value: Optional[str]) -> Optional[float]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        return None
+
+
+def usage_row(product_id: str, ts: int, usage: Dict[str, Any]) -> Tuple:
+    """Flatten a product's usage dictionary into a usage table row."""
+    data = usage.get("data") or {}
+    period = usage.get("period") or {}
+    return (
+        product_id,
+        ts,
+        data.get("used"),
+        data.get("limit"),
+        (usage.get("calls") or {}).get("used"),
+        (usage.get("sms_mms") or {}).get("used"),
+        period.get("start"),
+        period.get("end"),
+    )
+
+
+@dataclass
+class Series:
+    """
+    Column-oriented samples of one product.
+
+    Every column is an array('d') of the same length as `timestamps`;
+    missing values are NaN, so the arrays can be handed to numpy
+    (numpy.frombuffer) or a charting library without conversion.
+    """
+    product_id: str
+    timestamps: array
+    columns: Dict[str, array]
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary of lists (NaN becomes None)."""
+        return {
+            "product_id": self.product_id,
+            "timestamps": [int(ts) for ts in self.timestamps],
+            **{name: [None if math.isnan(v) else v for v in values]
+               for name, values in self.columns.items()},
+        }
+
+
+@dataclass
+class BurnRate:
+    """Usage pace within one billing period."""
+    period_start: Optional[str]
+    period_end: Optional[str]
+    samples: int
+    used: Optional[float]
+    limit: Optional[float]
+    per_day: Optional[float]
+    projected: Optional[float]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "period_start": self.period_start,
+            "period_end": self.period_end,
+            "samples": self.samples,
+            "used": self.used,
+            "limit": self.limit,
+            "per_day": self.per_day,
+            "projected": self.projected,
+        }
+
+
+class HistoryStore:
+    """
+    SQLite file holding every scraped usage snapshot and invoice.
+
+    Samples are keyed by (product_id, timestamp) in a clustered index, so
+    appending is a single insert per product and a range query of one
+    product reads one contiguous run of the B-tree. Old samples are thinned
+    out according to `tiers`. The store may be shared between threads.
+
+    Usage:
+        history = HistoryStore("hey_history.sqlite3")
+        history.append(client.get_account_data())
+        series = history.series("mobile_0470123456", start=time.time() - 30 * 86400)
+    """
+
+    def __init__(self, path: str, tiers: Iterable[Tuple[float, float]] = DEFAULT_TIERS,
+                 compact_interval: float = 3600):
+        """
+        Initialize the store.
+
+        Args:
+            path: Database file (created if needed; ":memory:" for a throwaway store)
+            tiers: (age, bucket) pairs in seconds used by downsample()
+            compact_interval: Run downsample() from append() at most this often (seconds)
+        """
+        self.path = path
+        self.tiers = tuple(tiers)
+        self.compact_interval = compact_interval
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        # The write-ahead log turns every append into a sequential write
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self._last_compact = 0.0
+
+    def close(self):
+        """Close the database."""
+        with self._lock:
+            self._db.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def append(self, account: Union[AccountData, Dict[str, Any]],
+               at: Union[None, float, datetime] = None) -> int:
+        """
+        Store the usage of every product and the latest invoice of an account.
+
+        Usage served from the incremental state (cached_at set) is not a new
+        observation and is skipped.
+
+        Args:
+            account: AccountData or its to_dict() output
+            at: Time of the snapshot (defaults to now)
+
+        Returns:
+            Number of usage samples written
+        """
+        if isinstance(account, AccountData):
+            account = account.to_dict()
+        ts = _timestamp(at)
+        rows = [
+            usage_row(product["id"], ts, product["usage"])
+            for product in account.get("products", [])
+            if product.get("usage") and not product["usage"].get("cached_at")
+        ]
+        invoice = (account.get("billing") or {}).get("latest_invoice")
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO usage (product_id, ts, data_used, data_limit, calls_used,"
+                " sms_used, period_start, period_end) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+            if invoice and invoice.get("invoice_id"):
+                self._db.execute(
+                    "INSERT OR REPLACE INTO invoices VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (invoice["invoice_id"], ts, invoice.get("amount_eur"), invoice.get("status"),
+                     int(bool(invoice.get("paid"))), invoice.get("date"), invoice.get("due_date")),
+                )
+        if time.time() - self._last_compact >= self.compact_interval:
+            self.downsample()
+        return len(rows)
+
+    def downsample(self, now: Optional[float] = None) -> int:
+        """
+        Keep only the last sample per bucket for samples older than each tier's age.
+
+        Returns:
+            Number of samples removed
+        """
+        now = time.time() if now is None else now
+        removed = 0
+        with self._lock, self._db:
+            for age, bucket in self.tiers:
+                params = {"cutoff": int(now - age), "bucket": int(bucket)}
+                removed += self._db.execute(
+                    "DELETE FROM usage WHERE ts < :cutoff AND resolution < :bucket"
+                    " AND (product_id, ts) NOT IN ("
+                    "  SELECT product_id, MAX(ts) FROM usage"
+                    "  WHERE ts < :cutoff AND resolution < :bucket"
+                    "  GROUP BY product_id, ts / :bucket)",
+                    params,
+                ).rowcount
+                self._db.execute(
+                    "UPDATE usage SET resolution = :bucket WHERE ts < :cutoff AND resolution < :bucket",
+                    params,
+                )
+        self._last_compact = now
+        return removed
+
+    def products(self) -> List[str]:
+        """IDs of all products with stored samples."""
+        with self._lock:
+            return [row[0] for row in self._db.execute("SELECT DISTINCT product_id FROM usage")]
+
+    def _rows(self, product_ids: Optional[List[str]], start, end, columns: str) -> List[Tuple]:
+        query = f"SELECT product_id, ts, {columns} FROM usage WHERE ts >= ? AND ts <= ?"
+        params: List[Any] = [_timestamp(start) if start is not None else 0,
+                             _timestamp(end) if end is not None else 2 ** 62]
+        if product_ids is not None:
+            query += f" AND product_id IN ({', '.join('?' * len(product_ids))})"
+            params.extend(product_ids)
+        with self._lock:
+            return self._db.execute(query + " ORDER BY product_id, ts", params).fetchall()
+
+    def series_many(self, product_ids: Optional[List[str]] = None,
+                    start: Union[None, float, datetime] = None,
+                    end: Union[None, float, datetime] = None,
+                    fields: Tuple[str, ...] = USAGE_FIELDS) -> Dict[str, Series]:
+        """
+        Load the samples of several products in one query.
+
+        Args:
+            product_ids: Products to load (all by default)
+            start: Earliest sample time (inclusive)
+            end: Latest sample time (inclusive)
+            fields: Columns to load, a subset of USAGE_FIELDS
+
+        Returns:
+            Series per product ID
+        """
+        unknown = set(fields) - set(USAGE_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown fields {sorted(unknown)}, expected some of {USAGE_FIELDS}")
+        nan = float("nan")
+        result = {}
+        rows = self._rows(product_ids, start, end, ", ".join(fields))
+        for product_id, group in groupby(rows, key=lambda row: row[0]):
+            # Transpose the rows into one tuple per column
+            columns = list(zip(*group))[1:]
+            result[product_id] = Series(
+                product_id=product_id,
+                timestamps=array("d", columns[0]),
+                columns={name: array("d", (nan if v is None else v for v in values))
+                         for name, values in zip(fields, columns[1:])},
+            )
+        return result
+
+    def series(self, product_id: str, start: Union[None, float, datetime] = None,
+               end: Union[None, float, datetime] = None,
+               fields: Tuple[str, ...] = USAGE_FIELDS) -> Series:
+        """Load the samples of one product (see series_many)."""
+        found = self.series_many([product_id], start, end, fields)
+        return found.get(product_id) or Series(product_id, array("d"), {name: array("d") for name in fields})
+
+    def burn_rates(self, product_id: str, field: str = "data_used",
+                   start: Union[None, float, datetime] = None,
+                   end: Union[None, float, datetime] = None) -> List[BurnRate]:
+        """
+        Compute the usage pace of every billing period of a product.
+
+        The counters restart at every period start, so the pace is the last
+        reading divided by the days elapsed since the start of its period
+        (or, without period dates, the growth between the first and last
+        reading). The projection extends that pace to the whole period.
+
+        Args:
+            product_id: Product to analyse
+            field: "data_used", "calls_used" or "sms_used"
+            start: Earliest sample time (inclusive)
+            end: Latest sample time (inclusive)
+
+        Returns:
+            BurnRate per billing period, oldest first
+        """
+        if field not in USAGE_FIELDS or field == "data_limit":
+            raise ValueError(f"Unknown field '{field}'")
+        rows = self._rows([product_id], start, end, f"{field}, data_limit, period_start, period_end")
+        rates = []
+        for (period_start, period_end), group in groupby(rows, key=lambda row: (row[4], row[5])):
+            samples = [row for row in group if row[2] is not None]
+            if not samples:
+                continue
+            first, last = samples[0], samples[-1]
+            used = last[2]
+            begin = _date_timestamp(period_start)
+            finish = _date_timestamp(period_end)
+            if begin is not None and last[1] > begin:
+                per_day = used / ((last[1] - begin) / 86400)
+            elif last[1] > first[1]:
+                per_day = (used - first[2]) / ((last[1] - first[1]) / 86400)
+            else:
+                per_day = None
+            projected = None
+            if per_day is not None and begin is not None and finish is not None:
+                # The period includes its last day
+                projected = per_day * ((finish - begin) / 86400 + 1)
+            rates.append(BurnRate(
+                period_start=period_start,
+                period_end=period_end,
+                samples=len(samples),
+                used=used,
+                limit=last[3] if field == "data_used" else None,
+                per_day=per_day,
+                projected=projected,
+            ))
+        return rates
+
+    def invoices(self) -> List[Invoice]:
+        """All stored invoices, newest first."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT invoice_id, amount_eur, status, paid, date, due_date FROM invoices"
+                " ORDER BY date DESC, ts DESC"
+            ).fetchall()
+        return [Invoice(invoice_id=row[0], amount_eur=row[1], status=row[2], paid=bool(row[3]),
+                        date=row[4], due_date=row[5]) for row in rows]
@@ -1,6 +1,12 @@
 """Playwright installation utilities."""
+import json
+import os
 import subprocess
 import sys
+from typing import Optional
+
+# Path of the installed Chromium found by find_chromium(), cached per process
+_chromium_path: Optional[str] = None
 
 
 def install_playwright():
@@ -29,12 +35,67 @@ def install_playwright():
         raise RuntimeError("Playwright not found in PATH")
 
 
+def _browsers_path() -> str:
+    """Directory Playwright installs its browsers into."""
+    configured = os.environ.get("PLAYWRIGHT_BROWSERS_PATH")
+    if configured == "0":
+        import playwright
+        return os.path.join(os.path.dirname(playwright.__file__), "driver", "package", ".local-browsers")
+    if configured:
+        return configured
+    if sys.platform == "win32":
+        return os.path.join(os.environ.get("LOCALAPPDATA", os.path.expanduser("~")), "ms-playwright")
+    if sys.platform == "darwin":
+        return os.path.expanduser("~/Library/Caches/ms-playwright")
+    return os.path.join(os.environ.get("XDG_CACHE_HOME", os.path.expanduser("~/.cache")), "ms-playwright")
+
+
+def find_chromium() -> Optional[str]:
+    """
+    Find the Chromium build the installed Playwright version expects, without launching it.
+
+    Reads the browser revisions from Playwright's browsers.json and checks
+    for the installation marker in the browsers directory. Importing the
+    top-level playwright package does not start the driver, so this only
+    costs a few file system lookups. A positive result is cached.
+
+    Returns:
+        Directory of the installed headless shell or full Chromium, or None
+        if it is missing or the layout is not recognized
+    """
+    global _chromium_path
+    if _chromium_path and os.path.exists(_chromium_path):
+        return _chromium_path
+    try:
+        import playwright
+        manifest = os.path.join(os.path.dirname(playwright.__file__), "driver", "package", "browsers.json")
+        with open(manifest, "r") as f:
+            browsers = {b["name"]: b["revision"] for b in json.load(f)["browsers"]}
+    except (ImportError, OSError, ValueError, KeyError, TypeError):
+        return None
+
+    root = _browsers_path()
+    for name in ("chromium-headless-shell", "chromium"):
+        revision = browsers.get(name)
+        if not revision:
+            continue
+        directory = os.path.join(root, f"{name.replace('-', '_')}-{revision}")
+        if os.path.exists(os.path.join(directory, "INSTALLATION_COMPLETE")):
+            _chromium_path = directory
+            return directory
+    return None
+
+
 def ensure_playwright_installed():
     """
     Check if Playwright chromium browser is installed and install if needed.
     
-    Only installs if chromium is not already available.
+    Only installs if chromium is not already available. The check looks for
+    the browser on disk first and only falls back to a probe launch when
+    that is inconclusive.
     """
+    if find_chromium():
+        return
     try:
         # Try to import playwright
         from playwright.sync_api import sync_playwright
@@ -0,0 +1,171 @@
+"""Timing spans, counters and hooks describing where a scrape spends its time."""
+import asyncio
+import functools
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional, Dict, Any, List, Callable, Iterator, Deque, Tuple
+
+
+class Span:
+    """A timed phase of a scrape, with the phases it contains."""
+
+    __slots__ = ("name", "attributes", "start", "end", "children")
+
+    def __init__(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.attributes = attributes or {}
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.children: List["Span"] = []
+
+    @property
+    def duration(self) -> float:
+        """Seconds the span took (so far, if it is still open)."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a nested dictionary with durations in milliseconds."""
+        result: Dict[str, Any] = {"name": self.name, "ms": round(self.duration * 1000, 2)}
+        if self.attributes:
+            result["attributes"] = self.attributes
+        if self.children:
+            result["children"] = [child.to_dict() for child in self.children]
+        return result
+
+
+# Hook signature: hook(event, payload); events are "span_start" and "span_end"
+# with the Span as payload, and "count" with a (name, increment) tuple
+Hook = Callable[[str, Any], None]
+
+# Open spans of the current thread or task, as (instrumentation, span) pairs
+# from outermost to innermost. One variable is shared by all instances, so
+# creating clients does not create context variables.
+_open_spans: ContextVar[Tuple[Tuple["Instrumentation", Span], ...]] = ContextVar(
+    "heytelecom_open_spans", default=()
+)
+
+
+class Instrumentation:
+    """
+    Collects nested spans and counters for one client.
+
+    The open spans are tracked in a ContextVar, so spans nest correctly in
+    both the sync client and concurrent asyncio tasks of the async client.
+    A span nests under the innermost open span of the same instance.
+
+    Usage:
+        client.instrumentation.add_hook(lambda event, payload: print(event, payload))
+    """
+
+    def __init__(self, hooks: Optional[List[Hook]] = None, max_spans: int = 100):
+        """
+        Initialize the instrumentation.
+
+        Args:
+            hooks: Callbacks invoked for every span start/end and counter update
+            max_spans: Root spans to keep; older ones are dropped so long-running
+                pollers do not grow without limit
+        """
+        self.hooks: List[Hook] = list(hooks or [])
+        self.max_spans = max_spans
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self.counters: Dict[str, int] = {}
+
+    def add_hook(self, hook: Hook):
+        """Register a callback for span and counter events."""
+        self.hooks.append(hook)
+
+    def _emit(self, event: str, payload: Any):
+        for hook in self.hooks:
+            try:
+                hook(event, payload)
+            except Exception:
+                # A broken hook must never break a scrape
+                pass
+
+    def current(self) -> Optional[Span]:
+        """The innermost span of this instance open in the current context."""
+        for owner, span in reversed(_open_spans.get()):
+            if owner is self:
+                return span
+        return None
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        """Time the enclosed block as a child of the current span."""
+        span = Span(name, attributes)
+        parent = self.current()
+        (parent.children if parent else self.spans).append(span)
+        token = _open_spans.set(_open_spans.get() + ((self, span),))
+        self._emit("span_start", span)
+        try:
+            yield span
+        finally:
+            span.end = time.perf_counter()
+            _open_spans.reset(token)
+            self._emit("span_end", span)
+
+    def count(self, name: str, increment: int = 1):
+        """Increase a counter."""
+        self.counters[name] = self.counters.get(name, 0) + increment
+        self._emit("count", (name, increment))
+
+    def reset(self):
+        """Forget all finished spans and counters."""
+        self.spans = deque(maxlen=self.max_spans)
+        self.counters = {}
+
+    def summary(self, span: Optional[Span] = None,
+                counters_since: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+        """
+        Summarize the recorded data.
+
+        Args:
+            span: Only include this span tree (all root spans by default)
+            counters_since: Earlier copy of the counters; only the increase is reported
+
+        Returns:
+            Dictionary with the span tree, total milliseconds per span name
+            and the counters
+        """
+        roots = [span] if span else list(self.spans)
+        totals: Dict[str, float] = {}
+
+        def add(s: Span):
+            totals[s.name] = totals.get(s.name, 0.0) + s.duration * 1000
+            for child in s.children:
+                add(child)
+
+        for root in roots:
+            add(root)
+        return {
+            "spans": [root.to_dict() for root in roots],
+            "totals_ms": {name: round(ms, 2) for name, ms in totals.items()},
+            "counters": {name: value - (counters_since or {}).get(name, 0)
+                         for name, value in self.counters.items()
+                         if value != (counters_since or {}).get(name, 0)},
+        }
+
+
+def instrumented(name: str):
+    """
+    Decorator timing a client method (sync or async) as a span.
+
+    The decorated method's instance must have an `instrumentation` attribute.
+    """
+    def decorator(func):
+        if asyncio.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(self, *args, **kwargs):
+                with self.instrumentation.span(name):
+                    return await func(self, *args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(self, *args, **kwargs):
+            with self.instrumentation.span(name):
+                return func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,121 @@
+"""Capture the JSON the ecare app fetches, so models can be built without scraping."""
+import re
+from typing import Optional, Dict, Any, List, Callable
+from urllib.parse import urlsplit
+
+from .api import HeyTelecomApi, products_from_inventory, usage_from_json, invoice_from_json
+from .models import Product, Invoice
+
+
+# URL patterns of the BFF calls made by the Angular app, per payload kind
+PAYLOAD_PATTERNS = {
+    "inventory": re.compile(r"/product-inventory/|/productInventory", re.IGNORECASE),
+    "usage": re.compile(r"/(usage|consumption)", re.IGNORECASE),
+    "invoice": re.compile(r"/(invoice|billing)", re.IGNORECASE),
+}
+
+
+def payload_kind(url: str, api_host: Optional[str] = None) -> Optional[str]:
+    """
+    Classify an API URL as an "inventory", "usage" or "invoice" payload.
+
+    Args:
+        url: Request URL
+        api_host: Only URLs on this host are considered (defaults to the API host)
+
+    Returns:
+        The payload kind, or None for unrelated requests
+    """
+    parts = urlsplit(url)
+    if parts.hostname != (api_host or urlsplit(HeyTelecomApi.API_URL).hostname):
+        return None
+    for kind, pattern in PAYLOAD_PATTERNS.items():
+        if pattern.search(parts.path):
+            return kind
+    return None
+
+
+def url_matcher(kind: str, api_host: Optional[str] = None) -> Callable[[str], bool]:
+    """Return a URL predicate for ResponseReady matching one payload kind."""
+    return lambda url: payload_kind(url, api_host) == kind
+
+
+class ResponseCollector:
+    """
+    Response listener that keeps the JSON API responses seen by the browser.
+
+    Registered on the browser context, so it also sees the responses of the
+    extra tabs used for parallel usage extraction. Only the response objects
+    are stored in the listener; their bodies are read later by the client,
+    once it knows which ones it needs.
+    """
+
+    def __init__(self, api_host: Optional[str] = None):
+        self.api_host = api_host
+        self._responses: List[Any] = []
+
+    def __call__(self, response):
+        if response.status >= 400 or not payload_kind(response.url, self.api_host):
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        self._responses.append(response)
+
+    def clear(self):
+        """Forget all collected responses."""
+        self._responses.clear()
+
+    def take(self, kind: str, page=None) -> List[Any]:
+        """
+        Remove and return the collected responses of one payload kind.
+
+        Args:
+            kind: "inventory", "usage" or "invoice"
+            page: Only return responses that belong to this page
+        """
+        taken, kept = [], []
+        for response in self._responses:
+            matches = payload_kind(response.url, self.api_host) == kind
+            if matches and page is not None:
+                try:
+                    matches = response.frame.page == page
+                except Exception:
+                    matches = False
+            (taken if matches else kept).append(response)
+        self._responses = kept
+        return taken
+
+
+def products_from_payloads(payloads: List[Any]) -> Optional[List[Product]]:
+    """
+    Build products from captured inventory payloads.
+
+    Returns:
+        The products of the last payload, or None if a product is missing
+        its usage (the caller then loads the usage pages)
+    """
+    for payload in reversed(payloads):
+        products = products_from_inventory(payload)
+        if not products:
+            continue
+        if any(p.product_type == "mobile" and not p.usage for p in products):
+            return None
+        return products
+    return None
+
+
+def usage_from_payloads(payloads: List[Any]) -> Optional[Dict[str, Any]]:
+    """Build the usage dictionary from captured consumption payloads, merging partial ones."""
+    usage: Dict[str, Any] = {}
+    for payload in payloads:
+        usage.update(usage_from_json(payload) or {})
+    return usage or None
+
+
+def invoice_from_payloads(payloads: List[Any]) -> Optional[Invoice]:
+    """Build the latest invoice from captured invoice payloads."""
+    for payload in reversed(payloads):
+        invoice = invoice_from_json(payload)
+        if invoice:
+            return invoice
+    return None
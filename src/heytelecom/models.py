@@ -1,31 +1,183 @@
 """Data models for Hey Telecom."""
-from dataclasses import dataclass, field
+import json
+from dataclasses import dataclass, field, fields
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Optional speed-up (pip install heytelecom[fast])
+    orjson = None
 
+
+def _slotted(cls):
+    """
+    Recreate a dataclass with __slots__ instead of a per-instance __dict__.
+
+    dataclass(slots=True) does the same but needs Python 3.10. Slots make
+    every record smaller and attribute access faster, which adds up when
+    holding thousands of historical snapshots.
+    """
+    names = tuple(f.name for f in fields(cls))
+    namespace = dict(cls.__dict__)
+    for name in names:
+        # Defaults live in the generated __init__, the class attributes would shadow the slots
+        namespace.pop(name, None)
+    namespace.pop("__dict__", None)
+    namespace.pop("__weakref__", None)
+    namespace["__slots__"] = names
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+def dumps(data: Any) -> str:
+    """Serialize to compact JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data).decode("utf-8")
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False)
+
+
+def loads(text: Any) -> Any:
+    """Parse JSON (str or bytes), using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+@_slotted
+@dataclass
+class Period:
+    """Billing period of the usage counters (ISO dates)."""
+    start: Optional[str] = None
+    end: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {"start": self.start, "end": self.end}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional["Period"]:
+        """Create from a dictionary produced by to_dict() (None if empty)."""
+        if not data:
+            return None
+        return cls(data.get("start"), data.get("end"))
+
+
+@_slotted
+@dataclass
+class DataUsage:
+    """Mobile data (or internet) consumption, in GB."""
+    used: Optional[float] = None
+    limit: Optional[float] = None
+    unlimited: bool = False
+    last_update: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "used": self.used,
+            "limit": self.limit,
+            "unlimited": self.unlimited,
+            "last_update": self.last_update
+        }
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional["DataUsage"]:
+        """Create from a dictionary produced by to_dict() (None if empty)."""
+        if not data:
+            return None
+        return cls(data.get("used"), data.get("limit"), bool(data.get("unlimited")), data.get("last_update"))
+
+
+@_slotted
+@dataclass
+class CallUsage:
+    """Call consumption, in minutes."""
+    used: Optional[float] = None
+    unlimited: bool = False
+    last_update: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {"used": self.used, "unlimited": self.unlimited, "last_update": self.last_update}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional["CallUsage"]:
+        """Create from a dictionary produced by to_dict() (None if empty)."""
+        if not data:
+            return None
+        return cls(data.get("used"), bool(data.get("unlimited")), data.get("last_update"))
+
+
+@_slotted
+@dataclass
+class SmsUsage:
+    """SMS/MMS consumption, in messages."""
+    used: Optional[int] = None
+    unlimited: bool = False
+    last_update: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {"used": self.used, "unlimited": self.unlimited, "last_update": self.last_update}
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> Optional["SmsUsage"]:
+        """Create from a dictionary produced by to_dict() (None if empty)."""
+        if not data:
+            return None
+        return cls(data.get("used"), bool(data.get("unlimited")), data.get("last_update"))
+
+
+@_slotted
 @dataclass
 class UsageData:
     """Represents usage data for a product."""
-    period: Optional[Dict[str, str]] = None
-    data: Optional[Dict[str, Any]] = None
-    calls: Optional[Dict[str, Any]] = None
-    sms_mms: Optional[Dict[str, Any]] = None
+    period: Optional[Period] = None
+    data: Optional[DataUsage] = None
+    calls: Optional[CallUsage] = None
+    sms_mms: Optional[SmsUsage] = None
+    # Set when the usage was served from the incremental sync state instead of fetched
+    cached_at: Optional[str] = None
+
+    def __post_init__(self):
+        # Accept the plain dictionaries the parsers and older callers pass in
+        if isinstance(self.period, dict):
+            self.period = Period.from_dict(self.period)
+        if isinstance(self.data, dict):
+            self.data = DataUsage.from_dict(self.data)
+        if isinstance(self.calls, dict):
+            self.calls = CallUsage.from_dict(self.calls)
+        if isinstance(self.sms_mms, dict):
+            self.sms_mms = SmsUsage.from_dict(self.sms_mms)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary, excluding None values."""
         result = {}
         if self.period:
-            result["period"] = self.period
+            result["period"] = self.period.to_dict()
         if self.data:
-            result["data"] = self.data
+            result["data"] = self.data.to_dict()
         if self.calls:
-            result["calls"] = self.calls
+            result["calls"] = self.calls.to_dict()
         if self.sms_mms:
-            result["sms_mms"] = self.sms_mms
+            result["sms_mms"] = self.sms_mms.to_dict()
+        if self.cached_at:
+            result["cached_at"] = self.cached_at
         return result
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "UsageData":
+        """Create from a dictionary produced by to_dict()."""
+        return cls(
+            period=Period.from_dict(data.get("period")),
+            data=DataUsage.from_dict(data.get("data")),
+            calls=CallUsage.from_dict(data.get("calls")),
+            sms_mms=SmsUsage.from_dict(data.get("sms_mms")),
+            cached_at=data.get("cached_at")
+        )
+
 
+@_slotted
 @dataclass
 class Contract:
     """Represents contract information."""
@@ -41,7 +193,13 @@ class Contract:
             result["price_per_month_eur"] = self.price_per_month_eur
         return result
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Contract":
+        """Create from a dictionary produced by to_dict()."""
+        return cls(start_date=data.get("start_date"), price_per_month_eur=data.get("price_per_month_eur"))
+
 
+@_slotted
 @dataclass
 class Product:
     """Represents a telecom product (mobile or internet)."""
@@ -75,7 +233,21 @@ class Product:
                 result["usage"] = usage_dict
         return result
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Product":
+        """Create from a dictionary produced by to_dict()."""
+        return cls(
+            product_id=data["id"],
+            product_type=data["type"],
+            phone_number=data.get("phone_number"),
+            easy_switch_number=data.get("easy_switch_number"),
+            tariff=data.get("tariff"),
+            contract=Contract.from_dict(data["contract"]) if data.get("contract") else None,
+            usage=UsageData.from_dict(data["usage"]) if data.get("usage") else None
+        )
 
+
+@_slotted
 @dataclass
 class Invoice:
     """Represents an invoice."""
@@ -103,7 +275,20 @@ class Invoice:
             result["due_date"] = self.due_date
         return result
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Invoice":
+        """Create from a dictionary produced by to_dict()."""
+        return cls(
+            invoice_id=data.get("invoice_id"),
+            amount_eur=data.get("amount_eur"),
+            status=data.get("status"),
+            paid=bool(data.get("paid")),
+            date=data.get("date"),
+            due_date=data.get("due_date")
+        )
+
 
+@_slotted
 @dataclass
 class AccountData:
     """Represents account-level data."""
@@ -111,6 +296,8 @@ class AccountData:
     last_sync: Optional[str] = None
     products: list[Product] = field(default_factory=list)
     latest_invoice: Optional[Invoice] = None
+    # Timings and counters of the scrape that produced this data
+    sync: Optional[Dict[str, Any]] = None
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary format."""
@@ -121,12 +308,36 @@ class AccountData:
             },
             "products": [product.to_dict() for product in self.products]
         }
-        
+        if self.sync:
+            result["account"]["sync"] = self.sync
+
         if self.latest_invoice:
             invoice_dict = self.latest_invoice.to_dict()
             if invoice_dict:
                 result["billing"] = {
                     "latest_invoice": invoice_dict
                 }
-        
+
         return result
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "AccountData":
+        """Create from a dictionary produced by to_dict(), e.g. a cached API response."""
+        account = data.get("account") or {}
+        invoice = (data.get("billing") or {}).get("latest_invoice")
+        return cls(
+            provider=data.get("provider", "hey!"),
+            last_sync=account.get("last_sync"),
+            products=[Product.from_dict(product) for product in data.get("products", [])],
+            latest_invoice=Invoice.from_dict(invoice) if invoice else None,
+            sync=account.get("sync")
+        )
+
+    def to_json(self) -> str:
+        """Serialize to_dict() to compact JSON (orjson when installed)."""
+        return dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text: Any) -> "AccountData":
+        """Create from the output of to_json() (str or bytes)."""
+        return cls.from_dict(loads(text))
@@ -0,0 +1,370 @@
+"""Offline extraction of saved ecare pages, without a browser."""
+import re
+from concurrent.futures import ProcessPoolExecutor
+from html.parser import HTMLParser
+from typing import Optional, Dict, Any, List, Tuple, Iterable, Iterator
+
+from . import extraction as ex
+from .models import Product, Invoice
+from .parsers import build_product
+
+
+# Elements without a closing tag
+_VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "source", "track", "wbr",
+}
+
+# Elements that start a new line in innerText
+_BLOCK_TAGS = {
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt",
+    "footer", "form", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "li",
+    "main", "nav", "ol", "p", "section", "table", "tr", "ul",
+}
+
+_SKIPPED_TAGS = {"script", "style", "template", "noscript"}
+
+
+class Element:
+    """A parsed HTML element with just enough structure for the page selectors."""
+
+    __slots__ = ("tag", "attrs", "children", "parent")
+
+    def __init__(self, tag: str, attrs: Dict[str, str], parent: Optional["Element"] = None):
+        self.tag = tag
+        self.attrs = attrs
+        self.children: List[Any] = []
+        self.parent = parent
+
+    @property
+    def classes(self) -> List[str]:
+        return self.attrs.get("class", "").split()
+
+    def iter(self) -> Iterator["Element"]:
+        """Iterate over all descendant elements in document order."""
+        for child in self.children:
+            if isinstance(child, Element):
+                yield child
+                yield from child.iter()
+
+    def elements(self) -> List["Element"]:
+        """Child elements, without the text nodes."""
+        return [child for child in self.children if isinstance(child, Element)]
+
+    def next_siblings(self) -> List["Element"]:
+        """Element siblings following this element."""
+        if self.parent is None:
+            return []
+        siblings = self.parent.elements()
+        return siblings[siblings.index(self) + 1:]
+
+    def text_content(self) -> str:
+        """All text below the element, like DOM textContent."""
+        parts = []
+        for child in self.children:
+            parts.append(child.text_content() if isinstance(child, Element) else child)
+        return "".join(parts)
+
+    def _inner_text_parts(self, parts: List[str]):
+        if self.tag in _BLOCK_TAGS:
+            parts.append("\n")
+        for child in self.children:
+            if isinstance(child, Element):
+                child._inner_text_parts(parts)
+            else:
+                parts.append(child)
+        if self.tag in _BLOCK_TAGS:
+            parts.append("\n")
+
+    def inner_text(self) -> str:
+        """Approximate the rendered innerText: collapsed whitespace, block elements on new lines."""
+        parts: List[str] = []
+        for child in self.children:
+            if isinstance(child, Element):
+                child._inner_text_parts(parts)
+            else:
+                parts.append(child)
+        lines = (" ".join(line.split()) for line in "".join(parts).split("\n"))
+        return "\n".join(line for line in lines if line)
+
+    def select(self, selector: "Selector") -> List["Element"]:
+        """All descendants matching a compiled selector, in document order."""
+        return [el for el in self.iter() if selector.matches(el)]
+
+    def select_one(self, selector: "Selector") -> Optional["Element"]:
+        """First descendant matching a compiled selector."""
+        for el in self.iter():
+            if selector.matches(el):
+                return el
+        return None
+
+
+_COMPOUND_RE = re.compile(
+    r"(?P<tag>[a-zA-Z][\w-]*|\*)"
+    r"|#(?P<id>[\w-]+)"
+    r"|\.(?P<cls>[\w-]+)"
+    r"|\[(?P<attr>[\w-]+)(?:=[\"']?(?P<value>[^\"'\]]*)[\"']?)?\]"
+)
+
+
+class _Compound:
+    """One compound selector such as a.iris-products__link[data-event_category="MyProducts"]."""
+
+    def __init__(self, text: str):
+        self.tag: Optional[str] = None
+        self.ids: List[str] = []
+        self.classes: List[str] = []
+        self.attrs: List[Tuple[str, Optional[str]]] = []
+        pos = 0
+        while pos < len(text):
+            match = _COMPOUND_RE.match(text, pos)
+            if not match or match.end() == pos:
+                raise ValueError(f"Unsupported selector '{text}'")
+            if match.group("tag") and match.group("tag") != "*":
+                self.tag = match.group("tag").lower()
+            elif match.group("id"):
+                self.ids.append(match.group("id"))
+            elif match.group("cls"):
+                self.classes.append(match.group("cls"))
+            elif match.group("attr"):
+                self.attrs.append((match.group("attr"), match.group("value")))
+            pos = match.end()
+
+    def matches(self, el: Element) -> bool:
+        if self.tag and el.tag != self.tag:
+            return False
+        if any(el.attrs.get("id") != i for i in self.ids):
+            return False
+        if self.classes:
+            classes = el.classes
+            if any(c not in classes for c in self.classes):
+                return False
+        for name, value in self.attrs:
+            if name not in el.attrs or (value is not None and el.attrs[name] != value):
+                return False
+        return True
+
+
+class Selector:
+    """
+    Compiled CSS selector supporting the subset used by the page selectors.
+
+    Handles tag, #id, .class and [attr="value"] parts, the descendant
+    combinator and comma separated groups, which covers every selector in
+    the extraction module.
+    """
+
+    def __init__(self, selector: str):
+        self.selector = selector
+        self.groups = [[_Compound(part) for part in group.split()]
+                       for group in selector.split(",") if group.strip()]
+
+    def matches(self, el: Element) -> bool:
+        """Check whether `el` matches; ancestors may lie anywhere in the document, like querySelector."""
+        return any(self._match_group(group, el) for group in self.groups)
+
+    @staticmethod
+    def _match_group(group: List[_Compound], el: Element) -> bool:
+        if not group[-1].matches(el):
+            return False
+        ancestor = el.parent
+        for compound in reversed(group[:-1]):
+            while ancestor is not None and not compound.matches(ancestor):
+                ancestor = ancestor.parent
+            if ancestor is None:
+                return False
+            ancestor = ancestor.parent
+        return True
+
+
+_SELECTORS: Dict[str, Selector] = {}
+
+
+def _compiled(selector: str) -> Selector:
+    """Compile a selector once and reuse it."""
+    compiled = _SELECTORS.get(selector)
+    if compiled is None:
+        compiled = _SELECTORS[selector] = Selector(selector)
+    return compiled
+
+
+class _TreeBuilder(HTMLParser):
+    """Build an Element tree from HTML, tolerating unclosed tags."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = Element("#document", {})
+        self._stack = [self.root]
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if self._skip:
+            if tag in _SKIPPED_TAGS:
+                self._skip += 1
+            return
+        if tag in _SKIPPED_TAGS:
+            self._skip = 1
+            return
+        parent = self._stack[-1]
+        el = Element(tag, {k: (v or "") for k, v in attrs}, parent)
+        parent.children.append(el)
+        if tag not in _VOID_TAGS:
+            self._stack.append(el)
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in _VOID_TAGS and not self._skip and self._stack[-1].tag == tag:
+            self._stack.pop()
+
+    def handle_endtag(self, tag):
+        if self._skip:
+            if tag in _SKIPPED_TAGS:
+                self._skip -= 1
+            return
+        for index in range(len(self._stack) - 1, 0, -1):
+            if self._stack[index].tag == tag:
+                del self._stack[index:]
+                return
+
+    def handle_data(self, data):
+        if not self._skip:
+            self._stack[-1].children.append(data)
+
+
+def parse_html(html: str) -> Element:
+    """Parse an HTML document into an Element tree."""
+    builder = _TreeBuilder()
+    builder.feed(html)
+    builder.close()
+    return builder.root
+
+
+def _text(el: Optional[Element]) -> Optional[str]:
+    return el.inner_text() if el is not None else None
+
+
+def _by_label(root: Element, title_selector: str, labels: List[str], value_tag: str) -> Optional[Element]:
+    """Python version of the byLabel snapshot helper."""
+    wanted = [label.lower() for label in labels]
+    for title in root.select(_compiled(title_selector)):
+        content = title.text_content().lower()
+        if not any(label in content for label in wanted):
+            continue
+        for el in title.next_siblings():
+            if el.tag == value_tag:
+                return el
+    return None
+
+
+def _document(html) -> Element:
+    return html if isinstance(html, Element) else parse_html(html)
+
+
+def products_snapshot(html) -> List[Dict[str, Any]]:
+    """Same result as PRODUCTS_SNAPSHOT_SCRIPT, computed from HTML (or a parsed tree)."""
+    s = ex.PRODUCTS_SNAPSHOT_ARG
+    snapshot = []
+    for item in _document(html).select(_compiled(s["item"])):
+        link = item.select_one(_compiled(s["link"]))
+        texts: Dict[str, Any] = {
+            "phone_number": _text(item.select_one(_compiled(s["phone"]))),
+            "tariff": _text(item.select_one(_compiled(s["tariff"]))),
+            "has_usage_link": link is not None,
+            "usage_href": link.attrs.get("href") if link is not None else None,
+        }
+        for key, labels in s["fields"].items():
+            texts[key] = _text(_by_label(item, s["title"], labels, "span"))
+        snapshot.append(texts)
+    return snapshot
+
+
+def usage_snapshot(html, url: Optional[str] = None) -> Dict[str, Any]:
+    """Same result as USAGE_SNAPSHOT_SCRIPT, computed from HTML (or a parsed tree)."""
+    s = ex.USAGE_SNAPSHOT_ARG
+    document = _document(html)
+    blocks: Dict[str, Optional[Dict[str, Optional[str]]]] = {}
+    for name, selector in s["blocks"].items():
+        block = document.select_one(_compiled(selector))
+        blocks[name] = {
+            "limit": _text(block.select_one(_compiled(s["limit"]))),
+            "used": _text(block.select_one(_compiled(s["used"]))),
+            "update": _text(block.select_one(_compiled(s["update"]))),
+        } if block is not None else None
+    return {"url": url, "period": _text(document.select_one(_compiled(s["period"]))), "blocks": blocks}
+
+
+def invoice_snapshot(html) -> Optional[Dict[str, Optional[str]]]:
+    """Same result as INVOICE_SNAPSHOT_SCRIPT, computed from HTML (or a parsed tree)."""
+    s = ex.INVOICE_SNAPSHOT_ARG
+    section = _document(html).select_one(_compiled(s["section"]))
+    if section is None:
+        return None
+    return {key: _text(_by_label(section, s["title"], labels, "p")) for key, labels in s["fields"].items()}
+
+
+def parse_products_page(html: str) -> List[Product]:
+    """
+    Build the products listed on a saved products page.
+
+    Note:
+        The list page holds no consumption figures; combine with
+        parse_usage_page() on the saved usage pages to fill in the usage.
+    """
+    return [build_product(p["data"]) for p in ex.products_from_snapshot(products_snapshot(html))]
+
+
+def parse_usage_page(html: str, url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+    """
+    Build the usage dictionary from a saved detailed usage page.
+
+    Args:
+        html: Page HTML (e.g. from page.content())
+        url: URL the page was loaded from; when given, pages that are not a
+            usage page return None, like in the live extraction
+    """
+    snapshot = usage_snapshot(html, url)
+    if url is not None:
+        return ex.usage_from_snapshot(snapshot)
+    return ex.usage_from_texts(snapshot["period"], snapshot["blocks"])
+
+
+def parse_invoice_page(html: str) -> Optional[Invoice]:
+    """Build the latest invoice from a saved invoices page."""
+    texts = invoice_snapshot(html)
+    if texts is None:
+        return None
+    return ex.invoice_from_texts(texts)
+
+
+PAGE_PARSERS = {
+    "products": parse_products_page,
+    "usage": parse_usage_page,
+    "invoice": parse_invoice_page,
+}
+
+
+def _parse_file(job: Tuple[str, str]) -> Any:
+    kind, path = job
+    with open(path, encoding="utf-8") as f:
+        return PAGE_PARSERS[kind](f.read())
+
+
+def parse_files(kind: str, paths: Iterable[str], processes: Optional[int] = None) -> List[Any]:
+    """
+    Re-parse stored page snapshots in bulk.
+
+    Args:
+        kind: "products", "usage" or "invoice"
+        paths: HTML files to parse
+        processes: Number of worker processes (None uses one per CPU, 1 parses in-process)
+
+    Returns:
+        One result per path, in the same order
+    """
+    if kind not in PAGE_PARSERS:
+        raise ValueError(f"Unknown page kind '{kind}', expected one of {tuple(PAGE_PARSERS)}")
+    jobs = [(kind, path) for path in paths]
+    if processes == 1 or len(jobs) < 2:
+        return [_parse_file(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        return list(pool.map(_parse_file, jobs, chunksize=max(1, len(jobs) // 32)))
@@ -0,0 +1,315 @@
+"""Browserless authorization-code + PKCE login against openid.heytelecom.be."""
+import base64
+import hashlib
+import secrets
+import time
+from html.parser import HTMLParser
+from http.cookies import SimpleCookie
+from typing import Optional, Dict, Any, List, Tuple
+from urllib.parse import urlencode, urljoin, urlsplit, parse_qs
+
+from .api import HttpTransport, HttpResponse, ApiError
+from .tokens import ApiCredentials, token_expiry
+
+
+class OidcFlowError(RuntimeError):
+    """Raised when the login pages no longer look like the expected flow."""
+
+
+class LoginError(RuntimeError):
+    """Raised when the identity provider rejects the email or password."""
+
+
+def generate_pkce_pair() -> Tuple[str, str]:
+    """
+    Generate a PKCE code verifier and its S256 code challenge.
+
+    Returns:
+        Tuple of (code_verifier, code_challenge)
+    """
+    verifier = secrets.token_urlsafe(64)[:96]
+    digest = hashlib.sha256(verifier.encode("ascii")).digest()
+    challenge = base64.urlsafe_b64encode(digest).decode("ascii").rstrip("=")
+    return verifier, challenge
+
+
+class _CookieJar:
+    """Very small cookie jar, enough to carry the login session between hosts."""
+
+    def __init__(self):
+        self._cookies: Dict[Tuple[str, str], str] = {}
+
+    def update(self, url: str, set_cookies: List[str]):
+        host = urlsplit(url).hostname or ""
+        for header in set_cookies:
+            cookie = SimpleCookie()
+            try:
+                cookie.load(header)
+            except Exception:
+                continue
+            for name, morsel in cookie.items():
+                domain = (morsel["domain"] or host).lstrip(".")
+                if morsel["max-age"] == "0":
+                    self._cookies.pop((domain, name), None)
+                else:
+                    self._cookies[(domain, name)] = morsel.value
+
+    def header_for(self, url: str) -> Optional[str]:
+        host = urlsplit(url).hostname or ""
+        pairs = [
+            f"{name}={value}"
+            for (domain, name), value in self._cookies.items()
+            if host == domain or host.endswith(f".{domain}")
+        ]
+        return "; ".join(pairs) if pairs else None
+
+
+class _FormParser(HTMLParser):
+    """Collect forms, their inputs and element ids from a login page."""
+
+    def __init__(self):
+        super().__init__()
+        self.forms: List[Dict[str, Any]] = []
+        self.links: Dict[str, str] = {}
+        self._form: Optional[Dict[str, Any]] = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: (v or "") for k, v in attrs}
+        if tag == "form":
+            self._form = {"action": attrs.get("action", ""), "method": attrs.get("method", "get"),
+                          "inputs": []}
+            self.forms.append(self._form)
+        elif tag == "input" and self._form is not None:
+            self._form["inputs"].append(attrs)
+        elif tag == "a" and attrs.get("id") and attrs.get("href"):
+            self.links[attrs["id"]] = attrs["href"]
+
+    def handle_endtag(self, tag):
+        if tag == "form":
+            self._form = None
+
+
+class OidcLogin:
+    """
+    HTTP-only implementation of the ecare authorization-code + PKCE flow.
+
+    The flow mirrors what the Angular app does: /oidc/authorize redirects to
+    the auth form, the form is posted with the credentials and the resulting
+    authorization code is exchanged at /oidc/token.
+    """
+
+    ISSUER_URL = "https://openid.heytelecom.be"
+    CLIENT_ID = "4x5cSOWeuG"
+    REDIRECT_URI = "https://ecare.heytelecom.be/index.html"
+    SCOPE = "openid ecare"
+    EMAIL_INPUT_ID = "Login_byEmail_emailAddress"
+    PASSWORD_INPUT_ID = "Login_byEmail_password"
+    EMAIL_LOGIN_LINK_ID = "Login_loginByEmail"
+    WRONG_CREDENTIALS_TEXT = "Verkeerde gebruikersnaam en/of wachtwoord"
+    MAX_REDIRECTS = 10
+
+    def __init__(self, issuer_url: Optional[str] = None, client_id: Optional[str] = None,
+                 redirect_uri: Optional[str] = None, language: str = "nl",
+                 transport: Optional[HttpTransport] = None):
+        """
+        Initialize the login engine.
+
+        Args:
+            issuer_url: Override the OpenID issuer (e.g. for a local stand-in server)
+            client_id: Override the OAuth client id
+            redirect_uri: Override the registered redirect URI
+            language: Value for the ui_locales parameter
+            transport: Shared HttpTransport (a new one is created if omitted)
+        """
+        self.issuer_url = (issuer_url or self.ISSUER_URL).rstrip("/")
+        self.client_id = client_id or self.CLIENT_ID
+        self.redirect_uri = redirect_uri or self.REDIRECT_URI
+        self.language = language
+        self._transport = transport or HttpTransport()
+        self._owns_transport = transport is None
+
+    def close(self):
+        """Close the underlying transport if this engine created it."""
+        if self._owns_transport:
+            self._transport.close()
+
+    def _send(self, jar: _CookieJar, method: str, url: str,
+              data: Optional[Dict[str, str]] = None) -> HttpResponse:
+        headers = {"Accept": "text/html,application/json"}
+        cookie = jar.header_for(url)
+        if cookie:
+            headers["Cookie"] = cookie
+        body = None
+        if data is not None:
+            body = urlencode(data).encode("utf-8")
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        response = self._transport.request(method, url, headers=headers, body=body)
+        jar.update(url, response.set_cookies)
+        return response
+
+    def _follow(self, jar: _CookieJar, method: str, url: str,
+                data: Optional[Dict[str, str]] = None) -> Tuple[str, HttpResponse]:
+        """Follow redirects until a page is returned or the redirect URI is reached."""
+        for _ in range(self.MAX_REDIRECTS):
+            if url.startswith(self.redirect_uri):
+                return url, HttpResponse(200, {}, b"")
+            response = self._send(jar, method, url, data)
+            location = response.headers.get("location")
+            if response.status in (301, 302, 303, 307, 308) and location:
+                url = urljoin(url, location)
+                if response.status in (301, 302, 303):
+                    method, data = "GET", None
+                continue
+            return url, response
+        raise OidcFlowError("Too many redirects during login")
+
+    def authorization_url(self, code_challenge: str, state: str, nonce: str) -> str:
+        """Build the /oidc/authorize URL for the given PKCE challenge."""
+        params = {
+            "response_type": "code",
+            "client_id": self.client_id,
+            "state": state,
+            "redirect_uri": self.redirect_uri,
+            "scope": self.SCOPE,
+            "code_challenge": code_challenge,
+            "code_challenge_method": "S256",
+            "nonce": nonce,
+            "ui_locales": self.language,
+        }
+        return f"{self.issuer_url}/oidc/authorize?{urlencode(params)}"
+
+    def _submit_credentials(self, jar: _CookieJar, page_url: str, response: HttpResponse,
+                            email: str, password: str) -> str:
+        """Fill in and post the email login form, returning the final URL."""
+        for _ in range(2):
+            parser = _FormParser()
+            parser.feed(response.body.decode("utf-8", "replace"))
+            form = next((f for f in parser.forms
+                         if any(i.get("type") == "password" for i in f["inputs"])), None)
+            if form:
+                break
+            # The email form sits behind the "Inloggen via E-mail" link
+            link = parser.links.get(self.EMAIL_LOGIN_LINK_ID)
+            if not link:
+                raise OidcFlowError(f"No login form found on {page_url}")
+            page_url, response = self._follow(jar, "GET", urljoin(page_url, link))
+        else:
+            raise OidcFlowError(f"No login form found on {page_url}")
+
+        fields: Dict[str, str] = {}
+        for attrs in form["inputs"]:
+            name = attrs.get("name")
+            if not name:
+                continue
+            if attrs.get("id") == self.EMAIL_INPUT_ID or attrs.get("type") == "email":
+                fields[name] = email
+            elif attrs.get("id") == self.PASSWORD_INPUT_ID or attrs.get("type") == "password":
+                fields[name] = password
+            elif attrs.get("type") not in ("submit", "button", "checkbox", "radio"):
+                fields[name] = attrs.get("value", "")
+
+        action = urljoin(page_url, form["action"] or page_url)
+        final_url, final = self._follow(jar, form["method"].upper(), action, fields)
+        if not final_url.startswith(self.redirect_uri):
+            if self.WRONG_CREDENTIALS_TEXT in final.body.decode("utf-8", "replace"):
+                raise LoginError("Login failed: Wrong username and/or password")
+            raise OidcFlowError(f"Login did not redirect back to the app (ended on {final_url})")
+        return final_url
+
+    def _token_request(self, data: Dict[str, str], api_key: str) -> ApiCredentials:
+        try:
+            response = self._transport.request(
+                "POST", f"{self.issuer_url}/oidc/token",
+                headers={"Accept": "application/json",
+                         "Content-Type": "application/x-www-form-urlencoded"},
+                body=urlencode(data).encode("utf-8"),
+            )
+        except ApiError as e:
+            raise OidcFlowError(f"Token request failed: {e}")
+        if response.status >= 400:
+            raise OidcFlowError(f"Token endpoint returned {response.status}")
+        try:
+            tokens = response.json() or {}
+        except ValueError:
+            raise OidcFlowError("Token endpoint returned invalid JSON")
+        if not isinstance(tokens, dict):
+            raise OidcFlowError("Token endpoint did not return a JSON object")
+        access_token = tokens.get("access_token")
+        if not access_token:
+            raise OidcFlowError("Token endpoint did not return an access token")
+
+        now = time.time()
+        expires_at = token_expiry(access_token)
+        if expires_at is None and tokens.get("expires_in"):
+            try:
+                expires_at = now + float(tokens["expires_in"])
+            except (TypeError, ValueError):
+                raise OidcFlowError(f"Token endpoint returned an invalid expires_in: {tokens['expires_in']!r}")
+        return ApiCredentials(
+            access_token=access_token,
+            api_key=api_key,
+            expires_at=expires_at,
+            captured_at=now,
+            refresh_token=tokens.get("refresh_token") or data.get("refresh_token"),
+        )
+
+    def login(self, email: str, password: str, api_key: str) -> ApiCredentials:
+        """
+        Run the full authorization-code + PKCE flow.
+
+        Args:
+            email: Account email address
+            password: Account password
+            api_key: x-api-key to attach to the resulting credentials
+
+        Returns:
+            ApiCredentials including the refresh token, if issued
+
+        Raises:
+            LoginError: If the credentials are rejected
+            OidcFlowError: If the flow does not match the expected pages
+        """
+        verifier, challenge = generate_pkce_pair()
+        state = secrets.token_urlsafe(24)
+        jar = _CookieJar()
+
+        try:
+            url = self.authorization_url(challenge, state, secrets.token_urlsafe(24))
+            page_url, response = self._follow(jar, "GET", url)
+            if not page_url.startswith(self.redirect_uri):
+                page_url = self._submit_credentials(jar, page_url, response, email, password)
+        except ApiError as e:
+            raise OidcFlowError(f"Login request failed: {e}")
+
+        query = parse_qs(urlsplit(page_url).query)
+        if query.get("state", [None])[0] != state:
+            raise OidcFlowError("State mismatch in authorization response")
+        code = query.get("code", [None])[0]
+        if not code:
+            raise OidcFlowError("No authorization code in redirect")
+
+        return self._token_request({
+            "grant_type": "authorization_code",
+            "code": code,
+            "redirect_uri": self.redirect_uri,
+            "code_verifier": verifier,
+            "client_id": self.client_id,
+        }, api_key)
+
+    def refresh(self, credentials: ApiCredentials) -> ApiCredentials:
+        """
+        Exchange a refresh token for a new access token.
+
+        Raises:
+            OidcFlowError: If there is no refresh token or it was rejected
+        """
+        if not credentials.refresh_token:
+            raise OidcFlowError("No refresh token available")
+        try:
+            return self._token_request({
+                "grant_type": "refresh_token",
+                "refresh_token": credentials.refresh_token,
+                "client_id": self.client_id,
+            }, credentials.api_key)
+        except ApiError as e:
+            raise OidcFlowError(f"Refresh request failed: {e}")
@@ -1,101 +1,367 @@
 """Parsing utilities for Hey Telecom data."""
 import re
-from datetime import datetime
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional, Iterable, Tuple
+
+from .models import Product, Contract, UsageData
+
+
+# The words the portal uses per language (it serves /nl/ and /fr/, the API
+# and some labels use English). Every LocaleParser compiles its patterns
+# from the union of the tables of its locales once.
+LOCALES: Dict[str, Dict[str, Tuple[str, ...]]] = {
+    "nl": {
+        "period_separator": ("tot",),
+        "unlimited": ("onbeperkt",),
+        "paid": ("betaald",),
+        "data_units": ("GB", "MB", "TB"),
+        "minutes": ("min",),
+        "sms": ("sms",),
+    },
+    "fr": {
+        "period_separator": ("au", "jusqu'au"),
+        "unlimited": ("illimité",),
+        "paid": ("payé", "payée"),
+        "data_units": ("Go", "Mo", "To"),
+        "minutes": ("min",),
+        "sms": ("sms",),
+    },
+    "en": {
+        "period_separator": ("to", "until"),
+        "unlimited": ("unlimited",),
+        "paid": ("paid", "settled"),
+        "data_units": ("GB", "MB", "TB"),
+        "minutes": ("min",),
+        "sms": ("sms",),
+    },
+}
+
+# French unit abbreviations (octet) mapped to the ones convert_to_gb knows
+_UNIT_ALIASES = {"GO": "GB", "MO": "MB", "TO": "TB"}
+
+# The "last update" stamps carry no year: a stamp further ahead of the clock
+# than this (time zones, clock skew) was made last year, e.g. 31/12 read on 1/1
+LAST_UPDATE_TOLERANCE = timedelta(days=1)
+
+# "2.25", "2,25" or "5"
+_NUMBER = r"(\d+(?:[.,]\d+)?)"
+
+
+def _words(words: Iterable[str]) -> str:
+    """Regex alternation of literal words, longest first so prefixes never win."""
+    return "|".join(re.escape(word) for word in sorted(set(words), key=len, reverse=True))
+
+
+def _data_units(units: Iterable[str]) -> str:
+    """
+    Regex alternation of data units.
+
+    The byte units match in any case, the French octet units only as
+    written: lowercase "mo" and "to" also start "months" and "tot".
+    """
+    units = set(units)
+    octets = {unit for unit in units if not unit.upper().endswith("B")}
+    parts = [f"(?i:{_words(units - octets)})"] if units - octets else []
+    if octets:
+        parts.append(_words(octets))
+    return "|".join(parts)
+
+
+def _number(text: str) -> float:
+    return float(text.replace(",", "."))
+
+
+def convert_to_gb(value, unit):
+    """Convert a numeric amount in B/KB/MB/GB/TB to GB without rounding."""
+    if value is None:
+        return None
+    unit = (unit or 'GB').upper()
+    unit = _UNIT_ALIASES.get(unit, unit)
+    if unit in ('B', 'BYTES'):
+        return value / (1024 ** 3)
+    if unit == 'KB':
+        return value / (1024 ** 2)
+    if unit == 'MB':
+        return value / 1024
+    if unit == 'TB':
+        return value * 1024
+    return value
+
+
+class LocaleParser:
+    """
+    Text parsers for one or more portal languages, with every pattern compiled once.
+
+    Usage:
+        parser = LocaleParser(("fr",))
+        parser.period("Du 11/10/2025 au 11/11/2025")
+    """
+
+    # Fields accepted by parse_batch(), mapped to the parsing method
+    FIELDS = ("data_amount", "price", "date", "period", "minutes", "sms_count",
+              "last_update", "unlimited", "paid")
+
+    def __init__(self, locales: Iterable[str] = tuple(LOCALES)):
+        """
+        Initialize the parser.
+
+        Args:
+            locales: Languages to recognise, keys of LOCALES (all by default)
+
+        Raises:
+            ValueError: If a locale is unknown
+        """
+        self.locales = tuple(locales)
+        unknown = [locale for locale in self.locales if locale not in LOCALES]
+        if unknown or not self.locales:
+            raise ValueError(f"Unknown locales {unknown}, expected some of {tuple(LOCALES)}")
+        table = {key: [word for locale in self.locales for word in LOCALES[locale][key]]
+                 for key in LOCALES["nl"]}
+        self._data_amount = re.compile(rf"{_NUMBER}\s*({_data_units(table['data_units'])})\b")
+        self._price = re.compile(rf"{_NUMBER}\s*€")
+        # DD.MM.YYYY and DD/MM/YYYY in a single pattern
+        self._date = re.compile(r"(\d{2})[./](\d{2})[./](\d{4})")
+        self._period = re.compile(
+            rf"(\d{{2}})/(\d{{2}})/(\d{{4}})\s*(?:{_words(table['period_separator'])})\s*(\d{{2}})/(\d{{2}})/(\d{{4}})",
+            re.IGNORECASE,
+        )
+        self._minutes = re.compile(rf"{_NUMBER}\s*(?:{_words(table['minutes'])})", re.IGNORECASE)
+        self._sms = re.compile(rf"(\d+)\s*(?:{_words(table['sms'])})", re.IGNORECASE)
+        self._last_update = re.compile(r"(\d{2})/(\d{2})\s*(\d{2}:\d{2})")
+        self._unlimited = re.compile(_words(table["unlimited"]), re.IGNORECASE)
+        self._paid = frozenset(word.lower() for word in table["paid"])
+
+    def data_amount(self, text):
+        """Parse data amount like '2.25 GB' or '2,25 Go' to numeric GB value."""
+        if not text:
+            return None
+        match = self._data_amount.search(text)
+        if match:
+            return round(convert_to_gb(_number(match.group(1)), match.group(2)), 2)
+        return None
+
+    def price(self, text):
+        """Parse price like '5 €/maand' or '5,00 €/mois' to numeric value."""
+        if not text:
+            return None
+        match = self._price.search(text)
+        if match:
+            return _number(match.group(1))
+        return None
+
+    def date(self, text):
+        """Parse date like '04.04.2025' or '20/10/2025' to ISO format."""
+        if not text:
+            return None
+        match = self._date.search(text)
+        if match:
+            day, month, year = match.groups()
+            return f"{year}-{month}-{day}"
+        return None
+
+    def period(self, text):
+        """Parse period like 'Van 11/10/2025 tot 11/11/2025' to start and end dates."""
+        if not text:
+            return None
+        match = self._period.search(text)
+        if match:
+            day, month, year, end_day, end_month, end_year = match.groups()
+            return {
+                "start": f"{year}-{month}-{day}",
+                "end": f"{end_year}-{end_month}-{end_day}"
+            }
+        return None
+
+    def minutes(self, text):
+        """Parse minutes like '5 minuten' to numeric value."""
+        if not text:
+            return None
+        match = self._minutes.search(text)
+        if match:
+            return _number(match.group(1))
+        return None
+
+    def sms_count(self, text):
+        """Parse SMS count like '0 sms/mms' to numeric value."""
+        if not text:
+            return None
+        match = self._sms.search(text)
+        if match:
+            return int(match.group(1))
+        return None
+
+    def last_update(self, text, year: Optional[int] = None, now: Optional[datetime] = None):
+        """
+        Parse last update like 'Laatste update : 03/11 17:54' to ISO datetime.
+
+        Args:
+            text: Raw text
+            year: Year of the stamp; by default the most recent year that does
+                not put the stamp in the future (see LAST_UPDATE_TOLERANCE)
+            now: Current time to resolve the year against (defaults to datetime.now())
+        """
+        if not text:
+            return None
+        match = self._last_update.search(text)
+        if not match:
+            return None
+        day, month, time_part = match.groups()
+        if year is None:
+            now = now or datetime.now()
+            year = now.year
+            try:
+                stamp = datetime.strptime(f"{year}-{month}-{day}T{time_part}", "%Y-%m-%dT%H:%M")
+            except ValueError:
+                # 29/02 outside a leap year: it can only be from an earlier year
+                stamp = None
+            if stamp is None or stamp > now + LAST_UPDATE_TOLERANCE:
+                year -= 1
+        return f"{year}-{month}-{day}T{time_part}:00"
+
+    def unlimited(self, text):
+        """Check if a limit is unlimited."""
+        if not text:
+            return False
+        return self._unlimited.search(text) is not None
+
+    def paid(self, status):
+        """Check if an invoice status means paid."""
+        if not status:
+            return False
+        return str(status).strip().lower() in self._paid
+
+    def parse_batch(self, field: str, texts: Iterable[Optional[str]]) -> List[Any]:
+        """
+        Parse many raw texts of one field in a single pass.
+
+        Archives repeat the same strings over and over ("Onbeperkt", the
+        same update time on every block), so every distinct text is only
+        parsed once.
+
+        Args:
+            field: One of FIELDS
+            texts: Raw texts (None entries give the parser's empty result)
+
+        Returns:
+            Parsed values in the order of `texts`
+        """
+        if field not in self.FIELDS:
+            raise ValueError(f"Unknown field '{field}', expected one of {self.FIELDS}")
+        parse = getattr(self, field)
+        if field == "last_update":
+            # Read the clock once for the whole batch
+            now = datetime.now()
+
+            def parse(text):
+                return self.last_update(text, now=now)
+        seen: Dict[Optional[str], Any] = {}
+        results = []
+        for text in texts:
+            if text not in seen:
+                seen[text] = parse(text)
+            results.append(seen[text])
+        return results
+
+
+# Recognises every language, which is what the clients use: the page language
+# does not need to be known up front
+DEFAULT_PARSER = LocaleParser()
+
+_PARSERS: Dict[Tuple[str, ...], LocaleParser] = {DEFAULT_PARSER.locales: DEFAULT_PARSER}
+
+
+def get_parser(locales: Optional[Iterable[str]] = None) -> LocaleParser:
+    """Return the (cached) LocaleParser of some locales, or the all-languages default."""
+    key = tuple(locales) if locales is not None else DEFAULT_PARSER.locales
+    if key not in _PARSERS:
+        _PARSERS[key] = LocaleParser(key)
+    return _PARSERS[key]
+
+
+def parse_batch(field: str, texts: Iterable[Optional[str]],
+                locales: Optional[Iterable[str]] = None) -> List[Any]:
+    """Parse many raw texts of one field in a single pass (see LocaleParser.parse_batch)."""
+    return get_parser(locales).parse_batch(field, texts)
 
 
 def parse_data_amount(text):
     """Parse data amount like '2.25 GB' to numeric GB value."""
-    if not text:
-        return None
-    match = re.search(r'([\d.]+)\s*(GB|MB|TB)', text, re.IGNORECASE)
-    if match:
-        value = float(match.group(1))
-        unit = match.group(2).upper()
-        if unit == 'MB':
-            value = value / 1024  # Convert to GB
-        elif unit == 'TB':
-            value = value * 1024  # Convert to GB
-        return round(value, 2)
-    return None
+    return DEFAULT_PARSER.data_amount(text)
 
 
 def parse_price(text):
     """Parse price like '5 €/maand' to numeric value."""
-    if not text:
-        return None
-    match = re.search(r'([\d.]+)\s*€', text)
-    if match:
-        return float(match.group(1))
-    return None
+    return DEFAULT_PARSER.price(text)
 
 
 def parse_date(text):
     """Parse date like '04.04.2025' or '20/10/2025' to ISO format."""
-    if not text:
-        return None
-    # Try DD.MM.YYYY format
-    match = re.search(r'(\d{2})\.(\d{2})\.(\d{4})', text)
-    if match:
-        day, month, year = match.groups()
-        return f"{year}-{month}-{day}"
-    # Try DD/MM/YYYY format
-    match = re.search(r'(\d{2})/(\d{2})/(\d{4})', text)
-    if match:
-        day, month, year = match.groups()
-        return f"{year}-{month}-{day}"
-    return None
+    return DEFAULT_PARSER.date(text)
 
 
 def parse_period(text):
     """Parse period like 'Van 11/10/2025 tot 11/11/2025' to start and end dates."""
-    if not text:
-        return None
-    match = re.search(r'(\d{2}/\d{2}/\d{4})\s*tot\s*(\d{2}/\d{2}/\d{4})', text)
-    if match:
-        start_str, end_str = match.groups()
-        return {
-            "start": parse_date(start_str),
-            "end": parse_date(end_str)
-        }
-    return None
+    return DEFAULT_PARSER.period(text)
 
 
 def parse_minutes(text):
     """Parse minutes like '5 minuten' to numeric value."""
-    if not text:
-        return None
-    match = re.search(r'([\d.]+)\s*min', text, re.IGNORECASE)
-    if match:
-        return float(match.group(1))
-    return None
+    return DEFAULT_PARSER.minutes(text)
 
 
 def parse_sms_count(text):
     """Parse SMS count like '0 sms/mms' to numeric value."""
-    if not text:
-        return None
-    match = re.search(r'([\d.]+)\s*sms', text, re.IGNORECASE)
-    if match:
-        return int(match.group(1))
-    return None
+    return DEFAULT_PARSER.sms_count(text)
 
 
 def parse_last_update(text):
     """Parse last update like 'Laatste update : 03/11 17:54' to ISO datetime."""
-    if not text:
-        return None
-    match = re.search(r'(\d{2}/\d{2})\s*(\d{2}:\d{2})', text)
-    if match:
-        date_part, time_part = match.groups()
-        day, month = date_part.split('/')
-        # Assume current year
-        year = datetime.now().year
-        return f"{year}-{month}-{day}T{time_part}:00"
-    return None
+    return DEFAULT_PARSER.last_update(text)
 
 
 def is_unlimited(text):
     """Check if a limit is unlimited."""
-    if not text:
-        return False
-    return 'onbeperkt' in text.lower() or 'unlimited' in text.lower()
+    return DEFAULT_PARSER.unlimited(text)
+
+
+def is_paid(status):
+    """Check if an invoice status means paid ('Betaald', 'Payée', 'Paid')."""
+    return DEFAULT_PARSER.paid(status)
+
+
+def build_product(data: Dict[str, Any]) -> Product:
+    """Create Product object from a scraped or API product dictionary."""
+    # Determine product type and ID
+    if "phone_number" in data:
+        product_type = "mobile"
+        phone_clean = data["phone_number"].replace(" ", "")
+        product_id = f"mobile_{phone_clean}"
+    elif "easy_switch_number" in data:
+        product_type = "internet"
+        product_id = f"internet_{data['easy_switch_number']}"
+    else:
+        product_type = "unknown"
+        product_id = f"unknown_{data.get('tariff', 'product')}"
+
+    # Create contract if exists
+    contract = None
+    if "contract_start_date" in data or "price_per_month_eur" in data:
+        contract = Contract(
+            start_date=data.get("contract_start_date"),
+            price_per_month_eur=data.get("price_per_month_eur")
+        )
+
+    # Create usage if exists
+    usage = None
+    if "usage" in data:
+        usage = UsageData.from_dict(data["usage"])
+
+    return Product(
+        product_id=product_id,
+        product_type=product_type,
+        phone_number=data.get("phone_number"),
+        easy_switch_number=data.get("easy_switch_number"),
+        tariff=data.get("tariff"),
+        contract=contract,
+        usage=usage
+    )
@@ -0,0 +1,148 @@
+"""Scrape several accounts with one shared Chromium and an isolated context per account."""
+import asyncio
+import os
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List, Union, Iterable
+
+from .async_client import AsyncHeyTelecomClient
+from .models import AccountData
+from .session import load_storage_state, save_storage_state
+
+
+@dataclass
+class Account:
+    """Credentials and client options of one monitored account."""
+    name: str
+    email: Optional[str] = None
+    password: Optional[str] = None
+    options: Dict[str, Any] = field(default_factory=dict)
+
+
+class AccountPool:
+    """
+    Bounded worker pool scraping many accounts in a single browser process.
+
+    Every scrape gets a fresh BrowserContext, seeded with the account's
+    saved storage state (cookies and local storage) and saved back when it
+    is done, so accounts never share a session. Contexts only live while a
+    worker uses them, so memory grows with max_workers rather than with the
+    number of accounts.
+
+    Usage:
+        async with AccountPool([Account("home", "a@b.be", "..."), ...]) as pool:
+            results = await pool.fetch_all()
+    """
+
+    def __init__(self, accounts: Iterable[Account], max_workers: int = 2,
+                 state_dir: str = "hey_accounts", auto_install: bool = True, **client_kwargs):
+        """
+        Initialize the pool.
+
+        Args:
+            accounts: Accounts to scrape (names must be unique)
+            max_workers: Maximum number of accounts scraped at the same time
+            state_dir: Directory for the per-account storage state, token cache
+                and product state files
+            auto_install: Automatically install Playwright chromium if not found
+            **client_kwargs: AsyncHeyTelecomClient options shared by all accounts
+                (per-account Account.options take precedence)
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.accounts: Dict[str, Account] = {}
+        for account in accounts:
+            if account.name in self.accounts:
+                raise ValueError(f"Duplicate account name '{account.name}'")
+            self.accounts[account.name] = account
+        self.max_workers = max_workers
+        self.state_dir = state_dir
+        self.auto_install = auto_install
+        self.client_kwargs = client_kwargs
+        self._playwright = None
+        self._browser = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit."""
+        await self.close()
+
+    async def start(self):
+        """Launch the shared browser."""
+        if self.auto_install:
+            from .installer import ensure_playwright_installed
+            await asyncio.get_running_loop().run_in_executor(None, ensure_playwright_installed)
+        os.makedirs(self.state_dir, exist_ok=True)
+        from playwright.async_api import async_playwright
+
+        self._playwright = await async_playwright().start()
+        self._browser = await self._playwright.chromium.launch(headless=True)
+        self._semaphore = asyncio.Semaphore(self.max_workers)
+
+    async def close(self):
+        """Close the shared browser."""
+        if self._browser:
+            await self._browser.close()
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    def storage_state_path(self, name: str) -> str:
+        """File holding the saved session of an account."""
+        return os.path.join(self.state_dir, f"{name}.state.json")
+
+    async def fetch(self, name: str) -> AccountData:
+        """
+        Scrape one account, waiting for a free worker first.
+
+        Args:
+            name: Name of the account
+
+        Returns:
+            AccountData object with all information
+
+        Raises:
+            RuntimeError: If the pool was not started
+        """
+        if not self._browser:
+            raise RuntimeError("Pool not started. Call start() first.")
+        account = self.accounts[name]
+        state_path = self.storage_state_path(name)
+
+        async with self._semaphore:
+            context = await self._browser.new_context(
+                storage_state=load_storage_state(state_path)
+            )
+            options = {**self.client_kwargs, **account.options}
+            options.setdefault("user_data_dir", os.path.join(self.state_dir, name))
+            client = AsyncHeyTelecomClient(email=account.email, password=account.password,
+                                           auto_install=False, **options)
+            try:
+                await client.attach(context)
+                await client.login()
+                account_data = await client.get_account_data()
+                save_storage_state(await context.storage_state(), state_path)
+                return account_data
+            finally:
+                await client.close()
+                await context.close()
+
+    async def fetch_all(self, names: Optional[List[str]] = None
+                        ) -> Dict[str, Union[AccountData, Exception]]:
+        """
+        Scrape accounts concurrently, at most max_workers at a time.
+
+        Args:
+            names: Accounts to scrape (all by default)
+
+        Returns:
+            AccountData per account name, or the exception that account raised
+        """
+        names = list(names or self.accounts)
+        results = await asyncio.gather(*(self.fetch(name) for name in names), return_exceptions=True)
+        return dict(zip(names, results))
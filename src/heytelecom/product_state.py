@@ -0,0 +1,182 @@
+"""Per-product sync state, used to skip detail pages of products that did not change."""
+import hashlib
+import json
+import math
+import os
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Optional, Dict, Any, List
+
+from .scheduler import USAGE_SECTIONS
+
+# Re-fetch a product's usage at least this often, whatever its update history says
+DEFAULT_MAX_AGE = 6 * 3600
+# Assumed time between portal updates until it has been observed
+DEFAULT_UPDATE_INTERVAL = 3600
+
+
+def product_fingerprint(product_data: Dict[str, Any]) -> str:
+    """Hash the list page data of a product (everything but its usage)."""
+    listed = {key: value for key, value in product_data.items() if key != "usage"}
+    return hashlib.sha1(json.dumps(listed, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+def latest_usage_update(usage: Optional[Dict[str, Any]]) -> Optional[str]:
+    """Most recent last_update timestamp in a usage dictionary."""
+    timestamps = [
+        section["last_update"] for section in
+        ((usage or {}).get(name) for name in USAGE_SECTIONS)
+        if section and section.get("last_update")
+    ]
+    return max(timestamps) if timestamps else None
+
+
+@dataclass
+class ProductState:
+    """What was last fetched for a product and when."""
+    fingerprint: str
+    usage: Optional[Dict[str, Any]] = None
+    fetched_at: float = 0.0
+    update_times: List[str] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "fingerprint": self.fingerprint,
+            "usage": self.usage,
+            "fetched_at": self.fetched_at,
+            "update_times": self.update_times,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ProductState":
+        """Create from a dictionary produced by to_dict()."""
+        return cls(
+            fingerprint=data["fingerprint"],
+            usage=data.get("usage"),
+            fetched_at=float(data.get("fetched_at") or 0.0),
+            update_times=[str(t) for t in data.get("update_times") or []],
+        )
+
+    def update_interval(self) -> Optional[float]:
+        """Median time between the observed portal updates of this product, in seconds."""
+        times = [datetime.fromisoformat(t) for t in self.update_times]
+        gaps = [(b - a).total_seconds() for a, b in zip(times, times[1:])]
+        gaps = [gap for gap in gaps if gap > 0]
+        return median(gaps) if gaps else None
+
+    def expected_update(self, default_interval: float = DEFAULT_UPDATE_INTERVAL,
+                        after: Optional[float] = None) -> Optional[datetime]:
+        """
+        When the portal is expected to update this product's usage next.
+
+        Args:
+            default_interval: Interval to assume while fewer than two updates were observed
+            after: UNIX time the expectation must lie beyond; a fetch at that
+                time that found no newer update pushes it on by whole intervals
+        """
+        if not self.update_times:
+            return None
+        interval = self.update_interval() or default_interval
+        expected = datetime.fromisoformat(self.update_times[-1]) + timedelta(seconds=interval)
+        if after is not None:
+            behind = (datetime.fromtimestamp(after) - expected).total_seconds()
+            if behind >= 0:
+                expected += timedelta(seconds=interval * (math.floor(behind / interval) + 1))
+        return expected
+
+    def needs_refresh(self, fingerprint: str, max_age: float = DEFAULT_MAX_AGE,
+                      now: Optional[float] = None) -> bool:
+        """
+        Check whether the detail page has to be opened again.
+
+        True when the list entry changed, no usage is stored, the stored
+        usage is older than max_age, the billing period has ended or the
+        portal is expected to have updated the counters since the last fetch
+        (an expected update that the last fetch already looked for counts as
+        missed, and the next one an interval later is waited for). Dates that
+        cannot be parsed count as no state at all.
+        """
+        now = time.time() if now is None else now
+        if fingerprint != self.fingerprint or not self.usage:
+            return True
+        if now - self.fetched_at >= max_age:
+            return True
+        current = datetime.fromtimestamp(now)
+        try:
+            end = (self.usage.get("period") or {}).get("end")
+            if end and current >= datetime.fromisoformat(end) + timedelta(days=1):
+                return True
+            expected = self.expected_update(after=self.fetched_at)
+        except (TypeError, ValueError, AttributeError):
+            # A malformed date in the state file or on the page
+            return True
+        return expected is not None and current >= expected
+
+    def record(self, fingerprint: str, usage: Optional[Dict[str, Any]], history: int = 8,
+               now: Optional[float] = None):
+        """Store a freshly fetched usage dictionary."""
+        self.fingerprint = fingerprint
+        self.usage = usage
+        self.fetched_at = time.time() if now is None else now
+        latest = latest_usage_update(usage)
+        if latest and (not self.update_times or latest > self.update_times[-1]):
+            self.update_times = (self.update_times + [latest])[-history:]
+
+
+def product_state_path(user_data_dir: str) -> str:
+    """Return the product state file that sits next to the browser profile directory."""
+    user_data_dir = os.path.abspath(user_data_dir).rstrip(os.sep)
+    return f"{user_data_dir}.products.json"
+
+
+class ProductStateStore:
+    """JSON file holding a ProductState per product_id."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the store.
+
+        Args:
+            path: Location of the state file
+        """
+        self.path = path
+        self._states: Optional[Dict[str, ProductState]] = None
+
+    def _load(self) -> Dict[str, ProductState]:
+        if self._states is None:
+            try:
+                with open(self.path, "r") as f:
+                    self._states = {pid: ProductState.from_dict(state)
+                                    for pid, state in json.load(f).items()}
+            except (OSError, ValueError, KeyError, TypeError, AttributeError):
+                self._states = {}
+        return self._states
+
+    def get(self, product_id: str) -> Optional[ProductState]:
+        """Get the stored state of a product."""
+        return self._load().get(product_id)
+
+    def put(self, product_id: str, state: ProductState):
+        """Set the state of a product (call save() to persist)."""
+        self._load()[product_id] = state
+
+    def save(self):
+        """Write all states atomically."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({pid: state.to_dict() for pid, state in self._load().items()}, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove all states and the file."""
+        self._states = {}
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,392 @@
+"""Event-driven page readiness conditions used instead of fixed sleeps."""
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Optional, Callable, Union, List, Tuple, Any
+
+from . import extraction as ex
+from .interception import url_matcher
+
+# How often a wait with an abort_url checks whether the page left for it (milliseconds)
+ABORT_CHECK_INTERVAL = 250
+
+
+class ReadinessCondition(ABC):
+    """
+    A condition a page must meet before it is scraped.
+
+    Subclasses implement both a sync and an async wait so the same page
+    profiles serve HeyTelecomClient and AsyncHeyTelecomClient. Conditions
+    that depend on something happening during navigation (like a network
+    response) start listening in arm(), which runs before the navigation.
+    """
+
+    name = "condition"
+
+    def arm(self, page) -> Any:
+        """Start listening on the page before navigating; returns per-wait state."""
+        return None
+
+    def disarm(self, page, state: Any):
+        """Stop listening once the wait is over."""
+
+    @abstractmethod
+    def wait(self, page, state: Any, timeout: float) -> bool:
+        """Block until the condition holds or `timeout` milliseconds have passed."""
+
+    @abstractmethod
+    async def wait_async(self, page, state: Any, timeout: float) -> bool:
+        """Async version of wait()."""
+
+
+class FunctionReady(ReadinessCondition):
+    """Wait until a JavaScript predicate returns a truthy value (page.wait_for_function)."""
+
+    def __init__(self, expression: str, arg: Any = None, name: str = "function"):
+        self.expression = expression
+        self.arg = arg
+        self.name = name
+
+    def wait(self, page, state: Any, timeout: float) -> bool:
+        page.wait_for_function(self.expression, arg=self.arg, timeout=timeout)
+        return True
+
+    async def wait_async(self, page, state: Any, timeout: float) -> bool:
+        await page.wait_for_function(self.expression, arg=self.arg, timeout=timeout)
+        return True
+
+
+class SelectorReady(ReadinessCondition):
+    """Wait until a selector reaches the given state (page.wait_for_selector)."""
+
+    def __init__(self, selector: str, state: str = "attached", name: Optional[str] = None):
+        self.selector = selector
+        self.state = state
+        self.name = name or f"selector {selector}"
+
+    def wait(self, page, state: Any, timeout: float) -> bool:
+        page.wait_for_selector(self.selector, state=self.state, timeout=timeout)
+        return True
+
+    async def wait_async(self, page, state: Any, timeout: float) -> bool:
+        await page.wait_for_selector(self.selector, state=self.state, timeout=timeout)
+        return True
+
+
+class ResponseReady(ReadinessCondition):
+    """
+    Wait until a network response matching the URL predicate has finished.
+
+    Args:
+        url: Substring, compiled regex or callable taking the response URL
+        ok_only: Only accept 2xx/3xx responses
+    """
+
+    def __init__(self, url: Union[str, "re.Pattern", Callable[[str], bool]], ok_only: bool = True,
+                 name: Optional[str] = None):
+        self.url = url
+        self.ok_only = ok_only
+        self.name = name or f"response {url}"
+
+    def matches(self, response) -> bool:
+        """Check whether a Playwright response satisfies the condition."""
+        if self.ok_only and response.status >= 400:
+            return False
+        if callable(self.url):
+            return bool(self.url(response.url))
+        if isinstance(self.url, str):
+            return self.url in response.url
+        return bool(self.url.search(response.url))
+
+    def arm(self, page) -> Any:
+        seen: List[Any] = []
+
+        def on_response(response):
+            if self.matches(response):
+                seen.append(response)
+
+        page.on("response", on_response)
+        return seen, on_response
+
+    def disarm(self, page, state: Any):
+        page.remove_listener("response", state[1])
+
+    def wait(self, page, state: Any, timeout: float) -> bool:
+        if not state[0]:
+            page.wait_for_event("response", predicate=self.matches, timeout=timeout)
+        return True
+
+    async def wait_async(self, page, state: Any, timeout: float) -> bool:
+        if not state[0]:
+            await page.wait_for_event("response", predicate=self.matches, timeout=timeout)
+        return True
+
+
+# Resolves as soon as no element matches the selector. A MutationObserver
+# re-checks on every DOM change, so there is no polling interval and no
+# minimum delay; the promise resolves false when the timeout is reached.
+_ABSENT_SCRIPT = """([selector, timeout]) => new Promise((resolve) => {
+    let timer = null;
+    const observer = new MutationObserver(() => {
+        if (!document.querySelector(selector)) done(true);
+    });
+    const done = (result) => {
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(result);
+    };
+    if (!document.querySelector(selector)) return done(true);
+    timer = setTimeout(() => done(false), timeout);
+    observer.observe(document.documentElement, {childList: true, subtree: true, attributes: true});
+})"""
+
+
+class SpinnerGone(ReadinessCondition):
+    """Wait until no loading spinner is left in the DOM, using a MutationObserver."""
+
+    def __init__(self, selector: str = ex.SPINNER, name: str = "spinners gone"):
+        self.selector = selector
+        self.name = name
+
+    def wait(self, page, state: Any, timeout: float) -> bool:
+        return bool(page.evaluate(_ABSENT_SCRIPT, [self.selector, timeout]))
+
+    async def wait_async(self, page, state: Any, timeout: float) -> bool:
+        return bool(await page.evaluate(_ABSENT_SCRIPT, [self.selector, timeout]))
+
+
+class AnyReady(ReadinessCondition):
+    """
+    Ready as soon as any of several conditions holds.
+
+    Playwright cannot wait for two things at once from one thread, so the
+    conditions take turns, each waited for at most `interval` milliseconds.
+    """
+
+    def __init__(self, *conditions: ReadinessCondition, interval: float = 100, name: Optional[str] = None):
+        self.conditions = list(conditions)
+        self.interval = interval
+        self.name = name or " or ".join(condition.name for condition in conditions)
+
+    def arm(self, page) -> Any:
+        return [condition.arm(page) for condition in self.conditions]
+
+    def disarm(self, page, state: Any):
+        for condition, substate in zip(self.conditions, state):
+            condition.disarm(page, substate)
+
+    def wait(self, page, state: Any, timeout: float) -> bool:
+        deadline = time.perf_counter() + timeout / 1000
+        while True:
+            for condition, substate in zip(self.conditions, state):
+                remaining = (deadline - time.perf_counter()) * 1000
+                if remaining <= 0:
+                    return False
+                try:
+                    if condition.wait(page, substate, min(remaining, self.interval)):
+                        return True
+                except Exception:
+                    pass
+
+    async def wait_async(self, page, state: Any, timeout: float) -> bool:
+        deadline = time.perf_counter() + timeout / 1000
+        while True:
+            for condition, substate in zip(self.conditions, state):
+                remaining = (deadline - time.perf_counter()) * 1000
+                if remaining <= 0:
+                    return False
+                try:
+                    if await condition.wait_async(page, substate, min(remaining, self.interval)):
+                        return True
+                except Exception:
+                    pass
+
+
+@dataclass
+class ReadinessResult:
+    """Outcome of waiting for a page: whether it became ready and how long it took."""
+    name: str
+    ready: bool
+    waited: float
+    conditions: List[Tuple[str, float, bool]] = field(default_factory=list)
+    # Set when the wait ended because the page navigated to the abort_url
+    aborted: bool = False
+
+
+class ArmedReadiness:
+    """
+    A Readiness bound to a page, listening since before the navigation started.
+
+    With an abort_url, every condition is waited for in slices of
+    ABORT_CHECK_INTERVAL, and the wait gives up as soon as the page URL
+    starts with abort_url (a client-side redirect to the login portal).
+    """
+
+    def __init__(self, readiness: "Readiness", page, abort_url: Optional[str] = None):
+        self.readiness = readiness
+        self.page = page
+        self.abort_url = abort_url
+        self.aborted = False
+        self.started = time.perf_counter()
+        self.states = [condition.arm(page) for condition in readiness.conditions]
+
+    def _finish(self, timings: List[Tuple[str, float, bool]]) -> ReadinessResult:
+        for condition, state in zip(self.readiness.conditions, self.states):
+            condition.disarm(self.page, state)
+        return ReadinessResult(
+            name=self.readiness.name,
+            ready=all(ok for _, _, ok in timings),
+            waited=time.perf_counter() - self.started,
+            conditions=timings,
+            aborted=self.aborted,
+        )
+
+    def cancel(self) -> ReadinessResult:
+        """Stop listening without waiting, e.g. when the page was redirected elsewhere."""
+        return self._finish([])
+
+    def _remaining(self) -> float:
+        elapsed = (time.perf_counter() - self.started) * 1000
+        return max(self.readiness.timeout - elapsed, 1)
+
+    def _redirected(self) -> bool:
+        if self.abort_url and self.page.url.startswith(self.abort_url):
+            self.aborted = True
+        return self.aborted
+
+    def _wait_condition(self, condition: ReadinessCondition, state: Any) -> bool:
+        if not self.abort_url:
+            return condition.wait(self.page, state, self._remaining())
+        while not self._redirected():
+            remaining = self._remaining()
+            try:
+                if condition.wait(self.page, state, min(remaining, ABORT_CHECK_INTERVAL)):
+                    return True
+            except Exception:
+                if remaining <= ABORT_CHECK_INTERVAL:
+                    raise
+            if remaining <= ABORT_CHECK_INTERVAL:
+                return False
+        return False
+
+    async def _wait_condition_async(self, condition: ReadinessCondition, state: Any) -> bool:
+        if not self.abort_url:
+            return await condition.wait_async(self.page, state, self._remaining())
+        while not self._redirected():
+            remaining = self._remaining()
+            try:
+                if await condition.wait_async(self.page, state, min(remaining, ABORT_CHECK_INTERVAL)):
+                    return True
+            except Exception:
+                if remaining <= ABORT_CHECK_INTERVAL:
+                    raise
+            if remaining <= ABORT_CHECK_INTERVAL:
+                return False
+        return False
+
+    def wait(self) -> ReadinessResult:
+        """Wait for all conditions in order; a timed out condition marks the page not ready."""
+        timings = []
+        for condition, state in zip(self.readiness.conditions, self.states):
+            start = time.perf_counter()
+            try:
+                ok = self._wait_condition(condition, state)
+            except Exception:
+                ok = False
+            timings.append((condition.name, time.perf_counter() - start, ok))
+            if not ok:
+                break
+        return self._finish(timings)
+
+    async def wait_async(self) -> ReadinessResult:
+        """Async version of wait()."""
+        timings = []
+        for condition, state in zip(self.readiness.conditions, self.states):
+            start = time.perf_counter()
+            try:
+                ok = await self._wait_condition_async(condition, state)
+            except Exception:
+                ok = False
+            timings.append((condition.name, time.perf_counter() - start, ok))
+            if not ok:
+                break
+        return self._finish(timings)
+
+
+class Readiness:
+    """
+    A named set of conditions that together mean "this page is ready".
+
+    Usage:
+        armed = PRODUCTS_READY.arm(page)
+        page.goto(url)
+        result = armed.wait()
+    """
+
+    def __init__(self, name: str, *conditions: ReadinessCondition, timeout: float = 30000):
+        self.name = name
+        self.conditions = list(conditions)
+        self.timeout = timeout
+
+    def arm(self, page, abort_url: Optional[str] = None) -> ArmedReadiness:
+        """
+        Bind to a page and start listening for events.
+
+        Args:
+            page: Page that is about to navigate
+            abort_url: Stop waiting (not ready, result.aborted) once the page URL starts with this
+        """
+        return ArmedReadiness(self, page, abort_url)
+
+
+_LOGIN_STATE_SCRIPT = """(s) => location.href.startsWith(s.authUrl)
+    || Array.from(document.querySelectorAll(s.menu)).some((el) => el.textContent.includes(s.label))"""
+
+_LOGIN_RESULT_SCRIPT = """(s) => Array.from(document.querySelectorAll(s.menu)).some((el) => el.textContent.includes(s.label))
+    || Array.from(document.querySelectorAll(s.error)).some((el) => el.textContent.includes(s.errorText))"""
+
+
+def login_state_ready(auth_url: str) -> Readiness:
+    """Ready once the app either shows the account menu or has redirected to the auth host."""
+    arg = {"authUrl": auth_url, "menu": ex.LOGGED_IN_MENU_ITEM, "label": ex.LOGGED_IN_LABEL}
+    return Readiness("login state", FunctionReady(_LOGIN_STATE_SCRIPT, arg, name="menu or auth page"),
+                     SpinnerGone())
+
+
+LOGIN_FORM_READY = Readiness("login form", SelectorReady(ex.LOGIN_EMAIL_INPUT, state="visible"),
+                             timeout=10000)
+
+LOGIN_RESULT_READY = Readiness("login result", FunctionReady(
+    _LOGIN_RESULT_SCRIPT,
+    {"menu": ex.LOGGED_IN_MENU_ITEM, "label": ex.LOGGED_IN_LABEL,
+     "error": ex.LOGIN_ERROR_BOX, "errorText": ex.LOGIN_ERROR_TEXT},
+    name="account menu or error",
+), SpinnerGone())
+
+PRODUCTS_READY = Readiness("products", SelectorReady(ex.PRODUCT_ITEM), SpinnerGone())
+
+USAGE_READY = Readiness(
+    "usage",
+    FunctionReady(f"() => location.href.includes('{ex.USAGE_PATH_MARKER}')", name="usage url"),
+    SelectorReady(", ".join([ex.USAGE_DATE_RANGE, *ex.USAGE_BLOCKS.values()]), name="usage blocks"),
+    SpinnerGone(),
+)
+
+INVOICE_READY = Readiness("invoice", SelectorReady(ex.INVOICE_SECTION), SpinnerGone(), timeout=10000)
+
+
+def payload_ready(kind: str, api_host: Optional[str] = None, dom: Optional[Readiness] = None) -> Readiness:
+    """
+    Ready once the ecare app has received the JSON payload of the given kind.
+
+    The URL patterns of the payloads are guessed, so with a `dom` profile
+    the wait races the payload against that profile's selectors: once the
+    page has rendered, a payload that has not arrived is not coming, and
+    the caller falls back to the page instead of waiting for the timeout.
+    """
+    payload = ResponseReady(url_matcher(kind, api_host), name=f"{kind} json")
+    selectors = [condition for condition in (dom.conditions if dom else []) if isinstance(condition, SelectorReady)]
+    if not selectors:
+        return Readiness(f"{kind} response", payload, timeout=10000)
+    return Readiness(f"{kind} response", AnyReady(payload, *selectors), timeout=dom.timeout)
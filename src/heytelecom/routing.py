@@ -0,0 +1,194 @@
+"""Request routing profiles that keep non-essential resources out of scraping sessions."""
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, Tuple, FrozenSet, Union, Iterable
+from urllib.parse import urlsplit
+
+
+# Third-party hosts the ecare app loads that are never needed for scraping:
+# the OneTrust cookie banner, analytics, tag managers and ad pixels
+TRACKING_HOSTS = (
+    "cookielaw.org",
+    "onetrust.com",
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "facebook.net",
+    "facebook.com",
+    "hotjar.com",
+    "clarity.ms",
+    "bing.com",
+)
+
+
+def _host_matches(host: str, suffixes: Tuple[str, ...]) -> bool:
+    return any(host == suffix or host.endswith(f".{suffix}") for suffix in suffixes)
+
+
+def first_party_hosts(urls: Iterable[Optional[str]]) -> Tuple[str, ...]:
+    """
+    Host suffixes that count as first party for the given portal URLs.
+
+    A host like ecare.heytelecom.be contributes its parent domain, so the
+    sibling hosts of the app (api., openid., ...) are covered too; IP
+    addresses and single-label hosts (a local fixture portal) are kept as is.
+    """
+    hosts = []
+    for url in urls:
+        host = urlsplit(url).hostname if url and "//" in url else url
+        if not host:
+            continue
+        labels = host.split(".")
+        if len(labels) > 2 and not host.replace(".", "").isdigit():
+            host = ".".join(labels[1:])
+        if host not in hosts:
+            hosts.append(host)
+    return tuple(hosts)
+
+
+@dataclass(frozen=True)
+class RoutingProfile:
+    """
+    Which requests a scraping session aborts.
+
+    Args:
+        name: Profile name
+        resource_types: Playwright resource types to abort (image, font, ...)
+        blocked_hosts: Host suffixes to abort
+        first_party_only: Abort every host outside the portal's own (see first_party_hosts)
+    """
+    name: str
+    resource_types: FrozenSet[str] = frozenset()
+    blocked_hosts: Tuple[str, ...] = ()
+    first_party_only: bool = False
+
+    def blocks(self, resource_type: str, url: str, first_party: Tuple[str, ...] = ()) -> bool:
+        """
+        Check whether a request should be aborted.
+
+        Args:
+            resource_type: Playwright resource type of the request
+            url: Request URL
+            first_party: Host suffixes of the portal, for first_party_only profiles
+        """
+        if resource_type in self.resource_types:
+            return True
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https"):
+            return False
+        host = parts.hostname or ""
+        if _host_matches(host, self.blocked_hosts):
+            return True
+        return self.first_party_only and not _host_matches(host, first_party)
+
+
+PROFILES = {
+    # Images, media and fonts, plus the cookie banner and tracking scripts
+    "standard": RoutingProfile(
+        "standard",
+        resource_types=frozenset({"image", "media", "font"}),
+        blocked_hosts=TRACKING_HOSTS,
+    ),
+    # Additionally drop stylesheets and everything not served by hey! itself
+    "strict": RoutingProfile(
+        "strict",
+        resource_types=frozenset({"image", "media", "font", "stylesheet", "manifest", "other"}),
+        blocked_hosts=TRACKING_HOSTS,
+        first_party_only=True,
+    ),
+}
+
+
+def resolve_profile(profile: Union[str, RoutingProfile]) -> RoutingProfile:
+    """Look up a built-in profile by name, or pass a custom RoutingProfile through."""
+    if isinstance(profile, RoutingProfile):
+        return profile
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown routing profile '{profile}', expected one of {tuple(PROFILES)}")
+    return PROFILES[profile]
+
+
+@dataclass
+class RoutingStats:
+    """Requests seen by a RequestRouter during a session."""
+    requests: int = 0
+    blocked: int = 0
+    loaded_bytes: int = 0
+    # Only known in dry-run mode, where "blocked" responses are still loaded
+    blocked_bytes: int = 0
+    blocked_by_type: Dict[str, int] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "requests": self.requests,
+            "blocked": self.blocked,
+            "loaded_bytes": self.loaded_bytes,
+            "blocked_bytes": self.blocked_bytes,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
+
+
+class RequestRouter:
+    """
+    Route handler aborting the requests a RoutingProfile does not need.
+
+    Installed on the browser context with context.route("**/*", ...), so
+    it covers every tab. Blocked requests fail before they leave the
+    browser, so their size is unknown; run once with dry_run=True to
+    measure how many bytes a profile would save.
+
+    Note:
+        Playwright disables the browser's HTTP cache while routing is active.
+    """
+
+    def __init__(self, profile: Union[str, RoutingProfile] = "standard", dry_run: bool = False,
+                 first_party: Tuple[str, ...] = ("heytelecom.be",)):
+        """
+        Initialize the router.
+
+        Args:
+            profile: Built-in profile name or a custom RoutingProfile
+            dry_run: Count what would be blocked, but let every request through
+            first_party: Host suffixes of the portal (the clients pass first_party_hosts()
+                of their own URLs, so overridden base_url/auth_url stay reachable)
+        """
+        self.profile = resolve_profile(profile)
+        self.dry_run = dry_run
+        self.first_party = tuple(first_party)
+        self.stats = RoutingStats()
+
+    def _check(self, request) -> bool:
+        self.stats.requests += 1
+        if not self.profile.blocks(request.resource_type, request.url, self.first_party):
+            return False
+        self.stats.blocked += 1
+        by_type = self.stats.blocked_by_type
+        by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+        return not self.dry_run
+
+    def handle(self, route):
+        """Route handler for the sync API."""
+        if self._check(route.request):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+
+    async def handle_async(self, route):
+        """Route handler for the async API."""
+        if self._check(route.request):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+
+    def on_response(self, response):
+        """Response listener adding the transferred size to the stats."""
+        try:
+            size = int(response.headers.get("content-length", 0))
+        except ValueError:
+            return
+        request = response.request
+        if self.dry_run and self.profile.blocks(request.resource_type, request.url, self.first_party):
+            self.stats.blocked_bytes += size
+        else:
+            self.stats.loaded_bytes += size
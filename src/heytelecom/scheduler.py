@@ -0,0 +1,166 @@
+"""Adaptive polling schedule learned from the portal's "Laatste update" timestamps."""
+from datetime import datetime, timedelta
+from statistics import median
+from typing import Optional, Dict, Any, List, Union
+
+from .models import AccountData
+from .parsers import LAST_UPDATE_TOLERANCE
+
+USAGE_SECTIONS = ("data", "calls", "sms_mms")
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value[:19])
+    except ValueError:
+        return None
+
+
+def usage_timestamps(account: Union[AccountData, Dict[str, Any]]) -> List[datetime]:
+    """
+    Collect the last_update timestamps of all usage sections of an account.
+
+    Args:
+        account: AccountData or its to_dict() output
+    """
+    if isinstance(account, AccountData):
+        account = account.to_dict()
+    timestamps = []
+    for product in account.get("products", []):
+        usage = product.get("usage") or {}
+        for section in USAGE_SECTIONS:
+            timestamp = _parse_timestamp((usage.get(section) or {}).get("last_update"))
+            if timestamp:
+                timestamps.append(timestamp)
+    return timestamps
+
+
+def period_end(account: Union[AccountData, Dict[str, Any]]) -> Optional[datetime]:
+    """Earliest end of the current billing period over all products (end of that day)."""
+    if isinstance(account, AccountData):
+        account = account.to_dict()
+    ends = []
+    for product in account.get("products", []):
+        end = ((product.get("usage") or {}).get("period") or {}).get("end")
+        if end:
+            try:
+                ends.append(datetime.fromisoformat(end) + timedelta(days=1))
+            except ValueError:
+                continue
+    return min(ends) if ends else None
+
+
+class RefreshScheduler:
+    """
+    Decide when to poll next, based on when the portal actually updates.
+
+    The portal refreshes its usage counters periodically and shows when it
+    last did so. The scheduler records every new timestamp, learns the
+    typical interval between them and schedules the next poll just after
+    the expected next update. Polls that bring nothing new back off
+    exponentially, and polling tightens up close to the end of the
+    billing period, when the remaining allowance matters most.
+    """
+
+    def __init__(self, min_interval: float = 300, max_interval: float = 6 * 3600,
+                 default_interval: float = 3600, margin: float = 120, backoff: float = 2.0,
+                 period_end_window: float = 2 * 86400, period_end_interval: float = 900,
+                 history: int = 16):
+        """
+        Initialize the scheduler.
+
+        Args:
+            min_interval: Never poll more often than this (seconds)
+            max_interval: Never wait longer than this between polls (seconds)
+            default_interval: Poll interval until an update interval has been learned
+            margin: How long after the expected update to poll (seconds)
+            backoff: Growth factor of the delay for every poll that brought nothing new
+            period_end_window: How close to the end of the billing period polling tightens (seconds)
+            period_end_interval: Maximum poll interval inside that window (seconds)
+            history: Number of update timestamps kept to learn the interval
+        """
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.default_interval = default_interval
+        self.margin = margin
+        self.backoff = backoff
+        self.period_end_window = period_end_window
+        self.period_end_interval = period_end_interval
+        self.history = history
+        self.updates: List[datetime] = []
+        self.misses = 0
+        self.period_end: Optional[datetime] = None
+
+    @property
+    def last_update(self) -> Optional[datetime]:
+        """Most recent update timestamp seen on the portal."""
+        return self.updates[-1] if self.updates else None
+
+    def update_interval(self) -> Optional[float]:
+        """Learned interval between portal updates in seconds, or None if unknown."""
+        gaps = [(b - a).total_seconds() for a, b in zip(self.updates, self.updates[1:])]
+        gaps = [gap for gap in gaps if gap > 0]
+        return median(gaps) if gaps else None
+
+    def observe(self, account: Union[AccountData, Dict[str, Any], None],
+                now: Optional[datetime] = None) -> bool:
+        """
+        Record the result of a poll.
+
+        Timestamps later than now (plus LAST_UPDATE_TOLERANCE for time zone
+        skew) are ignored: a misparsed stamp would otherwise become the last
+        update and make every real update look old.
+
+        Args:
+            account: The fetched AccountData (or its to_dict() output); None for a failed poll
+            now: Current time (defaults to datetime.now())
+
+        Returns:
+            True if the portal had updated since the previous poll
+        """
+        if account is None:
+            self.misses += 1
+            return False
+        self.period_end = period_end(account) or self.period_end
+        limit = (now or datetime.now()) + LAST_UPDATE_TOLERANCE
+        timestamps = [t for t in usage_timestamps(account) if t <= limit]
+        latest = max(timestamps) if timestamps else None
+        if latest is None or (self.last_update and latest <= self.last_update):
+            self.misses += 1
+            return False
+        self.updates = (self.updates + [latest])[-self.history:]
+        self.misses = 0
+        return True
+
+    def _backoff_delay(self) -> float:
+        """min_interval grown by backoff per miss, stopping once it reaches max_interval."""
+        delay = self.min_interval
+        # Multiplying step by step instead of backoff ** misses cannot overflow after many misses
+        for _ in range(self.misses):
+            if delay >= self.max_interval or self.backoff <= 1:
+                break
+            delay *= self.backoff
+        return delay
+
+    def next_delay(self, now: Optional[datetime] = None) -> float:
+        """Seconds to wait before the next poll."""
+        now = now or datetime.now()
+        interval = self.update_interval()
+        if interval is None or self.last_update is None:
+            delay = self.default_interval
+        else:
+            # Just after the next expected update that is still ahead of us
+            target = self.last_update + timedelta(seconds=interval + self.margin)
+            while target <= now:
+                target += timedelta(seconds=interval)
+            delay = (target - now).total_seconds()
+
+        if self.misses:
+            delay = max(delay, self._backoff_delay())
+
+        if self.period_end and 0 <= (self.period_end - now).total_seconds() <= self.period_end_window:
+            delay = min(delay, self.period_end_interval)
+
+        return min(max(delay, self.min_interval), self.max_interval)
@@ -0,0 +1,145 @@
+"""Portal sessions: navigation-free validity checks and saved storage_state files."""
+import json
+import os
+import re
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlsplit
+
+from .tokens import token_expiry
+
+
+# Cookies that say nothing about being logged in: the OneTrust consent
+# banner and analytics set these on .heytelecom.be for anonymous visitors too
+IGNORED_COOKIE_PREFIXES = (
+    "OptanonConsent",
+    "OptanonAlertBoxClosed",
+    "_ga",
+    "_gid",
+    "_gcl",
+    "_fbp",
+    "_hj",
+    "_clck",
+    "_clsk",
+)
+
+# A JWT anywhere inside a localStorage value (OIDC libraries store JSON blobs)
+_JWT = re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]*")
+
+
+@dataclass
+class SessionCheck:
+    """
+    Outcome of inspecting a context's storage for a portal session.
+
+    Args:
+        valid: Whether the session looks usable without logging in
+        reason: What decided it ("token", "cookies", "token expired", "no session")
+        expires_at: When the deciding token or cookie expires (None for browser-session cookies)
+    """
+    valid: bool
+    reason: str
+    expires_at: Optional[float] = None
+
+
+def _host_matches(host: str, domain: str) -> bool:
+    domain = domain.lstrip(".")
+    return host == domain or host.endswith(f".{domain}")
+
+
+def _session_cookies(cookies: List[Dict[str, Any]], hosts: List[str], now: float) -> List[Dict[str, Any]]:
+    """Unexpired, non-tracking cookies sent to any of the given hosts."""
+    return [
+        cookie for cookie in cookies
+        if any(_host_matches(host, cookie.get("domain", "")) for host in hosts)
+        and not cookie.get("name", "").startswith(IGNORED_COOKIE_PREFIXES)
+        and (cookie.get("expires", -1) in (-1, None) or cookie["expires"] > now)
+    ]
+
+
+def _stored_token_expiry(origins: List[Dict[str, Any]], hosts: List[str]) -> Optional[float]:
+    """Latest `exp` of the JWTs kept in the localStorage of the given hosts."""
+    latest = None
+    for origin in origins:
+        if urlsplit(origin.get("origin", "")).hostname not in hosts:
+            continue
+        for item in origin.get("localStorage", []):
+            for token in _JWT.findall(item.get("value", "")):
+                expiry = token_expiry(token)
+                if expiry is not None and (latest is None or expiry > latest):
+                    latest = expiry
+    return latest
+
+
+def check_session(storage_state: Dict[str, Any], base_url: str, auth_url: str,
+                  margin: float = 60.0, now: Optional[float] = None) -> SessionCheck:
+    """
+    Decide from a context's storage_state whether the portal session is still usable.
+
+    Tokens in localStorage win over cookies: if the ecare app keeps a JWT,
+    its `exp` claim decides. Otherwise any unexpired, non-tracking cookie
+    for the ecare or auth host counts as a session. The check can be
+    wrong (the server may have revoked the session), so callers still
+    handle a redirect to the login page.
+
+    Args:
+        storage_state: Result of BrowserContext.storage_state()
+        base_url: ecare portal URL
+        auth_url: Login portal URL
+        margin: Seconds a token must still be valid for
+        now: Current UNIX time (defaults to time.time())
+
+    Returns:
+        SessionCheck
+    """
+    now = time.time() if now is None else now
+    hosts = [urlsplit(base_url).hostname, urlsplit(auth_url).hostname]
+
+    expiry = _stored_token_expiry(storage_state.get("origins", []), hosts)
+    if expiry is not None:
+        if expiry > now + margin:
+            return SessionCheck(True, "token", expiry)
+        return SessionCheck(False, "token expired", expiry)
+
+    cookies = _session_cookies(storage_state.get("cookies", []), hosts, now + margin)
+    if cookies:
+        expiries = [c["expires"] for c in cookies if c.get("expires", -1) not in (-1, None)]
+        # Browser-session cookies live as long as the context
+        expires_at = max(expiries) if len(expiries) == len(cookies) else None
+        return SessionCheck(True, "cookies", expires_at)
+    return SessionCheck(False, "no session")
+
+
+def storage_state_path(user_data_dir: str) -> str:
+    """Return the storage_state file that sits next to the browser profile directory."""
+    user_data_dir = os.path.abspath(user_data_dir).rstrip(os.sep)
+    return f"{user_data_dir}.state.json"
+
+
+def load_storage_state(path: str) -> Optional[Dict[str, Any]]:
+    """Load a saved storage_state, or None if missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if isinstance(state, dict) else None
+
+
+def save_storage_state(state: Dict[str, Any], path: str):
+    """
+    Write a storage_state atomically with owner-only permissions.
+
+    Readers always see a complete file, so several processes or contexts
+    can start from the same session while it is being refreshed.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    # The state holds session cookies
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "w") as f:
+        json.dump(state, f)
+    os.replace(tmp_path, path)
@@ -0,0 +1,160 @@
+"""Request coalescing: concurrent callers for the same key share one in-flight call."""
+import asyncio
+import os
+import threading
+from typing import Optional, Dict, Any, Callable, Hashable, Awaitable
+
+from .models import AccountData
+
+
+class _Call:
+    """An in-flight call and the outcome its waiters are blocked on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    Thread-safe single-flight group.
+
+    The first caller for a key runs the function; callers arriving while
+    it runs wait for it and receive the same result (or exception)
+    instead of starting their own call.
+
+    Usage:
+        flight = SingleFlight()
+        data = flight.do(account_key(user_data_dir), client.get_account_data)
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        # Number of calls that were answered by another caller's result
+        self.shared = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for the key is currently running."""
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs), or wait for the call already running for the key.
+
+        Raises:
+            Whatever the shared call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+
+class AsyncSingleFlight:
+    """
+    Single-flight group for coroutines on one event loop.
+
+    A caller that is cancelled does not cancel the shared call for the
+    other waiters.
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.shared = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for the key is currently running."""
+        return key in self._calls
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        """Await fn(*args, **kwargs), or join the call already running for the key."""
+        future = self._calls.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn(*args, **kwargs))
+            self._calls[key] = future
+            future.add_done_callback(lambda _: self._calls.pop(key, None))
+        else:
+            self.shared += 1
+        return await asyncio.shield(future)
+
+
+def account_key(user_data_dir: str) -> str:
+    """
+    Key identifying an account for coalescing.
+
+    Chromium locks the profile directory, so the browser profile is what
+    concurrent scrapes must not share; it is used as the account identity.
+    """
+    return os.path.realpath(os.path.abspath(user_data_dir))
+
+
+_accounts = SingleFlight()
+_async_accounts = AsyncSingleFlight()
+
+
+def fetch_account_data(email: Optional[str] = None, password: Optional[str] = None,
+                       user_data_dir: str = "hey_browser_data", **client_kwargs) -> AccountData:
+    """
+    Log in and get the account data, sharing the scrape with concurrent callers.
+
+    Concurrent calls for the same user_data_dir launch a single browser and
+    all receive the same AccountData object.
+
+    Args:
+        email: Email address for login
+        password: Password for login
+        user_data_dir: Directory to store browser session data
+        **client_kwargs: Further HeyTelecomClient options
+
+    Returns:
+        AccountData object with all information
+    """
+    def fetch() -> AccountData:
+        from .client import HeyTelecomClient
+        with HeyTelecomClient(email=email, password=password, user_data_dir=user_data_dir,
+                              **client_kwargs) as client:
+            if email and password:
+                client.login()
+            return client.get_account_data()
+
+    return _accounts.do(account_key(user_data_dir), fetch)
+
+
+async def fetch_account_data_async(email: Optional[str] = None, password: Optional[str] = None,
+                                   user_data_dir: str = "hey_browser_data",
+                                   **client_kwargs) -> AccountData:
+    """Async version of fetch_account_data(), built on AsyncHeyTelecomClient."""
+    async def fetch() -> AccountData:
+        from .async_client import AsyncHeyTelecomClient
+        async with AsyncHeyTelecomClient(email=email, password=password, user_data_dir=user_data_dir,
+                                         **client_kwargs) as client:
+            if email and password:
+                await client.login()
+            return await client.get_account_data()
+
+    return await _async_accounts.do(account_key(user_data_dir), fetch)
@@ -0,0 +1,143 @@
+"""Capture and on-disk caching of the API credentials used by the ecare app."""
+import base64
+import json
+import os
+import time
+from dataclasses import dataclass
+from typing import Optional, Dict, Any
+from urllib.parse import urlsplit
+
+
+# Fallback lifetime when the Bearer token is not a decodable JWT
+DEFAULT_TOKEN_LIFETIME = 300
+
+
+@dataclass
+class ApiCredentials:
+    """Bearer token and x-api-key captured from the ecare app."""
+    access_token: str
+    api_key: str
+    expires_at: Optional[float] = None
+    captured_at: Optional[float] = None
+    refresh_token: Optional[str] = None
+
+    def is_valid(self, margin: float = 60.0) -> bool:
+        """Check whether the token is still usable for at least `margin` seconds."""
+        if self.expires_at is None:
+            return True
+        return time.time() + margin < self.expires_at
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to dictionary."""
+        return {
+            "access_token": self.access_token,
+            "api_key": self.api_key,
+            "expires_at": self.expires_at,
+            "captured_at": self.captured_at,
+            "refresh_token": self.refresh_token,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ApiCredentials":
+        """Create credentials from a dictionary produced by to_dict()."""
+        return cls(
+            access_token=data["access_token"],
+            api_key=data["api_key"],
+            expires_at=data.get("expires_at"),
+            captured_at=data.get("captured_at"),
+            refresh_token=data.get("refresh_token"),
+        )
+
+
+def token_expiry(access_token: str) -> Optional[float]:
+    """
+    Read the `exp` claim of a JWT access token without verifying it.
+
+    Returns:
+        Expiry as a UNIX timestamp, or None if the token is not a JWT
+    """
+    parts = access_token.split(".")
+    if len(parts) != 3:
+        return None
+    try:
+        payload = parts[1] + "=" * (-len(parts[1]) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(payload.encode("ascii")))
+        exp = claims.get("exp")
+        return float(exp) if exp is not None else None
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def credentials_from_headers(url: str, headers: Dict[str, str],
+                             api_host: str = "api.heytelecom.be") -> Optional[ApiCredentials]:
+    """
+    Extract API credentials from the headers of an outgoing request.
+
+    Args:
+        url: Request URL
+        headers: Request headers (lower-cased names, as reported by Playwright)
+        api_host: Only requests to this host are considered
+
+    Returns:
+        ApiCredentials or None if the request does not carry both headers
+    """
+    if urlsplit(url).hostname != api_host:
+        return None
+    authorization = headers.get("authorization", "")
+    api_key = headers.get("x-api-key")
+    if not api_key or not authorization.lower().startswith("bearer "):
+        return None
+    access_token = authorization[7:].strip()
+    now = time.time()
+    expires_at = token_expiry(access_token)
+    return ApiCredentials(
+        access_token=access_token,
+        api_key=api_key,
+        expires_at=expires_at if expires_at is not None else now + DEFAULT_TOKEN_LIFETIME,
+        captured_at=now,
+    )
+
+
+def token_cache_path(user_data_dir: str) -> str:
+    """Return the token cache file that sits next to the browser profile directory."""
+    user_data_dir = os.path.abspath(user_data_dir).rstrip(os.sep)
+    return f"{user_data_dir}.tokens.json"
+
+
+class TokenCache:
+    """JSON file holding the last captured ApiCredentials."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the cache.
+
+        Args:
+            path: Location of the cache file
+        """
+        self.path = path
+
+    def load(self) -> Optional[ApiCredentials]:
+        """Load cached credentials, or None if missing or unreadable."""
+        try:
+            with open(self.path, "r") as f:
+                return ApiCredentials.from_dict(json.load(f))
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, credentials: ApiCredentials):
+        """Write credentials atomically with owner-only permissions."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w") as f:
+            json.dump(credentials.to_dict(), f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        """Remove the cache file."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
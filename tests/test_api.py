@@ -0,0 +1,131 @@
+import gzip
+import json
+import socket
+
+import pytest
+
+from heytelecom.api import (
+    ApiError, AuthenticationError, HeyTelecomApi, HttpTransport,
+    invoice_from_json, products_from_inventory, usage_from_json,
+)
+
+
+INVENTORY = {
+    "products": [
+        {
+            "msisdn": "0470 12 34 56",
+            "tariffName": "FLEX 10",
+            "contractStartDate": "2024-04-04T00:00:00Z",
+            "price": {"value": 15},
+            "usage": {
+                "period": {"startDate": "2025-10-11", "endDate": "2025-11-10"},
+                "data": {"used": {"value": 512, "unit": "MB"}, "limit": {"value": 10, "unit": "GB"},
+                         "lastUpdate": "2025-11-03T17:54:00+01:00"},
+                "voice": {"used": 42, "limit": "Onbeperkt"},
+                "smsMms": {"used": "3", "unlimited": True},
+            },
+        },
+        {"easySwitchNumber": "ES123", "tariffName": "Internet", "pricePerMonth": "30.5"},
+        "not a product",
+    ]
+}
+
+
+def test_usage_from_json_maps_every_section():
+    usage = usage_from_json(INVENTORY["products"][0]["usage"])
+    assert usage == {
+        "period": {"start": "2025-10-11", "end": "2025-11-10"},
+        "data": {"used": 0.5, "limit": 10.0, "unlimited": False, "last_update": "2025-11-03T17:54:00"},
+        "calls": {"used": 42.0, "unlimited": True, "last_update": None},
+        "sms_mms": {"used": 3, "unlimited": True, "last_update": None},
+    }
+
+
+def test_usage_from_json_unwraps_and_rejects():
+    assert usage_from_json({"consumption": {"calls": {"used": 1}}})["calls"]["used"] == 1.0
+    assert usage_from_json(None) is None
+    assert usage_from_json({}) is None
+
+
+def test_products_from_inventory():
+    mobile, internet = products_from_inventory(INVENTORY)
+    assert mobile.product_id == "mobile_0470123456"
+    assert mobile.product_type == "mobile"
+    assert mobile.tariff == "FLEX 10"
+    assert mobile.contract.start_date == "2024-04-04"
+    assert mobile.contract.price_per_month_eur == 15.0
+    assert mobile.usage.data.used == 0.5
+    assert mobile.usage.period.end == "2025-11-10"
+    assert internet.product_id == "internet_ES123"
+    assert internet.contract.price_per_month_eur == 30.5
+    assert internet.usage is None
+    assert products_from_inventory([]) == []
+
+
+def test_invoice_from_json_picks_the_latest():
+    invoice = invoice_from_json({"invoices": [
+        {"invoiceNumber": 1, "invoiceDate": "2025-09-01", "amount": "20.5", "status": "Betaald"},
+        {"invoiceNumber": 2, "invoiceDate": "01/10/2025", "amount": 21, "status": "Open",
+         "dueDate": "2025-10-15"},
+    ]})
+    assert invoice.invoice_id == "2"
+    assert invoice.date == "2025-10-01"
+    assert invoice.amount_eur == 21.0
+    assert invoice.paid is False
+    assert invoice_from_json({"invoiceDate": "2025-09-01", "status": "Payée"}).paid is True
+    assert invoice_from_json([]) is None
+
+
+def test_transport_reuses_connections_and_decompresses(mock_server):
+    body = gzip.compress(b'{"ok": true}')
+    server = mock_server(lambda method, path, headers, data: (
+        200, {"Content-Type": "application/json", "Content-Encoding": "gzip"}, body))
+    transport = HttpTransport()
+    try:
+        for _ in range(3):
+            response = transport.request("GET", f"{server.url}/ping")
+            assert response.status == 200
+            assert response.json() == {"ok": True}
+    finally:
+        transport.close()
+    assert server.connections == 1
+    assert server.requests[0][2]["accept-encoding"] == "gzip, deflate"
+
+
+def test_transport_reports_connection_failures():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    transport = HttpTransport(timeout=2)
+    with pytest.raises(ApiError):
+        transport.request("GET", f"http://127.0.0.1:{port}/")
+
+
+def _api_server(mock_server, status, body):
+    return mock_server(lambda method, path, headers, data: (
+        status, {"Content-Type": "application/json"}, body))
+
+
+def test_api_get_products_sends_credentials(mock_server):
+    server = _api_server(mock_server, 200, json.dumps(INVENTORY).encode())
+    with HeyTelecomApi("token", "key", api_url=server.url) as api:
+        products = api.get_products()
+    assert [p.product_id for p in products] == ["mobile_0470123456", "internet_ES123"]
+    method, path, headers, _ = server.requests[0]
+    assert (method, path) == ("GET", HeyTelecomApi.PRODUCT_INVENTORY_PATH)
+    assert headers["authorization"] == "Bearer token"
+    assert headers["x-api-key"] == "key"
+
+
+@pytest.mark.parametrize("status, body, error", [
+    (401, b"{}", AuthenticationError),
+    (403, b"{}", AuthenticationError),
+    (500, b"{}", ApiError),
+    (200, b"<html>", ApiError),
+])
+def test_api_errors(mock_server, status, body, error):
+    server = _api_server(mock_server, status, body)
+    with HeyTelecomApi("token", "key", api_url=server.url) as api:
+        with pytest.raises(error) as excinfo:
+            api.get_products()
+    assert excinfo.value.status == status
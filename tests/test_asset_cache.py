@@ -0,0 +1,158 @@
+import asyncio
+import json
+import os
+from types import SimpleNamespace
+
+from heytelecom.asset_cache import AssetCache, is_fingerprinted
+
+ASSET = "https://ecare.heytelecom.be/main.3f2a9c1b8e7d6a54.js"
+BODY = b"console.log('hey');"
+ORIGIN_HEADERS = {
+    "content-type": "application/javascript",
+    "content-encoding": "gzip",
+    "content-length": "39",
+    "cache-control": "max-age=31536000",
+}
+
+
+class FakeResponse:
+    def __init__(self, status=200, body=BODY, headers=None):
+        self.status = status
+        self._body = body
+        self.headers = dict(headers or ORIGIN_HEADERS)
+
+    def body(self):
+        return self._body
+
+
+class FakeRoute:
+    def __init__(self, url, resource_type="script", method="GET", response=None):
+        self.request = SimpleNamespace(url=url, resource_type=resource_type, method=method)
+        self.response = response or FakeResponse()
+        self.fetches = 0
+        self.fulfilled = None
+        self.fell_back = False
+
+    def fetch(self):
+        self.fetches += 1
+        return self.response
+
+    def fulfill(self, **kwargs):
+        self.fulfilled = kwargs
+
+    def fallback(self):
+        self.fell_back = True
+
+
+class AsyncFakeResponse(FakeResponse):
+    async def body(self):
+        return self._body
+
+
+class AsyncFakeRoute(FakeRoute):
+    def __init__(self, url, resource_type="script", method="GET"):
+        super().__init__(url, resource_type, method, AsyncFakeResponse())
+
+    async def fetch(self):
+        return FakeRoute.fetch(self)
+
+    async def fulfill(self, **kwargs):
+        FakeRoute.fulfill(self, **kwargs)
+
+    async def fallback(self):
+        FakeRoute.fallback(self)
+
+
+def index(directory):
+    with open(os.path.join(directory, "index.json")) as f:
+        return json.load(f)
+
+
+def test_is_fingerprinted():
+    assert is_fingerprinted(ASSET)
+    assert is_fingerprinted("https://ecare.heytelecom.be/chunk-AB12CD34.js?v=1")
+    assert not is_fingerprinted("https://ecare.heytelecom.be/main.js")
+    assert not is_fingerprinted("https://ecare.heytelecom.be/nl/mijn-producten")
+
+
+def test_miss_then_hit(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    miss = FakeRoute(ASSET)
+    cache.handle(miss)
+    assert miss.fetches == 1
+    # The fetched body is decoded, so the transfer headers must not be replayed
+    assert "content-encoding" not in miss.fulfilled["headers"]
+    assert "content-length" not in miss.fulfilled["headers"]
+    assert miss.fulfilled["body"] == BODY
+
+    hit = FakeRoute(ASSET)
+    cache.handle(hit)
+    assert hit.fetches == 0
+    assert hit.fulfilled["body"] == BODY
+    assert hit.fulfilled["headers"] == {"content-type": "application/javascript",
+                                        "cache-control": "max-age=31536000"}
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 1
+
+
+def test_uncacheable_requests_fall_back(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    for route in (FakeRoute("https://ecare.heytelecom.be/main.js"), FakeRoute(ASSET, method="POST")):
+        cache.handle(route)
+        assert route.fell_back
+        assert route.fetches == 0
+
+
+def test_errors_are_not_cached(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    cache.handle(FakeRoute(ASSET, response=FakeResponse(status=404, body=b"missing")))
+    assert cache.get(ASSET) is None
+
+
+def test_index_is_flushed_per_page(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    cache.handle(FakeRoute(ASSET))
+    cache.handle(FakeRoute("https://ecare.heytelecom.be/styles-5QQO4JRA.css", resource_type="stylesheet"))
+    assert not os.path.exists(tmp_path / "index.json")
+
+    cache.handle(FakeRoute("https://ecare.heytelecom.be/nl/mijn-facturen", resource_type="document"))
+    assert len(index(tmp_path)) == 2
+    assert len(AssetCache(str(tmp_path)).get(ASSET)[1]) == len(BODY)
+
+
+def test_identical_bodies_are_stored_once(tmp_path):
+    cache = AssetCache(str(tmp_path))
+    cache.put("https://a.example/x.0123456789abcdef.js", {}, BODY)
+    cache.put("https://b.example/x.0123456789abcdef.js", {}, BODY)
+    assert len(os.listdir(tmp_path / "objects")) == 1
+    assert cache.size == len(BODY)
+
+
+def test_lru_eviction(tmp_path):
+    cache = AssetCache(str(tmp_path), max_bytes=25)
+    cache.put("https://e.example/a.00000000.js", {}, b"a" * 10)
+    cache.put("https://e.example/b.00000000.js", {}, b"b" * 10)
+    cache.get("https://e.example/a.00000000.js")
+    cache.put("https://e.example/c.00000000.js", {}, b"c" * 10)
+    assert cache.get("https://e.example/b.00000000.js") is None
+    assert cache.get("https://e.example/a.00000000.js") is not None
+    assert cache.stats.evictions == 1
+    assert cache.size == 20
+
+
+def test_async_handler(tmp_path):
+    cache = AssetCache(str(tmp_path))
+
+    async def run():
+        miss, hit, page = AsyncFakeRoute(ASSET), AsyncFakeRoute(ASSET), AsyncFakeRoute(
+            "https://ecare.heytelecom.be/nl", resource_type="document")
+        await cache.handle_async(miss)
+        await cache.handle_async(hit)
+        await cache.handle_async(page)
+        return miss, hit, page
+
+    miss, hit, page = asyncio.run(run())
+    assert "content-encoding" not in miss.fulfilled["headers"]
+    assert hit.fetches == 0 and hit.fulfilled["body"] == BODY
+    assert page.fell_back
+    assert ASSET in index(tmp_path)
@@ -0,0 +1,88 @@
+import math
+
+import pytest
+
+from heytelecom.history import HistoryStore
+from heytelecom.models import AccountData, Invoice
+
+DAY = 86400
+NOW = 1_761_998_400  # 2025-11-01, on the hour
+
+
+def snapshot(used, period=("2025-10-11", "2025-11-10"), invoice=None, cached=False):
+    usage = {"period": {"start": period[0], "end": period[1]},
+             "data": {"used": used, "limit": 10.0}, "calls": {"used": 5.0}}
+    if cached:
+        usage["cached_at"] = "2025-11-01T00:00:00"
+    account = {"provider": "hey!", "products": [{"id": "mobile_1", "type": "mobile", "usage": usage}]}
+    if invoice:
+        account["billing"] = {"latest_invoice": invoice}
+    return account
+
+
+@pytest.fixture
+def store():
+    # compact_interval keeps append() from downsampling on its own
+    with HistoryStore(":memory:", compact_interval=float("inf")) as history:
+        yield history
+
+
+def test_append_and_series(store):
+    assert store.append(snapshot(1.0), at=NOW - 60) == 1
+    assert store.append(snapshot(1.5, cached=True), at=NOW - 30) == 0
+    assert store.append(AccountData.from_dict(snapshot(2.0)), at=NOW) == 1
+    series = store.series("mobile_1")
+    assert list(series.timestamps) == [NOW - 60, NOW]
+    assert list(series.columns["data_used"]) == [1.0, 2.0]
+    assert math.isnan(series.columns["sms_used"][0])
+    assert series.to_dict()["sms_used"] == [None, None]
+    assert store.products() == ["mobile_1"]
+    assert len(store.series("unknown")) == 0
+    with pytest.raises(ValueError):
+        store.series_many(fields=("colour",))
+
+
+def test_downsample_keeps_last_sample_per_bucket(store):
+    # Ten days of samples every 5 minutes
+    start = NOW - 10 * DAY
+    for ts in range(start, NOW, 300):
+        store.append(snapshot((ts - start) / DAY), at=ts)
+    before = len(store.series("mobile_1"))
+    removed = store.downsample(now=NOW)
+    series = store.series("mobile_1")
+    assert removed == before - len(series)
+
+    old = [ts for ts in series.timestamps if ts < NOW - 7 * DAY]
+    recent = [ts for ts in series.timestamps if ts >= NOW - 7 * DAY]
+    # Older than the first tier: one sample per hour, the last one of each hour
+    assert len(old) == len({int(ts) // 3600 for ts in old})
+    assert all(int(ts) % 3600 == 3300 for ts in old[1:-1])
+    # Recent samples are untouched
+    assert len(recent) == 7 * DAY // 300
+    # Running it again removes nothing
+    assert store.downsample(now=NOW) == 0
+
+
+def test_burn_rates(store):
+    start = NOW - 5 * DAY
+    store.append(snapshot(1.0, period=("2025-10-27", "2025-11-26")), at=start)
+    store.append(snapshot(2.0, period=("2025-10-27", "2025-11-26")), at=NOW)
+    rate, = store.burn_rates("mobile_1")
+    assert rate.samples == 2
+    assert rate.used == 2.0
+    assert rate.limit == 10.0
+    assert rate.per_day > 0
+    assert rate.projected == pytest.approx(rate.per_day * 31)
+    with pytest.raises(ValueError):
+        store.burn_rates("mobile_1", field="data_limit")
+
+
+def test_invoices(store):
+    store.append(snapshot(1.0, invoice={"invoice_id": "A", "amount_eur": 20.0, "paid": True,
+                                        "date": "2025-09-01"}), at=NOW - DAY)
+    store.append(snapshot(1.0, invoice={"invoice_id": "B", "amount_eur": 21.0, "status": "open",
+                                        "date": "2025-10-01"}), at=NOW)
+    assert store.invoices() == [
+        Invoice(invoice_id="B", amount_eur=21.0, status="open", paid=False, date="2025-10-01"),
+        Invoice(invoice_id="A", amount_eur=20.0, paid=True, date="2025-09-01"),
+    ]
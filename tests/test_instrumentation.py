@@ -0,0 +1,104 @@
+import asyncio
+import threading
+
+from heytelecom.instrumentation import Instrumentation, instrumented
+
+
+def names(spans):
+    return [span.name for span in spans]
+
+
+def test_spans_nest():
+    inst = Instrumentation()
+    with inst.span("scrape"):
+        with inst.span("products", count=2) as products:
+            assert inst.current() is products
+        with inst.span("invoice"):
+            pass
+    assert inst.current() is None
+    (root,) = inst.spans
+    assert names(root.children) == ["products", "invoice"]
+    assert root.children[0].attributes == {"count": 2}
+    assert root.end is not None
+
+
+def test_instances_do_not_share_nesting():
+    a, b = Instrumentation(), Instrumentation()
+    with a.span("outer"):
+        with b.span("other"):
+            with a.span("inner"):
+                assert b.current().name == "other"
+    assert names(a.spans[0].children) == ["inner"]
+    assert names(b.spans) == ["other"]
+    assert b.spans[0].children == []
+
+
+def test_threads_and_tasks_have_their_own_stack():
+    inst = Instrumentation()
+
+    def worker():
+        with inst.span("thread"):
+            pass
+
+    async def task(name):
+        with inst.span(name):
+            await asyncio.sleep(0.01)
+            with inst.span(f"{name}.child"):
+                pass
+
+    async def run():
+        await asyncio.gather(task("a"), task("b"))
+
+    with inst.span("main"):
+        thread = threading.Thread(target=worker)
+        thread.start()
+        thread.join()
+    asyncio.run(run())
+    assert names(inst.spans) == ["main", "thread", "a", "b"]
+    assert names(inst.spans[2].children) == ["a.child"]
+    assert names(inst.spans[3].children) == ["b.child"]
+
+
+def test_root_spans_are_bounded():
+    inst = Instrumentation(max_spans=3)
+    for i in range(10):
+        with inst.span(f"poll-{i}"):
+            pass
+    assert names(inst.spans) == ["poll-7", "poll-8", "poll-9"]
+    inst.reset()
+    assert len(inst.spans) == 0
+    assert inst.spans.maxlen == 3
+
+
+def test_hooks_and_counters():
+    events = []
+    inst = Instrumentation(hooks=[lambda event, payload: events.append(event)])
+    inst.add_hook(lambda event, payload: 1 / 0)
+    with inst.span("scrape"):
+        inst.count("requests")
+        inst.count("requests", 2)
+    assert events == ["span_start", "count", "count", "span_end"]
+    before = dict(inst.counters)
+    inst.count("pages")
+    assert inst.summary(counters_since=before)["counters"] == {"pages": 1}
+    assert set(inst.summary()["totals_ms"]) == {"scrape"}
+
+
+def test_instrumented_decorator():
+    class Client:
+        def __init__(self):
+            self.instrumentation = Instrumentation()
+
+        @instrumented("sync")
+        def sync(self):
+            return 1
+
+        @instrumented("async")
+        async def run(self):
+            return self.sync()
+
+    client = Client()
+    assert asyncio.run(client.run()) == 1
+    (root,) = client.instrumentation.spans
+    assert root.name == "async"
+    assert names(root.children) == ["sync"]
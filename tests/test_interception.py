@@ -0,0 +1,66 @@
+from heytelecom.interception import (
+    ResponseCollector, invoice_from_payloads, payload_kind, products_from_payloads, url_matcher,
+    usage_from_payloads,
+)
+
+API = "https://api.heytelecom.be"
+
+
+class FakeResponse:
+    def __init__(self, url, status=200, content_type="application/json", page=None):
+        self.url = url
+        self.status = status
+        self.headers = {"content-type": content_type}
+        self.frame = type("Frame", (), {"page": page})()
+
+
+def test_payload_kind():
+    assert payload_kind(f"{API}/api/bff/product-inventory/v1/productInventory") == "inventory"
+    assert payload_kind(f"{API}/api/bff/usage/v1/consumption?id=1") == "usage"
+    assert payload_kind(f"{API}/api/bff/billing/v1/invoices") == "invoice"
+    assert payload_kind(f"{API}/api/bff/customer/v1/profile") is None
+    assert payload_kind("https://ecare.heytelecom.be/usage") is None
+    assert payload_kind("http://127.0.0.1:8000/usage", api_host="127.0.0.1") == "usage"
+    assert url_matcher("usage")(f"{API}/consumption")
+    assert not url_matcher("invoice")(f"{API}/consumption")
+
+
+def test_collector_keeps_json_payloads_per_page():
+    collector = ResponseCollector()
+    page, tab = object(), object()
+    responses = [
+        FakeResponse(f"{API}/usage/1", page=page),
+        FakeResponse(f"{API}/usage/2", page=tab),
+        FakeResponse(f"{API}/invoices", page=page),
+        FakeResponse(f"{API}/usage/3", status=500, page=page),
+        FakeResponse(f"{API}/usage/4", content_type="text/html", page=page),
+        FakeResponse("https://ecare.heytelecom.be/usage", page=page),
+    ]
+    for response in responses:
+        collector(response)
+    assert collector.take("usage", page) == [responses[0]]
+    assert collector.take("usage") == [responses[1]]
+    assert collector.take("usage") == []
+    collector.clear()
+    assert collector.take("invoice") == []
+
+
+def test_products_from_payloads():
+    mobile = {"msisdn": "0470123456", "usage": {"data": {"used": 1}}}
+    assert [p.product_id for p in products_from_payloads([{"products": [mobile]}])] == ["mobile_0470123456"]
+    # A mobile product without usage sends the client to the usage pages
+    assert products_from_payloads([{"products": [{"msisdn": "0470123456"}]}]) is None
+    assert products_from_payloads([{}]) is None
+
+
+def test_usage_payloads_are_merged():
+    usage = usage_from_payloads([{"data": {"used": 1}}, {"calls": {"used": 5}}, None])
+    assert set(usage) == {"data", "calls"}
+    assert usage_from_payloads([]) is None
+
+
+def test_invoice_from_payloads_uses_the_last_one():
+    first = {"invoiceNumber": "A", "invoiceDate": "2025-09-01"}
+    second = {"invoiceNumber": "B", "invoiceDate": "2025-10-01"}
+    assert invoice_from_payloads([first, second]).invoice_id == "B"
+    assert invoice_from_payloads([]) is None
@@ -0,0 +1,76 @@
+import json
+
+import pytest
+
+from heytelecom import models
+from heytelecom.models import (
+    AccountData, CallUsage, Contract, DataUsage, Invoice, Period, Product, SmsUsage, UsageData,
+)
+
+
+def full_account() -> AccountData:
+    return AccountData(
+        last_sync="2025-11-03T12:00:00",
+        products=[
+            Product(
+                product_id="mobile_0470123456",
+                product_type="mobile",
+                phone_number="0470 12 34 56",
+                tariff="FLEX 10",
+                contract=Contract(start_date="2024-04-04", price_per_month_eur=15.0),
+                usage=UsageData(
+                    period=Period("2025-10-11", "2025-11-10"),
+                    data=DataUsage(2.25, 10.0, False, "2025-11-03T17:54:00"),
+                    calls=CallUsage(42.0, True, "2025-11-03T17:54:00"),
+                    sms_mms=SmsUsage(3, True, None),
+                    cached_at="2025-11-03T18:00:00",
+                ),
+            ),
+            Product(product_id="internet_ES123", product_type="internet", easy_switch_number="ES123"),
+        ],
+        latest_invoice=Invoice(invoice_id="INV-1", amount_eur=21.0, status="open", paid=False,
+                               date="2025-10-01", due_date="2025-10-15"),
+        sync={"spans": [], "counters": {"navigations": 3}},
+    )
+
+
+def test_dict_round_trip():
+    account = full_account()
+    assert AccountData.from_dict(account.to_dict()) == account
+
+
+def test_json_round_trip():
+    account = full_account()
+    text = account.to_json()
+    assert json.loads(text) == account.to_dict()
+    assert AccountData.from_json(text) == account
+    assert AccountData.from_json(text.encode("utf-8")) == account
+
+
+def test_json_round_trip_without_orjson(monkeypatch):
+    monkeypatch.setattr(models, "orjson", None)
+    account = full_account()
+    assert AccountData.from_json(account.to_json()) == account
+
+
+def test_minimal_account_round_trip():
+    account = AccountData(last_sync="2025-11-03T12:00:00")
+    assert account.to_dict() == {"provider": "hey!", "account": {"last_sync": "2025-11-03T12:00:00"},
+                                 "products": []}
+    assert AccountData.from_dict(account.to_dict()) == account
+
+
+def test_usage_accepts_plain_dictionaries():
+    usage = UsageData(period={"start": "2025-10-11", "end": "2025-11-10"},
+                      data={"used": 1.0, "limit": None, "unlimited": True})
+    assert usage.period == Period("2025-10-11", "2025-11-10")
+    assert usage.data == DataUsage(1.0, None, True, None)
+    assert UsageData.from_dict(usage.to_dict()) == usage
+
+
+def test_records_are_slotted():
+    product = full_account().products[0]
+    for record in (product, product.usage, product.usage.data, product.contract):
+        assert not hasattr(record, "__dict__")
+    with pytest.raises(AttributeError):
+        product.colour = "red"
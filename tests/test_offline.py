@@ -0,0 +1,84 @@
+from heytelecom.offline import parse_files, parse_html, parse_invoice_page, parse_products_page, parse_usage_page
+
+PRODUCTS_PAGE = """<html><body><ul>
+<li class="iris-products__item">
+  <span class="iris-products__details-tariff-name">Hey 10GB</span>
+  <span class="iris-products__details-tariff-number">0470 12 34 56</span>
+  <div>
+    <span class="iris-products__details-info-title">Begindatum contract</span>
+    <span>04.04.2025</span>
+  </div>
+  <div>
+    <span class="iris-products__details-info-title">Prijs</span>
+    <span>15 €/maand</span>
+  </div>
+  <a class="iris-products__link" data-event_category="MyProducts" href="/nl/gedetailleerd-gebruik/1">Verbruik</a>
+</li>
+</ul><script>var ignored = "<li class='iris-products__item'>";</script></body></html>"""
+
+
+def usage_block(block_id, limit, used, update):
+    return f"""<div id="{block_id}">
+  <span class="iris-consumption__main-data-usage"><strong>{used}</strong></span>
+  <span class="iris-consumption__main-data-limit">{limit}</span>
+  <span class="iris-consumption__main-data-update">{update}</span>
+</div>"""
+
+
+USAGE_PAGE = (
+    '<html><body><p class="iris-consumption__main-date-range">Van 11/10/2025 tot 11/11/2025</p>'
+    + usage_block("consumption-data", "van 10 GB", "2.25 GB", "Laatste update : 03/11 17:54")
+    + usage_block("consumption-calls", "Onbeperkt", "42 minuten", "Laatste update : 03/11 17:54")
+    + usage_block("consumption-sms", "Onbeperkt", "3 sms/mms", "Laatste update : 03/11 17:54")
+    + "</body></html>"
+)
+
+FRENCH_INVOICE_PAGE = """<html><body><lib-obe-latest-invoice><section class="iris-invoice">
+  <p class="iris-invoice__main-data-title">Montant</p><p>25,50 €</p>
+  <p class="iris-invoice__main-data-title">Statut</p><p>Payée</p>
+  <p class="iris-invoice__main-data-title">Date</p><p>01/11/2025</p>
+  <p class="iris-invoice__main-data-title">Date d'échéance</p><p>15/11/2025</p>
+</section></lib-obe-latest-invoice></body></html>"""
+
+
+def test_parse_html_tolerates_unclosed_tags():
+    root = parse_html("<div class='a b'><p>one<br>two<img src=x></div><span>three")
+    assert [el.tag for el in root.iter()] == ["div", "p", "br", "img", "span"]
+    assert root.elements()[0].classes == ["a", "b"]
+    assert root.text_content() == "onetwothree"
+
+
+def test_parse_products_page():
+    product, = parse_products_page(PRODUCTS_PAGE)
+    assert product.product_id == "mobile_0470123456"
+    assert product.tariff == "Hey 10GB"
+    assert product.contract.start_date == "2025-04-04"
+    assert product.contract.price_per_month_eur == 15.0
+
+
+def test_parse_usage_page():
+    usage = parse_usage_page(USAGE_PAGE)
+    assert usage["period"] == {"start": "2025-10-11", "end": "2025-11-11"}
+    assert usage["data"]["used"] == 2.25
+    assert usage["data"]["limit"] == 10.0
+    assert usage["calls"]["unlimited"] is True
+    assert usage["sms_mms"]["used"] == 3
+    assert parse_usage_page(USAGE_PAGE, url="https://ecare.heytelecom.be/nl/producten") is None
+
+
+def test_parse_french_invoice_page():
+    invoice = parse_invoice_page(FRENCH_INVOICE_PAGE)
+    assert invoice.amount_eur == 25.5
+    assert invoice.paid is True
+    assert invoice.date == "2025-11-01"
+    assert invoice.due_date == "2025-11-15"
+    assert parse_invoice_page("<html></html>") is None
+
+
+def test_parse_files(tmp_path):
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"usage{index}.html"
+        path.write_text(USAGE_PAGE, encoding="utf-8")
+        paths.append(str(path))
+    assert parse_files("usage", paths, processes=1) == [parse_usage_page(USAGE_PAGE)] * 3
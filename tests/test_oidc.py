@@ -0,0 +1,164 @@
+import base64
+import hashlib
+import json
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from heytelecom.api import ApiError, HttpTransport
+from heytelecom.oidc import LoginError, OidcFlowError, OidcLogin, generate_pkce_pair
+from heytelecom.tokens import ApiCredentials
+
+EMAIL = "user@example.com"
+PASSWORD = "secret"
+
+LOGIN_PAGE = b'<html><a id="Login_loginByEmail" href="/login/email">Inloggen via E-mail</a></html>'
+EMAIL_FORM = b"""<html><form action="/login/email" method="post">
+<input type="hidden" name="csrf" value="tok">
+<input id="Login_byEmail_emailAddress" name="email" type="text">
+<input id="Login_byEmail_password" name="password" type="password">
+<input type="submit" value="Inloggen">
+</form></html>"""
+
+
+class FakeIssuer:
+    """Stand-in for openid.heytelecom.be: authorize, the two login pages and the token endpoint."""
+
+    def __init__(self, mock_server):
+        self.challenge = None
+        self.state = None
+        self.token_response = None
+        self.server = mock_server(self.handle)
+        self.redirect_uri = f"{self.server.url}/index.html"
+
+    def handle(self, method, path, headers, body):
+        parts = urlsplit(path)
+        query = parse_qs(parts.query)
+        form = parse_qs(body.decode())
+        if parts.path == "/oidc/authorize":
+            self.challenge = query["code_challenge"][0]
+            self.state = query["state"][0]
+            assert query["code_challenge_method"] == ["S256"]
+            return 302, {"Location": "/login", "Set-Cookie": "session=abc; Path=/"}, b""
+        if parts.path == "/login":
+            return 200, {"Content-Type": "text/html"}, LOGIN_PAGE
+        if parts.path == "/login/email" and method == "GET":
+            assert "session=abc" in headers.get("cookie", "")
+            return 200, {"Content-Type": "text/html"}, EMAIL_FORM
+        if parts.path == "/login/email":
+            assert form["csrf"] == ["tok"]
+            if form.get("email") != [EMAIL] or form.get("password") != [PASSWORD]:
+                return 200, {"Content-Type": "text/html"}, b"Verkeerde gebruikersnaam en/of wachtwoord"
+            return 302, {"Location": f"{self.redirect_uri}?code=the-code&state={self.state}"}, b""
+        if parts.path == "/oidc/token":
+            if form["grant_type"] == ["authorization_code"]:
+                digest = hashlib.sha256(form["code_verifier"][0].encode()).digest()
+                challenge = base64.urlsafe_b64encode(digest).decode().rstrip("=")
+                if form["code"] != ["the-code"] or challenge != self.challenge:
+                    return 400, {"Content-Type": "application/json"}, b'{"error": "invalid_grant"}'
+            elif form["refresh_token"] != ["refresh-1"]:
+                return 400, {"Content-Type": "application/json"}, b'{"error": "invalid_grant"}'
+            tokens = self.token_response or {"access_token": "access-1", "refresh_token": "refresh-2",
+                                             "expires_in": 300}
+            return 200, {"Content-Type": "application/json"}, json.dumps(tokens).encode()
+        return 404, {}, b""
+
+    def login_engine(self, transport=None) -> OidcLogin:
+        return OidcLogin(issuer_url=self.server.url, redirect_uri=self.redirect_uri, transport=transport)
+
+
+@pytest.fixture
+def issuer(mock_server):
+    return FakeIssuer(mock_server)
+
+
+def test_pkce_pair():
+    verifier, challenge = generate_pkce_pair()
+    assert 43 <= len(verifier) <= 128
+    digest = hashlib.sha256(verifier.encode()).digest()
+    assert challenge == base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+def test_login_runs_the_pkce_flow(issuer):
+    oidc = issuer.login_engine()
+    try:
+        before = time.time()
+        credentials = oidc.login(EMAIL, PASSWORD, "api-key")
+    finally:
+        oidc.close()
+    assert credentials.access_token == "access-1"
+    assert credentials.refresh_token == "refresh-2"
+    assert credentials.api_key == "api-key"
+    assert before + 300 <= credentials.expires_at <= time.time() + 300
+
+
+def test_login_rejects_wrong_password(issuer):
+    oidc = issuer.login_engine()
+    try:
+        with pytest.raises(LoginError):
+            oidc.login(EMAIL, "wrong", "api-key")
+    finally:
+        oidc.close()
+
+
+def test_refresh(issuer):
+    oidc = issuer.login_engine()
+    try:
+        credentials = oidc.refresh(ApiCredentials("old", "api-key", refresh_token="refresh-1"))
+        assert credentials.access_token == "access-1"
+        with pytest.raises(OidcFlowError):
+            oidc.refresh(ApiCredentials("old", "api-key", refresh_token="revoked"))
+        with pytest.raises(OidcFlowError):
+            oidc.refresh(ApiCredentials("old", "api-key"))
+    finally:
+        oidc.close()
+
+
+@pytest.mark.parametrize("tokens", [
+    {"access_token": "access-1", "expires_in": "soon"},
+    {"refresh_token": "refresh-2"},
+    ["access-1"],
+])
+def test_login_malformed_token_response(issuer, tokens):
+    issuer.token_response = tokens
+    oidc = issuer.login_engine()
+    try:
+        with pytest.raises(OidcFlowError):
+            oidc.login(EMAIL, PASSWORD, "api-key")
+    finally:
+        oidc.close()
+
+
+class FailingTokenTransport(HttpTransport):
+    def request(self, method, url, headers=None, body=None):
+        if url.endswith("/oidc/token"):
+            raise ApiError(f"Request to {url} failed: connection reset")
+        return super().request(method, url, headers, body)
+
+
+def test_login_token_request_failure(issuer):
+    transport = FailingTokenTransport()
+    try:
+        with pytest.raises(OidcFlowError):
+            issuer.login_engine(transport).login(EMAIL, PASSWORD, "api-key")
+    finally:
+        transport.close()
+
+
+def test_login_state_mismatch(issuer):
+    original = issuer.handle
+
+    def tampered(method, path, headers, body):
+        status, response_headers, response_body = original(method, path, headers, body)
+        if "Location" in response_headers and "state=" in response_headers["Location"]:
+            response_headers["Location"] = response_headers["Location"].replace(issuer.state, "forged")
+        return status, response_headers, response_body
+
+    issuer.server.handler = tampered
+    oidc = issuer.login_engine()
+    try:
+        with pytest.raises(OidcFlowError):
+            oidc.login(EMAIL, PASSWORD, "api-key")
+    finally:
+        oidc.close()
@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import pytest
+
+from heytelecom.parsers import (
+    LOCALES, LocaleParser, convert_to_gb, get_parser, parse_batch, parse_data_amount, parse_minutes,
+    parse_period, parse_price, parse_sms_count, is_paid, is_unlimited,
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2.25 GB", 2.25),
+    ("2,25 Go", 2.25),
+    ("512 MB", 0.5),
+    ("512 Mo", 0.5),
+    ("1 TB", 1024.0),
+    ("10GB/maand", 10.0),
+    ("3 gb", 3.0),
+    ("", None),
+    (None, None),
+    # Period separators and words that start like a unit are no data amounts
+    ("10 tot 20", None),
+    ("Van 5 to", None),
+    ("Du 5 au 10", None),
+    ("3 months", None),
+    ("3 mois", None),
+])
+def test_parse_data_amount(text, expected):
+    assert parse_data_amount(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Van 11/10/2025 tot 11/11/2025",
+    "Du 11/10/2025 au 11/11/2025",
+    "Du 11/10/2025 jusqu'au 11/11/2025",
+    "From 11/10/2025 to 11/11/2025",
+])
+def test_parse_period_in_every_locale(text):
+    assert parse_period(text) == {"start": "2025-10-11", "end": "2025-11-11"}
+
+
+def test_locale_tables_are_complete():
+    keys = set(LOCALES["nl"])
+    assert all(set(table) == keys for table in LOCALES.values())
+
+
+def test_single_locale_parser_only_knows_its_words():
+    nl = LocaleParser(("nl",))
+    fr = LocaleParser(("fr",))
+    assert nl.period("Du 11/10/2025 au 11/11/2025") is None
+    assert fr.period("Du 11/10/2025 au 11/11/2025") == {"start": "2025-10-11", "end": "2025-11-11"}
+    assert nl.data_amount("2 Go") is None
+    assert fr.data_amount("2 Go") == 2.0
+    assert nl.unlimited("Onbeperkt") and not nl.unlimited("Illimité")
+    assert fr.paid("Payée") and not fr.paid("Betaald")
+
+
+def test_unknown_locale():
+    with pytest.raises(ValueError):
+        LocaleParser(("de",))
+    with pytest.raises(ValueError):
+        LocaleParser(())
+
+
+def test_simple_fields():
+    assert parse_price("5,00 €/mois") == 5.0
+    assert parse_minutes("42 minuten") == 42.0
+    assert parse_sms_count("3 sms/mms") == 3
+    assert is_unlimited("Illimité")
+    assert not is_unlimited("van 10 GB")
+    assert is_paid(" Betaald ") and is_paid("paid") and not is_paid("Open")
+    assert get_parser().last_update("Laatste update : 03/11 17:54", 2025) == "2025-11-03T17:54:00"
+
+
+def test_convert_to_gb():
+    assert convert_to_gb(None, "GB") is None
+    assert convert_to_gb(1024, "mo") == 1.0
+    assert convert_to_gb(2, "TO") == 2048
+    assert convert_to_gb(1024 ** 3, "B") == 1.0
+
+
+def test_parse_batch_matches_single_calls():
+    texts = ["2,25 Go", None, "512 MB", "2,25 Go", "10 tot 20"]
+    assert parse_batch("data_amount", texts) == [parse_data_amount(t) for t in texts]
+    assert parse_batch("period", ["Du 11/10/2025 au 11/11/2025"], locales=("fr",)) == [
+        {"start": "2025-10-11", "end": "2025-11-11"}]
+    with pytest.raises(ValueError):
+        parse_batch("colour", [])
+
+
+@pytest.mark.parametrize("text, now, expected", [
+    ("Laatste update : 03/11 17:54", datetime(2025, 11, 3, 18, 0), "2025-11-03T17:54:00"),
+    # Read just after New Year: the stamp is from the year before
+    ("Laatste update : 31/12 23:50", datetime(2026, 1, 1, 0, 5), "2025-12-31T23:50:00"),
+    ("Laatste update : 01/01 00:01", datetime(2026, 1, 1, 0, 5), "2026-01-01T00:01:00"),
+    # A few hours ahead is clock skew between the portal and this machine, not last year
+    ("Dernière mise à jour : 03/11 17:54", datetime(2025, 11, 3, 15, 0), "2025-11-03T17:54:00"),
+    ("Laatste update : 29/02 10:00", datetime(2025, 3, 1), "2024-02-29T10:00:00"),
+    ("geen datum", datetime(2025, 11, 3), None),
+])
+def test_last_update_year(text, now, expected):
+    assert get_parser().last_update(text, now=now) == expected
+
+
+def test_last_update_explicit_year():
+    assert get_parser().last_update("Laatste update : 31/12 23:50", 2020) == "2020-12-31T23:50:00"
+
+
+def test_last_update_batch_matches_single_calls():
+    texts = ["Laatste update : 03/11 17:54", None, "Laatste update : 03/11 17:54"]
+    assert parse_batch("last_update", texts) == [get_parser().last_update(text) for text in texts]
@@ -0,0 +1,95 @@
+from datetime import datetime, timedelta
+
+from heytelecom.product_state import ProductState, ProductStateStore, product_fingerprint
+
+NOW = datetime(2025, 11, 3, 12, 0, 0)
+
+
+def ts(**delta) -> float:
+    return (NOW - timedelta(**delta)).timestamp()
+
+
+def iso(**delta) -> str:
+    return (NOW - timedelta(**delta)).isoformat()
+
+
+def usage(last_update: str, end: str = "2025-11-30"):
+    return {"period": {"start": "2025-11-01", "end": end}, "data": {"used": 1.0, "last_update": last_update}}
+
+
+def hourly_state(fetched_at: float) -> ProductState:
+    """Updates seen at 3h10 and 2h10 ago: one every hour, the next one expected 1h10 ago."""
+    return ProductState("fp", usage(iso(hours=2, minutes=10)), fetched_at,
+                        [iso(hours=3, minutes=10), iso(hours=2, minutes=10)])
+
+
+def test_changed_or_missing_entry_needs_refresh():
+    state = hourly_state(ts(seconds=60))
+    assert state.needs_refresh("other", now=NOW.timestamp())
+    assert ProductState("fp").needs_refresh("fp", now=NOW.timestamp())
+
+
+def test_recent_fetch_after_expected_update_does_not_refresh():
+    # The last fetch (1 min ago) already looked for the update expected 1h10 ago
+    state = hourly_state(ts(seconds=60))
+    assert not state.needs_refresh("fp", now=NOW.timestamp())
+    assert state.expected_update(after=state.fetched_at) == NOW + timedelta(minutes=50)
+    assert state.needs_refresh("fp", now=(NOW + timedelta(minutes=50)).timestamp())
+
+
+def test_fetch_before_expected_update_refreshes():
+    state = hourly_state(ts(hours=2))
+    assert state.needs_refresh("fp", now=NOW.timestamp())
+
+
+def test_max_age_and_period_end():
+    state = hourly_state(ts(seconds=60))
+    assert state.needs_refresh("fp", max_age=30, now=NOW.timestamp())
+    state.usage = usage(iso(hours=2, minutes=10), end="2025-11-01")
+    assert state.needs_refresh("fp", now=NOW.timestamp())
+
+
+def test_record_keeps_new_update_times():
+    state = ProductState("fp")
+    state.record("fp", usage(iso(hours=2)), now=ts(hours=2))
+    state.record("fp", usage(iso(hours=2)), now=ts(hours=1))
+    state.record("fp2", usage(iso(hours=1)), now=NOW.timestamp())
+    assert state.update_times == [iso(hours=2), iso(hours=1)]
+    assert state.fingerprint == "fp2"
+    assert state.update_interval() == 3600
+
+
+def test_fingerprint_ignores_usage():
+    assert product_fingerprint({"tariff": "A", "usage": {"x": 1}}) == product_fingerprint({"tariff": "A"})
+    assert product_fingerprint({"tariff": "A"}) != product_fingerprint({"tariff": "B"})
+
+
+def test_store_round_trip(tmp_path):
+    path = str(tmp_path / "state" / "products.json")
+    store = ProductStateStore(path)
+    store.put("mobile_1", hourly_state(ts(seconds=60)))
+    store.save()
+    loaded = ProductStateStore(path).get("mobile_1")
+    assert loaded == hourly_state(ts(seconds=60))
+    store.clear()
+    assert ProductStateStore(path).get("mobile_1") is None
+
+
+def test_malformed_dates_need_refresh():
+    state = hourly_state(ts(seconds=60))
+    state.update_times = ["03/11 17:54", iso(hours=2, minutes=10)]
+    assert state.needs_refresh("fp", now=NOW.timestamp())
+    state = hourly_state(ts(seconds=60))
+    state.usage = usage(iso(hours=2, minutes=10), end="30/11/2025")
+    assert state.needs_refresh("fp", now=NOW.timestamp())
+    state.usage = {"period": "2025-11"}
+    assert state.needs_refresh("fp", now=NOW.timestamp())
+
+
+def test_store_loads_state_with_malformed_dates(tmp_path):
+    path = tmp_path / "products.json"
+    path.write_text('{"mobile_1": {"fingerprint": "fp", "usage": {"data": {}}, "fetched_at": 1,'
+                    ' "update_times": ["yesterday", 5]}}')
+    state = ProductStateStore(str(path)).get("mobile_1")
+    assert state.update_times == ["yesterday", "5"]
+    assert state.needs_refresh("fp")
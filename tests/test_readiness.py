@@ -0,0 +1,120 @@
+import asyncio
+import time
+
+import pytest
+
+from heytelecom.readiness import (
+    AnyReady, PRODUCTS_READY, Readiness, ReadinessCondition, ResponseReady, SelectorReady, payload_ready,
+)
+
+
+class PageTimeout(Exception):
+    pass
+
+
+class FakePage:
+    """Page whose selector appears, and whose URL changes, after a given number of seconds."""
+
+    def __init__(self, selector_after=None, redirect_after=None, url="https://ecare.example/"):
+        self.started = time.perf_counter()
+        self.selector_after = selector_after
+        self.redirect_after = redirect_after
+        self._url = url
+        self.listeners = []
+
+    def _elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def url(self):
+        if self.redirect_after is not None and self._elapsed() >= self.redirect_after:
+            return "https://auth.example/login"
+        return self._url
+
+    def on(self, event, listener):
+        self.listeners.append(listener)
+
+    def remove_listener(self, event, listener):
+        self.listeners.remove(listener)
+
+    def wait_for_selector(self, selector, state, timeout):
+        if self.selector_after is not None:
+            remaining = self.selector_after - self._elapsed()
+            if remaining <= timeout / 1000:
+                time.sleep(max(remaining, 0))
+                return
+        time.sleep(timeout / 1000)
+        raise PageTimeout(selector)
+
+    def wait_for_event(self, event, predicate, timeout):
+        time.sleep(timeout / 1000)
+        raise PageTimeout(event)
+
+
+class AsyncFakePage(FakePage):
+    async def wait_for_selector(self, selector, state, timeout):
+        return FakePage.wait_for_selector(self, selector, state, timeout)
+
+    async def wait_for_event(self, event, predicate, timeout):
+        return FakePage.wait_for_event(self, event, predicate, timeout)
+
+
+def test_condition_must_implement_both_waits():
+    class SyncOnly(ReadinessCondition):
+        def wait(self, page, state, timeout):
+            return True
+
+    with pytest.raises(TypeError):
+        SyncOnly()
+
+
+def test_ready_and_timeout():
+    readiness = Readiness("page", SelectorReady("li"), timeout=500)
+    result = readiness.arm(FakePage(selector_after=0.05)).wait()
+    assert result.ready and not result.aborted
+    page = FakePage()
+    result = readiness.arm(page).wait()
+    assert not result.ready
+    assert 0.45 <= result.waited < 1.0
+
+
+def test_abort_url_ends_the_wait_on_redirect():
+    page = FakePage(redirect_after=0.3)
+    result = Readiness("page", SelectorReady("li"), timeout=30000).arm(page, abort_url="https://auth.example").wait()
+    assert result.aborted and not result.ready
+    assert result.waited < 2
+
+
+def test_abort_url_on_an_auth_page_returns_at_once():
+    page = FakePage(url="https://auth.example/login")
+    result = Readiness("page", SelectorReady("li"), timeout=30000).arm(page, abort_url="https://auth.example").wait()
+    assert result.aborted and not result.ready
+    assert result.waited < 0.5
+
+
+def test_any_ready_finishes_with_the_first_condition():
+    payload = ResponseReady("/inventory")
+    readiness = Readiness("race", AnyReady(payload, SelectorReady("li")), timeout=10000)
+    page = FakePage(selector_after=0.3)
+    result = readiness.arm(page).wait()
+    assert result.ready
+    assert result.waited < 2
+    # Listeners registered by arm() are removed again
+    assert page.listeners == []
+
+
+def test_any_ready_async():
+    readiness = Readiness("race", AnyReady(ResponseReady("/inventory"), SelectorReady("li")), timeout=10000)
+
+    async def run():
+        return await readiness.arm(AsyncFakePage(selector_after=0.3)).wait_async()
+
+    result = asyncio.run(run())
+    assert result.ready and result.waited < 2
+
+
+def test_payload_ready_races_the_dom_profile():
+    readiness = payload_ready("inventory", dom=PRODUCTS_READY)
+    assert isinstance(readiness.conditions[0], AnyReady)
+    assert readiness.timeout == PRODUCTS_READY.timeout
+    assert payload_ready("inventory").timeout == 10000
@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+
+import pytest
+
+from heytelecom.base import BaseHeyTelecomClient
+from heytelecom.routing import PROFILES, RequestRouter, RoutingProfile, first_party_hosts, resolve_profile
+
+
+class FakeRoute:
+    def __init__(self, resource_type: str, url: str):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    def abort(self, error_code=None):
+        self.outcome = "abort"
+
+    def fallback(self):
+        self.outcome = "fallback"
+
+
+def route(router, resource_type, url):
+    r = FakeRoute(resource_type, url)
+    router.handle(r)
+    return r.outcome
+
+
+def test_first_party_hosts():
+    assert first_party_hosts(["https://ecare.heytelecom.be", "https://auth.heytelecom.be/x"]) == ("heytelecom.be",)
+    assert first_party_hosts(["http://127.0.0.1:8000", "api.heytelecom.be", None]) == ("127.0.0.1", "heytelecom.be")
+    assert first_party_hosts(["http://localhost:9000"]) == ("localhost",)
+
+
+def test_standard_blocks_assets_and_tracking():
+    router = RequestRouter("standard")
+    assert route(router, "image", "https://ecare.heytelecom.be/logo.png") == "abort"
+    assert route(router, "script", "https://www.googletagmanager.com/gtm.js") == "abort"
+    assert route(router, "script", "https://cdn.cookielaw.org/otSDKStub.js") == "abort"
+    assert route(router, "document", "https://ecare.heytelecom.be/nl") == "fallback"
+    assert route(router, "script", "https://cdn.example.com/app.js") == "fallback"
+    assert router.stats.requests == 5
+    assert router.stats.blocked == 3
+    assert router.stats.blocked_by_type == {"image": 1, "script": 2}
+
+
+def test_strict_keeps_first_party_overrides():
+    client = BaseHeyTelecomClient(block_resources="strict", base_url="http://127.0.0.1:8000",
+                                  auth_url="http://127.0.0.1:8001")
+    router = client.router
+    assert route(router, "document", "http://127.0.0.1:8000/nl/mijn-producten") == "fallback"
+    assert route(router, "document", "http://127.0.0.1:8001/authorize") == "fallback"
+    assert route(router, "xhr", "https://api.heytelecom.be/product-inventory/") == "fallback"
+    assert route(router, "script", "https://cdn.example.com/app.js") == "abort"
+
+
+def test_strict_default_hosts():
+    router = BaseHeyTelecomClient(block_resources="strict").router
+    assert route(router, "document", "https://auth.heytelecom.be/authorize") == "fallback"
+    assert route(router, "script", "https://ecare.heytelecom.be/main.js") == "fallback"
+    assert route(router, "script", "https://cdn.example.com/app.js") == "abort"
+
+
+def test_non_http_urls_are_never_blocked_by_host():
+    assert not PROFILES["strict"].blocks("script", "data:text/javascript,1", ("heytelecom.be",))
+
+
+def test_dry_run_counts_without_blocking():
+    router = RequestRouter("standard", dry_run=True)
+    assert route(router, "image", "https://ecare.heytelecom.be/logo.png") == "fallback"
+    assert router.stats.blocked == 1
+    for url, resource_type, size in (("https://ecare.heytelecom.be/logo.png", "image", "100"),
+                                     ("https://ecare.heytelecom.be/nl", "document", "40")):
+        router.on_response(SimpleNamespace(headers={"content-length": size},
+                                           request=SimpleNamespace(resource_type=resource_type, url=url)))
+    assert router.stats.blocked_bytes == 100
+    assert router.stats.loaded_bytes == 40
+
+
+def test_resolve_profile():
+    custom = RoutingProfile("custom", resource_types=frozenset({"font"}))
+    assert resolve_profile(custom) is custom
+    assert resolve_profile("strict") is PROFILES["strict"]
+    with pytest.raises(ValueError):
+        resolve_profile("paranoid")
+
+
+def test_recaptcha_is_not_tracking():
+    router = RequestRouter("standard")
+    assert route(router, "script", "https://www.google.com/recaptcha/api.js") == "fallback"
+    assert route(router, "script", "https://www.google-analytics.com/analytics.js") == "abort"
+    assert route(router, "script", "https://stats.g.doubleclick.net/dc.js") == "abort"
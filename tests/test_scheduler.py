@@ -0,0 +1,68 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from heytelecom.scheduler import RefreshScheduler
+
+NOW = datetime(2025, 11, 3, 12, 0, 0)
+
+
+def account(last_update, period_end="2025-11-30"):
+    return {"products": [{"id": "mobile_1", "usage": {
+        "period": {"start": "2025-11-01", "end": period_end},
+        "data": {"used": 1.0, "last_update": last_update.isoformat() if last_update else None},
+    }}]}
+
+
+def test_default_interval_until_learned():
+    assert RefreshScheduler().next_delay(NOW) == 3600
+
+
+def test_polls_just_after_the_expected_update():
+    scheduler = RefreshScheduler(margin=120)
+    for hours in (3, 2, 1):
+        assert scheduler.observe(account(NOW - timedelta(hours=hours, minutes=10)))
+    assert scheduler.update_interval() == 3600
+    # Last update 1h10 ago, next one expected 10 min ago: poll in 50 min + margin
+    assert scheduler.next_delay(NOW) == 50 * 60 + 120
+
+
+def test_unchanged_poll_is_a_miss():
+    scheduler = RefreshScheduler()
+    assert scheduler.observe(account(NOW - timedelta(hours=1)))
+    assert not scheduler.observe(account(NOW - timedelta(hours=1)))
+    assert not scheduler.observe(None)
+    assert scheduler.misses == 2
+
+
+@pytest.mark.parametrize("misses", [1, 5, 12, 1030, 100000])
+def test_backoff_stays_within_bounds(misses):
+    scheduler = RefreshScheduler(min_interval=300, max_interval=6 * 3600, default_interval=600)
+    scheduler.misses = misses
+    delay = scheduler.next_delay(NOW)
+    assert 300 <= delay <= 6 * 3600
+    assert delay == min(max(600, 300 * 2 ** min(misses, 10)), 6 * 3600)
+
+
+def test_backoff_without_growth():
+    scheduler = RefreshScheduler(backoff=1.0, default_interval=60, min_interval=60)
+    scheduler.misses = 10 ** 6
+    assert scheduler.next_delay(NOW) == 60
+
+
+def test_period_end_tightens_polling():
+    scheduler = RefreshScheduler(period_end_interval=900)
+    scheduler.observe(account(NOW - timedelta(minutes=5), period_end=NOW.date().isoformat()))
+    scheduler.misses = 20
+    assert scheduler.next_delay(NOW) == 900
+
+
+def test_future_timestamps_are_ignored():
+    scheduler = RefreshScheduler()
+    assert scheduler.observe(account(NOW - timedelta(hours=1)), now=NOW)
+    # A stamp resolved to the wrong year must not become the last update
+    assert not scheduler.observe(account(NOW + timedelta(days=300)), now=NOW)
+    assert scheduler.last_update == NOW - timedelta(hours=1)
+    assert scheduler.observe(account(NOW - timedelta(minutes=5)), now=NOW)
+    # Small skew, e.g. portal and host in different time zones, is tolerated
+    assert scheduler.observe(account(NOW + timedelta(hours=2)), now=NOW)
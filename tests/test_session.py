@@ -0,0 +1,108 @@
+import base64
+import json
+import os
+import stat
+
+from heytelecom.session import check_session, load_storage_state, save_storage_state, storage_state_path
+
+BASE_URL = "https://ecare.heytelecom.be"
+AUTH_URL = "https://auth.heytelecom.be"
+NOW = 1_760_000_000.0
+
+
+def jwt(**claims) -> str:
+    def part(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    return f"{part({'alg': 'none'})}.{part(claims)}.sig"
+
+
+def cookie(name, domain=".heytelecom.be", expires=-1):
+    return {"name": name, "value": "x", "domain": domain, "path": "/", "expires": expires}
+
+
+def check(cookies=(), origins=()):
+    return check_session({"cookies": list(cookies), "origins": list(origins)}, BASE_URL, AUTH_URL, now=NOW)
+
+
+def test_no_storage_is_no_session():
+    assert check() == check_session({}, BASE_URL, AUTH_URL, now=NOW)
+    assert not check().valid
+    assert check().reason == "no session"
+
+
+def test_tracking_cookies_are_ignored():
+    result = check([cookie("OptanonConsent"), cookie("_ga_ABC123"), cookie("_hjSession_1")])
+    assert not result.valid
+
+
+def test_auth_cookie_is_a_session():
+    result = check([cookie("_ga"), cookie("SESSION", domain="auth.heytelecom.be", expires=NOW + 3600)])
+    assert result.valid
+    assert result.reason == "cookies"
+    assert result.expires_at == NOW + 3600
+
+
+def test_browser_session_cookie_has_no_expiry():
+    result = check([cookie("SESSION"), cookie("XSRF", expires=NOW + 3600)])
+    assert result.valid
+    assert result.expires_at is None
+
+
+def test_expired_and_foreign_cookies_do_not_count():
+    assert not check([cookie("SESSION", expires=NOW - 10)]).valid
+    # Expiring within the margin is as good as expired
+    assert not check([cookie("SESSION", expires=NOW + 30)]).valid
+    assert not check([cookie("SESSION", domain="example.com")]).valid
+
+
+def test_stored_token_decides():
+    origins = [{"origin": BASE_URL, "localStorage": [
+        {"name": "oidc.user", "value": json.dumps({"access_token": jwt(exp=NOW + 600)})},
+    ]}]
+    result = check([cookie("SESSION")], origins)
+    assert result.valid
+    assert result.reason == "token"
+    assert result.expires_at == NOW + 600
+
+
+def test_expired_token_wins_over_cookies():
+    origins = [{"origin": BASE_URL, "localStorage": [{"name": "token", "value": jwt(exp=NOW - 1)}]}]
+    result = check([cookie("SESSION")], origins)
+    assert not result.valid
+    assert result.reason == "token expired"
+
+
+def test_tokens_of_other_origins_are_ignored():
+    origins = [{"origin": "https://example.com", "localStorage": [{"name": "t", "value": jwt(exp=NOW - 1)}]}]
+    assert check([cookie("SESSION")], origins).reason == "cookies"
+
+
+def test_storage_state_path():
+    assert storage_state_path("/data/hey_browser_data/") == "/data/hey_browser_data.state.json"
+
+
+def test_save_and_load_storage_state(tmp_path):
+    path = str(tmp_path / "nested" / "state.json")
+    state = {"cookies": [cookie("SESSION")], "origins": []}
+    save_storage_state(state, path)
+    assert load_storage_state(path) == state
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    assert os.listdir(tmp_path / "nested") == ["state.json"]
+
+
+def test_save_replaces_atomically(tmp_path):
+    path = str(tmp_path / "state.json")
+    save_storage_state({"cookies": [], "origins": []}, path)
+    inode = os.stat(path).st_ino
+    save_storage_state({"cookies": [cookie("SESSION")], "origins": []}, path)
+    # A new file is renamed over the old one instead of rewriting it in place
+    assert os.stat(path).st_ino != inode
+    assert load_storage_state(path)["cookies"][0]["name"] == "SESSION"
+
+
+def test_load_storage_state_tolerates_bad_files(tmp_path):
+    assert load_storage_state(str(tmp_path / "missing.json")) is None
+    for content in ("{not json", "[1, 2]"):
+        path = tmp_path / "bad.json"
+        path.write_text(content)
+        assert load_storage_state(str(path)) is None
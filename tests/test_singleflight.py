@@ -0,0 +1,112 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from heytelecom.singleflight import AsyncSingleFlight, SingleFlight, account_key
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    calls = []
+    release = threading.Event()
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {"products": []}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("account", fetch))) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    while flight.shared < 4:
+        time.sleep(0.01)
+    assert flight.in_flight("account")
+    release.set()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(results) == 5 and all(result is results[0] for result in results)
+    assert not flight.in_flight("account")
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+
+    def fail():
+        started.set()
+        release.wait(5)
+        raise RuntimeError("portal down")
+
+    errors = []
+
+    def call():
+        try:
+            flight.do("account", fail)
+        except RuntimeError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait(5)
+    follower = threading.Thread(target=call)
+    follower.start()
+    while flight.shared < 1:
+        time.sleep(0.01)
+    release.set()
+    leader.join()
+    follower.join()
+    assert len(errors) == 2
+    # The next call runs again instead of replaying the failure
+    assert flight.do("account", lambda: "ok") == "ok"
+
+
+def test_different_keys_run_separately():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == 1
+    assert flight.do("b", lambda: 2) == 2
+    assert flight.shared == 0
+
+
+def test_async_single_flight():
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return "data"
+
+    async def run():
+        waiter = asyncio.ensure_future(flight.do("account", fetch))
+        await asyncio.sleep(0)
+        cancelled = asyncio.ensure_future(flight.do("account", fetch))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        results = await asyncio.gather(waiter, flight.do("account", fetch))
+        return results, cancelled
+
+    results, cancelled = asyncio.run(run())
+    assert results == ["data", "data"]
+    assert cancelled.cancelled()
+    assert len(calls) == 1
+    assert flight.shared == 2
+    assert not flight.in_flight("account")
+
+
+def test_account_key(tmp_path):
+    target = tmp_path / "profile"
+    target.mkdir()
+    link = tmp_path / "link"
+    os.symlink(target, link)
+    assert account_key(str(link)) == account_key(str(target))
+    assert account_key(str(target)) == os.path.realpath(str(target))
+
+
+def test_leader_exception_types_are_preserved():
+    with pytest.raises(KeyError):
+        SingleFlight().do("k", {}.__getitem__, "missing")
@@ -0,0 +1,81 @@
+import base64
+import json
+import os
+import stat
+import time
+
+import pytest
+
+from heytelecom.base import BaseHeyTelecomClient
+from heytelecom.tokens import (
+    DEFAULT_TOKEN_LIFETIME, ApiCredentials, TokenCache, credentials_from_headers, token_cache_path, token_expiry,
+)
+
+
+def jwt(**claims) -> str:
+    def part(data):
+        return base64.urlsafe_b64encode(json.dumps(data).encode()).decode().rstrip("=")
+    return f"{part({'alg': 'none'})}.{part(claims)}.sig"
+
+
+def test_token_expiry():
+    assert token_expiry(jwt(exp=1234567890)) == 1234567890.0
+    assert token_expiry(jwt(sub="me")) is None
+    assert token_expiry("opaque-token") is None
+    assert token_expiry("a.!!!.c") is None
+
+
+def test_credentials_from_headers():
+    token = jwt(exp=time.time() + 600)
+    headers = {"authorization": f"Bearer {token}", "x-api-key": "key"}
+    credentials = credentials_from_headers("https://api.heytelecom.be/api/bff/x", headers)
+    assert credentials.access_token == token
+    assert credentials.api_key == "key"
+    assert credentials.is_valid()
+    assert credentials_from_headers("https://ecare.heytelecom.be/x", headers) is None
+    assert credentials_from_headers("https://api.heytelecom.be/x", {"x-api-key": "key"}) is None
+
+
+def test_opaque_token_gets_default_lifetime():
+    before = time.time()
+    credentials = credentials_from_headers("https://api.heytelecom.be/x",
+                                           {"authorization": "Bearer opaque", "x-api-key": "key"})
+    assert before + DEFAULT_TOKEN_LIFETIME <= credentials.expires_at <= time.time() + DEFAULT_TOKEN_LIFETIME
+
+
+def test_is_valid_margin():
+    assert ApiCredentials("t", "k").is_valid()
+    assert not ApiCredentials("t", "k", expires_at=time.time() + 30).is_valid(margin=60)
+
+
+def test_cache_round_trip(tmp_path):
+    cache = TokenCache(token_cache_path(str(tmp_path / "profile")))
+    assert cache.path == str(tmp_path / "profile.tokens.json")
+    assert cache.load() is None
+    credentials = ApiCredentials("t", "k", expires_at=1.0, captured_at=0.5, refresh_token="r")
+    cache.save(credentials)
+    assert cache.load() == credentials
+    assert stat.S_IMODE(os.stat(cache.path).st_mode) == 0o600
+    cache.clear()
+    cache.clear()
+    assert cache.load() is None
+
+
+def test_cache_ignores_corrupt_file(tmp_path):
+    path = tmp_path / "tokens.json"
+    path.write_text("{not json")
+    assert TokenCache(str(path)).load() is None
+    path.write_text('{"api_key": "k"}')
+    assert TokenCache(str(path)).load() is None
+
+
+@pytest.mark.parametrize("backend, include, expected", [
+    ("auto", None, False),
+    ("auto", True, True),
+    ("browser", None, True),
+    ("browser", False, False),
+])
+def test_invoice_does_not_launch_the_browser_in_auto_mode(tmp_path, backend, include, expected):
+    client = BaseHeyTelecomClient(backend=backend, access_token="t", api_key="k",
+                                  user_data_dir=str(tmp_path / "profile"))
+    assert client._wants_invoice(include) is expected